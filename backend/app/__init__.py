@@ -44,7 +44,7 @@ def create_app():
         return jsonify({'error': {'message': 'Token verification failed'}, 'msg': 'Token verification failed'}), 401
 
     # Register blueprints
-    from .api import applications, documents, reminders, ai, dashboard, settings, profile, job_search, auth, interviews
+    from .api import applications, documents, reminders, ai, dashboard, settings, profile, job_search, auth, interviews, jobs
     app.register_blueprint(auth.bp)
     app.register_blueprint(applications.bp)
     app.register_blueprint(documents.bp)
@@ -55,6 +55,12 @@ def create_app():
     app.register_blueprint(profile.bp)
     app.register_blueprint(job_search.bp)
     app.register_blueprint(interviews.bp)
+    app.register_blueprint(jobs.bp)
+
+    # CLI commands
+    from .commands import dashboard_cli, jobs_cli
+    app.cli.add_command(dashboard_cli)
+    app.cli.add_command(jobs_cli)
 
     # Serve React frontend in production
     static_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'frontend', 'dist')
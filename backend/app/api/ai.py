@@ -1,12 +1,17 @@
 import json
 import os
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required
 from ..extensions import db
 from ..models import Application, UserProfile, ChatMessage, Document
-from ..services.gemini_service import GeminiService
+from ..services.gemini_service import get_gemini_service
+from ..services.ai_cache import get_response_cache
+from ..services.chat_history import load_history, schedule_summary
+from ..services.job_queue import job_handler, set_progress, submit_job
+from ..services.prompt_budget import stats as prompt_budget_stats
 from ..services.pdf_service import html_to_pdf
-from ..utils.auth_helpers import get_current_user_id, get_current_profile
+from ..utils.ai_errors import ai_error, unavailable_details
+from ..utils.auth_helpers import get_current_user_id, get_current_profile, ops_required
 
 bp = Blueprint('ai', __name__, url_prefix='/api')
 
@@ -17,7 +22,7 @@ def _get_gemini_service():
     if not api_key:
         return None, jsonify({'error': {'message': 'Gemini API key not configured.'}}), 422
     try:
-        return GeminiService(api_key), None, None
+        return get_gemini_service(api_key), None, None
     except Exception as e:
         return None, jsonify({'error': {'message': f'Failed to initialize Gemini: {str(e)}'}}), 500
 
@@ -31,6 +36,85 @@ def _verify_app_ownership(app_id):
     return Application.query.filter_by(id=app_id, user_id=uid).first_or_404()
 
 
+def _wants_stream(data):
+    return request.args.get('stream', '').lower() == 'true' or data.get('stream') is True
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _stream_response(chunks, result_key, error_prefix, on_complete=None):
+    """Forward generated text to the client as server-sent events.
+
+    Sends a ``chunk`` event ({"text": ...}) per piece of text, then ``done``
+    with the full text under ``result_key`` (the same shape as the JSON
+    response), or ``error`` ({"message": ...}) if generation fails midway.
+    ``on_complete`` receives the full text before ``done`` is sent.
+    """
+    def events():
+        parts = []
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield _sse('chunk', {'text': text})
+            result = ''.join(parts)
+            if on_complete:
+                on_complete(result)
+            yield _sse('done', {result_key: result})
+        except Exception as e:
+            db.session.rollback()
+            details = unavailable_details(e)
+            message = str(e) if details else f'{error_prefix}: {str(e)}'
+            yield _sse('error', {'message': message, **details})
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # don't let a proxy buffer the stream
+    })
+
+
+# GeminiService methods that can run as background jobs, mapped to the key
+# their result is returned under (the same as in the endpoint's response)
+AI_JOB_METHODS = {
+    'generate_cv': 'content',
+    'generate_cover_letter': 'content',
+    'analyze_match': 'analysis',
+    'tailor_cv_html': 'html',
+    'tailor_cv_with_template': 'html',
+    'generate_cover_letter_html': 'html',
+    'generate_interview_prep': 'prep',
+}
+
+
+def _wants_job(data):
+    return request.args.get('background', '').lower() == 'true' or data.get('background') is True
+
+
+def _submit_job(kind, params):
+    job = submit_job(get_current_user_id(), kind, params)
+    return jsonify({'job': job.to_dict()}), 202
+
+
+def _submit_ai_job(method, **kwargs):
+    return _submit_job('ai', {'method': method, 'kwargs': kwargs})
+
+
+@job_handler('ai')
+def _run_ai_job(job, params):
+    method = params['method']
+    if method not in AI_JOB_METHODS:
+        raise ValueError(f'{method} cannot run as a background job')
+    service = get_gemini_service(current_app.config.get('GEMINI_API_KEY'))
+    return {AI_JOB_METHODS[method]: getattr(service, method)(**params['kwargs'])}
+
+
+@job_handler('pdf')
+def _run_pdf_job(job, params):
+    return _store_pdf(params['html'], params['doc_type'], params['application_id'],
+                      params['template_id'], job=job)
+
+
 @bp.route('/ai/parse-job-post', methods=['POST'])
 @jwt_required()
 def parse_job_post():
@@ -47,7 +131,7 @@ def parse_job_post():
         parsed = service.parse_job_posting(text)
         return jsonify({'parsed': parsed})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to parse job posting: {str(e)}'}}), 500
+        return ai_error('Failed to parse job posting', e)
 
 
 @bp.route('/ai/generate-cv', methods=['POST'])
@@ -62,6 +146,10 @@ def generate_cv():
     if not job_description:
         return jsonify({'error': {'message': 'Job description is required'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('generate_cv', job_description=job_description,
+                              current_cv=data.get('current_cv_text'), instructions=data.get('instructions'))
+
     try:
         content = service.generate_cv(
             job_description=job_description,
@@ -70,7 +158,7 @@ def generate_cv():
         )
         return jsonify({'content': content})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate CV: {str(e)}'}}), 500
+        return ai_error('Failed to generate CV', e)
 
 
 @bp.route('/ai/generate-cover-letter', methods=['POST'])
@@ -84,6 +172,10 @@ def generate_cover_letter():
     if not data.get('job_description') or not data.get('company') or not data.get('role'):
         return jsonify({'error': {'message': 'job_description, company, and role are required'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('generate_cover_letter', job_description=data['job_description'],
+                              company=data['company'], role=data['role'], instructions=data.get('instructions'))
+
     try:
         content = service.generate_cover_letter(
             job_description=data['job_description'],
@@ -93,7 +185,7 @@ def generate_cover_letter():
         )
         return jsonify({'content': content})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate cover letter: {str(e)}'}}), 500
+        return ai_error('Failed to generate cover letter', e)
 
 
 @bp.route('/ai/summarize-application', methods=['POST'])
@@ -116,7 +208,7 @@ def summarize_application():
         db.session.commit()
         return jsonify({'summary': summary})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to summarize: {str(e)}'}}), 500
+        return ai_error('Failed to summarize', e)
 
 
 @bp.route('/ai/improve-text', methods=['POST'])
@@ -138,7 +230,7 @@ def improve_text():
         )
         return jsonify({'content': content})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to improve text: {str(e)}'}}), 500
+        return ai_error('Failed to improve text', e)
 
 
 @bp.route('/ai/extract-cv-profile', methods=['POST'])
@@ -161,7 +253,7 @@ def extract_cv_profile():
         return jsonify({'error': {'message': 'AI returned invalid JSON. Please try again.'}}), 502
     except Exception as e:
         current_app.logger.error(f'extract_cv_profile failed: {e}')
-        return jsonify({'error': {'message': f'Failed to extract profile: {str(e)}'}}), 500
+        return ai_error('Failed to extract profile', e)
 
 
 @bp.route('/ai/match-analysis', methods=['POST'])
@@ -180,11 +272,14 @@ def match_analysis():
     if not profile or not profile.get('full_name'):
         return jsonify({'error': {'message': 'User profile is required. Complete your profile first.'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('analyze_match', job_posting=job_posting, profile=profile)
+
     try:
         analysis = service.analyze_match(job_posting, profile)
         return jsonify({'analysis': analysis})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to analyze match: {str(e)}'}}), 500
+        return ai_error('Failed to analyze match', e)
 
 
 @bp.route('/ai/tailor-cv', methods=['POST'])
@@ -203,6 +298,15 @@ def tailor_cv():
     if not profile or not profile.get('full_name'):
         return jsonify({'error': {'message': 'User profile is required.'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('tailor_cv_html', job_posting=job_posting, profile=profile,
+                              instructions=data.get('instructions'))
+    if _wants_stream(data):
+        return _stream_response(
+            service.stream_tailor_cv_html(job_posting, profile, data.get('instructions')),
+            'html', 'Failed to tailor CV',
+        )
+
     try:
         html = service.tailor_cv_html(
             job_posting=job_posting,
@@ -211,7 +315,7 @@ def tailor_cv():
         )
         return jsonify({'html': html})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to tailor CV: {str(e)}'}}), 500
+        return ai_error('Failed to tailor CV', e)
 
 
 @bp.route('/ai/tailor-cv-template', methods=['POST'])
@@ -231,20 +335,27 @@ def tailor_cv_template():
         return jsonify({'error': {'message': 'User profile is required.'}}), 400
 
     template_config = data.get('template_config', {})
+    options = {
+        'template_id': template_config.get('template_id', 'classic'),
+        'include_photo': template_config.get('include_photo', False),
+        'max_pages': template_config.get('max_pages', 1),
+        'skills_format': template_config.get('skills_format', 'list'),
+        'instructions': data.get('instructions'),
+    }
 
-    try:
-        html = service.tailor_cv_with_template(
-            job_posting=job_posting,
-            profile=profile,
-            template_id=template_config.get('template_id', 'classic'),
-            include_photo=template_config.get('include_photo', False),
-            max_pages=template_config.get('max_pages', 1),
-            skills_format=template_config.get('skills_format', 'list'),
-            instructions=data.get('instructions'),
+    if _wants_job(data):
+        return _submit_ai_job('tailor_cv_with_template', job_posting=job_posting, profile=profile, **options)
+    if _wants_stream(data):
+        return _stream_response(
+            service.stream_tailor_cv_with_template(job_posting, profile, **options),
+            'html', 'Failed to generate CV',
         )
+
+    try:
+        html = service.tailor_cv_with_template(job_posting=job_posting, profile=profile, **options)
         return jsonify({'html': html})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate CV: {str(e)}'}}), 500
+        return ai_error('Failed to generate CV', e)
 
 
 @bp.route('/ai/tailor-cover-letter', methods=['POST'])
@@ -262,6 +373,17 @@ def tailor_cover_letter():
     if not profile or not profile.get('full_name'):
         return jsonify({'error': {'message': 'User profile is required.'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('generate_cover_letter_html', job_posting=data['job_posting'], profile=profile,
+                              company=data['company'], role=data['role'], instructions=data.get('instructions'))
+    if _wants_stream(data):
+        return _stream_response(
+            service.stream_cover_letter_html(
+                data['job_posting'], profile, data['company'], data['role'], data.get('instructions'),
+            ),
+            'html', 'Failed to generate cover letter',
+        )
+
     try:
         html = service.generate_cover_letter_html(
             job_posting=data['job_posting'],
@@ -272,7 +394,7 @@ def tailor_cover_letter():
         )
         return jsonify({'html': html})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate cover letter: {str(e)}'}}), 500
+        return ai_error('Failed to generate cover letter', e)
 
 
 @bp.route('/ai/generate-followup', methods=['POST'])
@@ -298,7 +420,7 @@ def generate_followup():
         followup = service.generate_followup(app.to_dict(), profile, context_desc)
         return jsonify({'followup': followup})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate follow-up: {str(e)}'}}), 500
+        return ai_error('Failed to generate follow-up', e)
 
 
 @bp.route('/ai/interview-prep', methods=['POST'])
@@ -318,11 +440,14 @@ def interview_prep():
     if not profile.get('full_name'):
         return jsonify({'error': {'message': 'User profile is required.'}}), 400
 
+    if _wants_job(data):
+        return _submit_ai_job('generate_interview_prep', application_data=app.to_dict(), profile=profile)
+
     try:
         prep = service.generate_interview_prep(app.to_dict(), profile)
         return jsonify({'prep': prep})
     except Exception as e:
-        return jsonify({'error': {'message': f'Failed to generate interview prep: {str(e)}'}}), 500
+        return ai_error('Failed to generate interview prep', e)
 
 
 @bp.route('/ai/chat', methods=['POST'])
@@ -337,6 +462,15 @@ def chat():
     if not message:
         return jsonify({'error': {'message': 'Message is required'}}), 400
 
+    app_id = data.get('application_id')
+    # Without an application the client keeps the conversation: its last 10 messages
+    history = (data.get('history') or [])[-10:]
+    summary = ''
+    if app_id:
+        _verify_app_ownership(app_id)
+        # The stored conversation replaces any history sent by the client
+        summary, history = load_history(app_id, data.get('step'))
+
     context = {
         'step': data.get('step', 'general'),
         'company': data.get('company', ''),
@@ -344,16 +478,13 @@ def chat():
         'profile': data.get('profile') or _get_profile_dict(),
         'job_posting': data.get('job_posting', ''),
         'match_analysis': data.get('match_analysis'),
-        'history': data.get('history', []),
+        'history': history,
+        'summary': summary,
     }
 
-    try:
-        response = service.chat(message, context)
-
+    def save_messages(response):
         # Save messages if linked to an application
-        app_id = data.get('application_id')
         if app_id:
-            _verify_app_ownership(app_id)
             user_msg = ChatMessage(
                 application_id=app_id,
                 role='user',
@@ -369,10 +500,64 @@ def chat():
             db.session.add(user_msg)
             db.session.add(assistant_msg)
             db.session.commit()
+            schedule_summary(service, app_id, data.get('step'))
 
+    if _wants_stream(data):
+        return _stream_response(service.stream_chat(message, context), 'response', 'Chat failed',
+                                on_complete=save_messages)
+
+    try:
+        response = service.chat(message, context)
+        save_messages(response)
         return jsonify({'response': response})
     except Exception as e:
-        return jsonify({'error': {'message': f'Chat failed: {str(e)}'}}), 500
+        return ai_error('Chat failed', e)
+
+
+def _store_pdf(html_content, doc_type, application_id, template_id, job=None):
+    # Generate PDF in memory (no disk needed for cloud deploy)
+    filename, pdf_data, file_size = html_to_pdf(html_content, doc_type=doc_type, template_id=template_id)
+    if job:
+        set_progress(job, 60)
+
+    # Try to upload to Cloudinary
+    cloud_url = None
+    cloud_public_id = None
+    try:
+        from io import BytesIO
+        from ..services.cloud_storage import upload_file as cloud_upload
+        pdf_buffer = BytesIO(pdf_data)
+        pdf_buffer.name = filename
+        cloud_url, cloud_public_id = cloud_upload(pdf_buffer, folder='pdfs')
+    except Exception as e:
+        current_app.logger.error(f'Cloudinary PDF upload failed: {e}')
+        # Fallback: save to local disk
+        try:
+            import os
+            upload_folder = current_app.config['UPLOAD_FOLDER']
+            filepath = os.path.join(upload_folder, filename)
+            with open(filepath, 'wb') as f:
+                f.write(pdf_data)
+        except Exception:
+            pass
+
+    doc = Document(
+        application_id=application_id,
+        filename=filename,
+        stored_filename=filename,
+        file_type='application/pdf',
+        file_size=file_size,
+        doc_category=doc_type,
+        cloud_url=cloud_url,
+        cloud_public_id=cloud_public_id,
+    )
+    db.session.add(doc)
+    db.session.commit()
+
+    return {
+        'document': doc.to_dict(),
+        'download_url': f'/api/documents/{doc.id}/download',
+    }
 
 
 @bp.route('/ai/generate-pdf', methods=['POST'])
@@ -391,47 +576,45 @@ def generate_pdf():
     if application_id:
         _verify_app_ownership(application_id)
 
-    try:
-        # Generate PDF in memory (no disk needed for cloud deploy)
-        filename, pdf_data, file_size = html_to_pdf(html_content, doc_type=doc_type, template_id=template_id)
-
-        # Try to upload to Cloudinary
-        cloud_url = None
-        cloud_public_id = None
-        try:
-            from io import BytesIO
-            from ..services.cloud_storage import upload_file as cloud_upload
-            pdf_buffer = BytesIO(pdf_data)
-            pdf_buffer.name = filename
-            cloud_url, cloud_public_id = cloud_upload(pdf_buffer, folder='pdfs')
-        except Exception as e:
-            current_app.logger.error(f'Cloudinary PDF upload failed: {e}')
-            # Fallback: save to local disk
-            try:
-                import os
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                filepath = os.path.join(upload_folder, filename)
-                with open(filepath, 'wb') as f:
-                    f.write(pdf_data)
-            except Exception:
-                pass
-
-        doc = Document(
-            application_id=application_id,
-            filename=filename,
-            stored_filename=filename,
-            file_type='application/pdf',
-            file_size=file_size,
-            doc_category=doc_type,
-            cloud_url=cloud_url,
-            cloud_public_id=cloud_public_id,
-        )
-        db.session.add(doc)
-        db.session.commit()
-
-        return jsonify({
-            'document': doc.to_dict(),
-            'download_url': f'/api/documents/{doc.id}/download',
+    if _wants_job(data):
+        return _submit_job('pdf', {
+            'html': html_content, 'doc_type': doc_type,
+            'application_id': application_id, 'template_id': template_id,
         })
+
+    try:
+        return jsonify(_store_pdf(html_content, doc_type, application_id, template_id))
     except Exception as e:
         return jsonify({'error': {'message': f'Failed to generate PDF: {str(e)}'}}), 500
+
+
+@bp.route('/ai/prompt-stats', methods=['GET'])
+@jwt_required()
+@ops_required
+def prompt_stats():
+    return jsonify(prompt_budget_stats())
+
+
+@bp.route('/ai/cache-stats', methods=['GET'])
+@jwt_required()
+@ops_required
+def cache_stats():
+    cache = get_response_cache()
+    stats = {'enabled': True, **cache.stats()} if cache is not None else {'enabled': False}
+    api_key = current_app.config.get('GEMINI_API_KEY')
+    if api_key:
+        gemini = get_gemini_service(api_key)
+        stats['profile_contexts'] = gemini.contexts.stats()
+        stats['single_flight'] = gemini.flights.stats()
+    return jsonify(stats)
+
+
+@bp.route('/ai/gemini-stats', methods=['GET'])
+@jwt_required()
+@ops_required
+def gemini_stats():
+    """Concurrency-limit, queue and circuit-breaker metrics for this worker."""
+    api_key = current_app.config.get('GEMINI_API_KEY')
+    if not api_key:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **get_gemini_service(api_key).guard.stats()})
@@ -3,12 +3,25 @@ import calendar
 from datetime import date, datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import load_only, selectinload
 from ..extensions import db
 from ..models import Application, StatusHistory, InterviewEvent
+from ..services.dashboard_snapshot import application_counters, record_change
+from ..services.search_service import match_clause, search_applications
 from ..utils.auth_helpers import get_current_user_id
+from ..utils.pagination import keyset_page, wants_cursor_pagination
 
 bp = Blueprint('applications', __name__, url_prefix='/api')
 
+# Columns selectable through ?fields= on the list endpoint (user_id is implied)
+PROJECTABLE_FIELDS = [c.key for c in Application.__table__.columns if c.key != 'user_id']
+
+# Keyset pagination needs a non-nullable sort column (ties broken by id)
+CURSOR_SORT_FIELDS = ['applied_date', 'created_at', 'updated_at', 'company', 'role', 'status']
+
+# Related collections returned by the detail endpoint, selectable with ?include=
+DETAIL_SECTIONS = ['documents', 'reminders', 'status_history', 'chat_messages', 'interview_events']
+
 
 @bp.route('/applications', methods=['GET'])
 @jwt_required()
@@ -22,31 +35,89 @@ def list_applications():
 
     search = request.args.get('search')
     if search:
-        term = f'%{search}%'
-        query = query.filter(
-            db.or_(Application.company.ilike(term), Application.role.ilike(term))
-        )
+        query = query.filter(match_clause(search))
 
     sort_by = request.args.get('sort_by', 'applied_date')
     order = request.args.get('order', 'desc')
+
+    # Projection: ?fields=a,b,c or ?view=summary load and return only those
+    # columns; without either the full to_dict() payload is returned.
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in PROJECTABLE_FIELDS]
+        if unknown:
+            return jsonify({'error': {'message': f'Unknown fields: {unknown}. Must be among: {PROJECTABLE_FIELDS}'}}), 400
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+    elif request.args.get('view') == 'summary':
+        fields = Application.SUMMARY_FIELDS
+
+    def serialize(items):
+        return [a.to_partial_dict(fields) if fields else a.to_dict() for a in items]
+
+    if wants_cursor_pagination():
+        if sort_by not in CURSOR_SORT_FIELDS:
+            return jsonify({'error': {'message': f'Cursor pagination supports sort_by in: {CURSOR_SORT_FIELDS}'}}), 400
+        sort_column = getattr(Application, sort_by)
+        if fields:
+            query = query.options(load_only(*[getattr(Application, f) for f in {*fields, sort_by}]))
+
+        result = {}
+        if request.args.get('with_total', 'false').lower() == 'true':
+            result['total'] = query.order_by(None).count()
+        try:
+            items, next_cursor = keyset_page(
+                query, sort_column, Application.id, 'asc' if order == 'asc' else 'desc',
+                request.args.get('cursor'), request.args.get('per_page', 20, type=int),
+            )
+        except ValueError as e:
+            return jsonify({'error': {'message': str(e)}}), 400
+        result.update({
+            'applications': serialize(items),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        })
+        return jsonify(result)
+
     sort_column = getattr(Application, sort_by, Application.applied_date)
     if order == 'asc':
         query = query.order_by(sort_column.asc())
     else:
         query = query.order_by(sort_column.desc())
+    if fields:
+        query = query.options(load_only(*[getattr(Application, f) for f in fields]))
 
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
     return jsonify({
-        'applications': [a.to_dict() for a in pagination.items],
+        'applications': serialize(pagination.items),
         'total': pagination.total,
         'page': pagination.page,
         'pages': pagination.pages,
     })
 
 
+@bp.route('/applications/search', methods=['GET'])
+@jwt_required()
+def full_text_search():
+    uid = get_current_user_id()
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': {'message': 'Search query (q) is required'}}), 400
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    results, has_more = search_applications(uid, q, limit=per_page, offset=(page - 1) * per_page)
+    return jsonify({
+        'results': results,
+        'page': page,
+        'has_more': has_more,
+    })
+
+
 @bp.route('/applications/calendar', methods=['GET'])
 @jwt_required()
 def calendar_applications():
@@ -98,13 +169,27 @@ def calendar_applications():
 @jwt_required()
 def get_application(app_id):
     uid = get_current_user_id()
-    app = Application.query.filter_by(id=app_id, user_id=uid).first_or_404()
+
+    # ?include=documents,reminders picks the related sections to return
+    # (all of them by default, none with an empty value). Each included
+    # section is fetched with one SELECT ... IN, so the detail view costs
+    # 1 + len(sections) statements however many rows each section has.
+    sections = DETAIL_SECTIONS
+    if 'include' in request.args:
+        sections = [s.strip() for s in request.args['include'].split(',') if s.strip()]
+        unknown = [s for s in sections if s not in DETAIL_SECTIONS]
+        if unknown:
+            return jsonify({'error': {'message': f'Unknown sections: {unknown}. Must be among: {DETAIL_SECTIONS}'}}), 400
+
+    app = Application.query.options(
+        *[selectinload(getattr(Application, section)) for section in sections]
+    ).filter_by(id=app_id, user_id=uid).first_or_404()
+
     data = app.to_dict()
-    data['documents'] = [d.to_dict() for d in app.documents]
-    data['reminders'] = [r.to_dict() for r in app.reminders]
-    data['status_history'] = [h.to_dict() for h in app.status_history]
-    data['chat_messages'] = [m.to_dict() for m in app.chat_messages]
-    data['interview_events'] = [ie.to_dict() for ie in app.interview_events]
+    for section in sections:
+        # Reminder/InterviewEvent.to_dict() read back .application; that
+        # resolves from the identity map without another query.
+        data[section] = [item.to_dict() for item in getattr(app, section)]
     return jsonify({'application': data})
 
 
@@ -158,6 +243,7 @@ def create_application():
         to_status=app.status,
     )
     db.session.add(history)
+    record_change(uid, {}, application_counters(app))
     db.session.commit()
 
     return jsonify({'application': app.to_dict()}), 201
@@ -172,6 +258,7 @@ def update_application(app_id):
     if not data:
         return jsonify({'error': {'message': 'Request body is required'}}), 400
 
+    before = application_counters(app)
     fields = ['company', 'role', 'location', 'salary_min', 'salary_max',
               'salary_currency', 'url', 'job_description', 'requirements', 'notes',
               'match_score', 'job_posting_text', 'generated_cv_html', 'generated_cover_letter_html']
@@ -194,6 +281,7 @@ def update_application(app_id):
         app.deadline = date.fromisoformat(data['deadline']) if data['deadline'] else None
 
     app.updated_at = datetime.utcnow()
+    record_change(uid, before, application_counters(app))
     db.session.commit()
     return jsonify({'application': app.to_dict()})
 
@@ -203,6 +291,7 @@ def update_application(app_id):
 def delete_application(app_id):
     uid = get_current_user_id()
     app = Application.query.filter_by(id=app_id, user_id=uid).first_or_404()
+    record_change(uid, application_counters(app), {})
     db.session.delete(app)
     db.session.commit()
     return '', 204
@@ -219,6 +308,7 @@ def change_status(app_id):
     if new_status not in Application.VALID_STATUSES:
         return jsonify({'error': {'message': f'Invalid status. Must be one of: {Application.VALID_STATUSES}'}}), 400
 
+    before = application_counters(app)
     old_status = app.status
     app.status = new_status
     app.updated_at = datetime.utcnow()
@@ -233,8 +323,47 @@ def change_status(app_id):
         note=data.get('note'),
     )
     db.session.add(history)
+    record_change(uid, before, application_counters(app))
     db.session.commit()
 
     result = app.to_dict()
     result['status_history'] = [h.to_dict() for h in app.status_history]
     return jsonify({'application': result})
+
+
+def _history_response(query):
+    """Newest-first status history, keyset-paginated when requested."""
+    if not wants_cursor_pagination():
+        entries = query.order_by(StatusHistory.changed_at.desc(), StatusHistory.id.desc()).all()
+        return jsonify({'status_history': [h.to_dict() for h in entries]})
+
+    try:
+        entries, next_cursor = keyset_page(
+            query, StatusHistory.changed_at, StatusHistory.id, 'desc',
+            request.args.get('cursor'), request.args.get('per_page', 20, type=int),
+        )
+    except ValueError as e:
+        return jsonify({'error': {'message': str(e)}}), 400
+    return jsonify({
+        'status_history': [h.to_dict() for h in entries],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+    })
+
+
+@bp.route('/applications/<int:app_id>/status-history', methods=['GET'])
+@jwt_required()
+def list_status_history(app_id):
+    uid = get_current_user_id()
+    Application.query.filter_by(id=app_id, user_id=uid).first_or_404()
+    query = StatusHistory.query.filter(StatusHistory.application_id == app_id)
+    return _history_response(query)
+
+
+@bp.route('/status-history', methods=['GET'])
+@jwt_required()
+def list_all_status_history():
+    uid = get_current_user_id()
+    user_app_ids = db.session.query(Application.id).filter_by(user_id=uid).subquery()
+    query = StatusHistory.query.filter(StatusHistory.application_id.in_(user_app_ids))
+    return _history_response(query)
@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta, date
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
 from sqlalchemy import func, extract
+from sqlalchemy.orm import load_only
 from ..extensions import db
 from ..models import Application, StatusHistory
+from ..services.dashboard_snapshot import snapshot_stats, snapshot_funnel_counts
+from ..services.dashboard_stats import compute_stats
 from ..utils.auth_helpers import get_current_user_id
 
 bp = Blueprint('dashboard', __name__, url_prefix='/api')
@@ -13,50 +16,9 @@ bp = Blueprint('dashboard', __name__, url_prefix='/api')
 @jwt_required()
 def get_stats():
     uid = get_current_user_id()
-    base = Application.query.filter_by(user_id=uid)
-
-    total = base.count()
-
-    by_status = {}
-    rows = db.session.query(Application.status, func.count(Application.id)).filter(
-        Application.user_id == uid
-    ).group_by(Application.status).all()
-    for status, count in rows:
-        by_status[status] = count
-
-    responded = base.filter(Application.status.notin_(['sent', 'draft'])).count()
-    response_rate = round((responded / total) * 100, 1) if total > 0 else 0
-
-    responded_apps = base.filter(
-        Application.response_date.isnot(None),
-        Application.applied_date.isnot(None),
-    ).all()
-    if responded_apps:
-        total_days = sum((a.response_date - a.applied_date).days for a in responded_apps)
-        avg_response_days = round(total_days / len(responded_apps), 1)
-    else:
-        avg_response_days = 0
-
-    today = date.today()
-    start_of_week = today - timedelta(days=today.weekday())
-    start_of_month = today.replace(day=1)
-
-    this_week = base.filter(Application.applied_date >= start_of_week).count()
-    this_month = base.filter(Application.applied_date >= start_of_month).count()
-
-    # Average match score
-    scored_apps = base.filter(Application.match_score.isnot(None)).all()
-    avg_match_score = round(sum(a.match_score for a in scored_apps) / len(scored_apps), 1) if scored_apps else None
-
-    return jsonify({
-        'total_applications': total,
-        'by_status': by_status,
-        'response_rate': response_rate,
-        'avg_response_days': avg_response_days,
-        'this_week': this_week,
-        'this_month': this_month,
-        'avg_match_score': avg_match_score,
-    })
+    if current_app.config.get('DASHBOARD_SNAPSHOTS'):
+        return jsonify(snapshot_stats(uid))
+    return jsonify(compute_stats(uid))
 
 
 @bp.route('/dashboard/timeline', methods=['GET'])
@@ -236,23 +198,26 @@ def deadline_alerts():
 @jwt_required()
 def get_funnel():
     uid = get_current_user_id()
-    base = Application.query.filter_by(user_id=uid)
-
-    total = base.count()
-    sent = base.filter(
-        Application.status.in_(['sent', 'interview', 'rejected'])
-    ).count()
-
-    # Count all that ever reached interview (via StatusHistory)
-    user_app_ids = db.session.query(Application.id).filter_by(user_id=uid).subquery()
-    interview_ever = db.session.query(
-        func.count(func.distinct(StatusHistory.application_id))
-    ).filter(
-        StatusHistory.to_status == 'interview',
-        StatusHistory.application_id.in_(user_app_ids)
-    ).scalar() or 0
+    if current_app.config.get('DASHBOARD_SNAPSHOTS'):
+        total, sent, interview_ever, rejected = snapshot_funnel_counts(uid)
+    else:
+        base = Application.query.filter_by(user_id=uid)
+
+        total = base.count()
+        sent = base.filter(
+            Application.status.in_(['sent', 'interview', 'rejected'])
+        ).count()
+
+        # Count all that ever reached interview (via StatusHistory)
+        user_app_ids = db.session.query(Application.id).filter_by(user_id=uid).subquery()
+        interview_ever = db.session.query(
+            func.count(func.distinct(StatusHistory.application_id))
+        ).filter(
+            StatusHistory.to_status == 'interview',
+            StatusHistory.application_id.in_(user_app_ids)
+        ).scalar() or 0
 
-    rejected = base.filter(Application.status == 'rejected').count()
+        rejected = base.filter(Application.status == 'rejected').count()
 
     def rate(num, den):
         return round((num / den) * 100, 1) if den > 0 else 0
@@ -277,8 +242,9 @@ def followup_suggestions():
     uid = get_current_user_id()
     today = date.today()
     suggestions = []
+    summary_columns = load_only(*[getattr(Application, f) for f in Application.SUMMARY_FIELDS])
 
-    sent_stale = Application.query.filter(
+    sent_stale = Application.query.options(summary_columns).filter(
         Application.user_id == uid,
         Application.status == 'sent',
         Application.applied_date <= today - timedelta(days=7),
@@ -288,31 +254,33 @@ def followup_suggestions():
     for app in sent_stale:
         days_waiting = (today - app.applied_date).days
         suggestions.append({
-            'application': app.to_dict(),
+            'application': app.to_summary_dict(),
             'reason': 'sent_no_response',
             'days_waiting': days_waiting,
             'context': f'{days_waiting} days since application was sent, no response received',
         })
 
-    interview_apps = Application.query.filter(
+    # Latest entry into 'interview' per application, computed for all of the
+    # user's interview-stage applications in one grouped join.
+    now = datetime.utcnow()
+    entered_interview = func.max(StatusHistory.changed_at)
+    interview_apps = db.session.query(Application, entered_interview).options(summary_columns).join(
+        StatusHistory, StatusHistory.application_id == Application.id
+    ).filter(
         Application.user_id == uid,
         Application.status == 'interview',
+        StatusHistory.to_status == 'interview',
+    ).group_by(Application.id).having(
+        entered_interview <= now - timedelta(days=3)
     ).all()
 
-    for app in interview_apps:
-        history = StatusHistory.query.filter(
-            StatusHistory.application_id == app.id,
-            StatusHistory.to_status == 'interview',
-        ).order_by(StatusHistory.changed_at.desc()).first()
-
-        if history:
-            days_since = (datetime.utcnow() - history.changed_at).days
-            if days_since >= 3:
-                suggestions.append({
-                    'application': app.to_dict(),
-                    'reason': 'interview_no_response',
-                    'days_waiting': days_since,
-                    'context': f'{days_since} days since interview stage, no follow-up sent',
-                })
+    for app, entered_at in interview_apps:
+        days_since = (now - entered_at).days
+        suggestions.append({
+            'application': app.to_summary_dict(),
+            'reason': 'interview_no_response',
+            'days_waiting': days_since,
+            'context': f'{days_since} days since interview stage, no follow-up sent',
+        })
 
     return jsonify({'suggestions': suggestions})
@@ -2,14 +2,20 @@ import json
 import os
 import requests as http_requests
 from datetime import date
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required
 from ..extensions import db
 from ..models import Application, Setting, UserProfile, StatusHistory
 from ..services.adzuna_service import AdzunaService
+from ..services.dashboard_snapshot import application_counters, record_change
 from ..services.jsearch_service import JSearchService
-from ..services.gemini_service import GeminiService
-from ..utils.auth_helpers import get_current_user_id, get_current_profile
+from ..services.match_batch import analyze_matches
+from ..services.relevance import rank_jobs
+from ..services.job_search_fanout import search_providers
+from ..services.search_cache import get_search_cache, search_key
+from ..services.gemini_service import get_gemini_service
+from ..utils.ai_errors import ai_error, unavailable_details
+from ..utils.auth_helpers import get_current_user_id, get_current_profile, ops_required
 
 bp = Blueprint('job_search', __name__, url_prefix='/api')
 
@@ -41,7 +47,7 @@ def _get_gemini_service():
             'error': {'message': 'Gemini API key not configured.'}
         }), 422
     try:
-        return GeminiService(api_key), None, None
+        return get_gemini_service(api_key), None, None
     except Exception as e:
         return None, jsonify({'error': {'message': f'Failed to initialize Gemini: {str(e)}'}}), 500
 
@@ -95,6 +101,72 @@ Return ONLY valid JSON, no markdown."""
         return jsonify({'suggestions': fallback, 'profile_location': location})
 
 
+SEARCH_PAGE_SIZE = 15
+
+
+def _adzuna_request(service, q, location, country):
+    def for_page(page):
+        return (
+            search_key('adzuna', q, location, country, page, SEARCH_PAGE_SIZE),
+            lambda: service.search_jobs(query=q, location=location, country=country,
+                                        page=page, per_page=SEARCH_PAGE_SIZE),
+        )
+    return for_page
+
+
+def _jsearch_request(service, q, location):
+    # Results don't depend on whose RapidAPI key fetched them, so the key
+    # is not part of the cache key and users share entries
+    def for_page(page):
+        return (
+            search_key('jsearch', q, location, '', page, SEARCH_PAGE_SIZE),
+            lambda: service.search_jobs(query=q, location=location, page=page, per_page=SEARCH_PAGE_SIZE),
+        )
+    return for_page
+
+
+def _cached_search(cache, request_for, page, uid):
+    """Search through the results cache, then prefetch the next page."""
+    results = cache.fetch(*request_for(page))
+    if results.get('pages', 0) > page:
+        cache.prefetch(*request_for(page + 1), user_id=uid)
+    return results
+
+
+def _ranked(results):
+    """With ?rank=profile, order the page by local relevance to the profile.
+
+    Clients can then send only the top few jobs to analyze-match/batch.
+    """
+    if request.args.get('rank') != 'profile':
+        return results
+    # Cached results are shared: rank_jobs returns new job dicts
+    return {**results, 'jobs': rank_jobs(results.get('jobs', []), _get_profile_dict()), 'ranked_by': 'profile'}
+
+
+def _search_all_providers(q, location, page):
+    cache = get_search_cache()
+    uid = get_current_user_id()
+    searches = {}
+    adzuna, _, _ = _get_adzuna_service()
+    if adzuna:
+        country = request.args.get('country', 'gb').strip()
+        adzuna_request = _adzuna_request(adzuna, q, location, country)
+        searches['adzuna'] = lambda: _cached_search(cache, adzuna_request, page, uid)
+    jsearch, _, _ = _get_jsearch_service()
+    if jsearch:
+        jsearch_request = _jsearch_request(jsearch, q, location)
+        searches['jsearch'] = lambda: _cached_search(cache, jsearch_request, page, uid)
+    if not searches:
+        return jsonify({'error': {'message': 'No job search provider configured.'}}), 422
+
+    results = search_providers(searches, current_app.config['JOB_SEARCH_PROVIDER_TIMEOUT'])
+    if not any(p['status'] == 'ok' for p in results['providers'].values()):
+        reasons = '; '.join(f"{name}: {p.get('error', p['status'])}" for name, p in results['providers'].items())
+        return jsonify({'error': {'message': f'Search failed: {reasons}'}}), 502
+    return jsonify(_ranked(results))
+
+
 @bp.route('/job-search/search', methods=['GET'])
 @jwt_required()
 def search_jobs():
@@ -106,30 +178,24 @@ def search_jobs():
     if not q:
         return jsonify({'error': {'message': 'Search query (q) is required'}}), 400
 
+    if source == 'all':
+        return _search_all_providers(q, location, page)
+
     try:
         if source == 'jsearch':
             service, error_response, status = _get_jsearch_service()
             if error_response:
                 return error_response, status
-            results = service.search_jobs(
-                query=q,
-                location=location,
-                page=page,
-                per_page=15,
-            )
+            results = _cached_search(get_search_cache(), _jsearch_request(service, q, location),
+                                     page, get_current_user_id())
         else:
             service, error_response, status = _get_adzuna_service()
             if error_response:
                 return error_response, status
             country = request.args.get('country', 'gb').strip()
-            results = service.search_jobs(
-                query=q,
-                location=location,
-                country=country,
-                page=page,
-                per_page=15,
-            )
-        return jsonify(results)
+            results = _cached_search(get_search_cache(), _adzuna_request(service, q, location, country),
+                                     page, get_current_user_id())
+        return jsonify(_ranked(results))
     except http_requests.exceptions.HTTPError as e:
         # Show actual API error message for better debugging
         error_msg = str(e)
@@ -143,6 +209,13 @@ def search_jobs():
         return jsonify({'error': {'message': f'Search failed: {str(e)}'}}), 500
 
 
+@bp.route('/job-search/cache-stats', methods=['GET'])
+@jwt_required()
+@ops_required
+def search_cache_stats():
+    return jsonify(get_search_cache().stats())
+
+
 @bp.route('/job-search/analyze-match', methods=['POST'])
 @jwt_required()
 def analyze_match():
@@ -162,13 +235,81 @@ def analyze_match():
     if not profile.get('full_name'):
         return jsonify({'error': {'message': 'User profile not found. Complete your profile first.'}}), 400
 
-    job_posting_text = f"Role: {job_title}\nCompany: {company}\n\n{job_description}"
+    job_posting_text = _job_posting_text(job_title, company, job_description)
 
     try:
         analysis = gemini.analyze_match(job_posting_text, profile)
         return jsonify({'analysis': analysis})
     except Exception as e:
-        return jsonify({'error': {'message': f'Match analysis failed: {str(e)}'}}), 500
+        return ai_error('Match analysis failed', e)
+
+
+def _job_posting_text(job_title, company, job_description):
+    return f"Role: {job_title}\nCompany: {company}\n\n{job_description}"
+
+
+@bp.route('/job-search/analyze-match/batch', methods=['POST'])
+@jwt_required()
+def analyze_match_batch():
+    """Match analysis for a page of search results.
+
+    Body: {"jobs": [{"id", "job_title", "company", "job_description"}, ...]}.
+    Returns {"results": [{"index", "id", "analysis" | "error"}, ...]} in
+    request order, or with ``stream`` one ``result`` server-sent event per
+    job as it completes, then ``done`` ({"count", "failed"}).
+    """
+    gemini, error_response, status = _get_gemini_service()
+    if error_response:
+        return error_response, status
+
+    data = request.get_json() or {}
+    jobs = data.get('jobs')
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({'error': {'message': 'A non-empty list of jobs is required'}}), 400
+    max_jobs = current_app.config['MATCH_BATCH_MAX_JOBS']
+    if len(jobs) > max_jobs:
+        return jsonify({'error': {'message': f'At most {max_jobs} jobs can be analyzed at once'}}), 400
+
+    postings = []
+    for i, job in enumerate(jobs):
+        job_description = (job.get('job_description') or '').strip() if isinstance(job, dict) else ''
+        if not job_description:
+            return jsonify({'error': {'message': f'Job description is required (job {i + 1})'}}), 400
+        postings.append(_job_posting_text(job.get('job_title', ''), job.get('company', ''), job_description))
+
+    profile = _get_profile_dict()
+    if not profile.get('full_name'):
+        return jsonify({'error': {'message': 'User profile not found. Complete your profile first.'}}), 400
+
+    results = analyze_matches(gemini, postings, profile, current_app.config['MATCH_BATCH_CONCURRENCY'])
+
+    def entry(index, analysis, error):
+        item = {'index': index, 'id': jobs[index].get('id')}
+        if error is not None:
+            item['error'] = f'Match analysis failed: {str(error)}'
+            # Refused by the Gemini guard: lets the client back off
+            item.update(unavailable_details(error))
+        else:
+            item['analysis'] = analysis
+        return item
+
+    stream = request.args.get('stream', '').lower() == 'true' or data.get('stream') is True
+    if not stream:
+        items = sorted((entry(*r) for r in results), key=lambda item: item['index'])
+        return jsonify({'results': items})
+
+    def events():
+        failed = 0
+        for index, analysis, error in results:
+            failed += error is not None
+            payload = json.dumps(entry(index, analysis, error), ensure_ascii=False)
+            yield f"event: result\ndata: {payload}\n\n"
+        yield f"event: done\ndata: {json.dumps({'count': len(postings), 'failed': failed})}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
 
 
 @bp.route('/job-search/save-application', methods=['POST'])
@@ -227,6 +368,7 @@ def save_application():
             note='Created from job search',
         )
         db.session.add(history)
+        record_change(uid, {}, application_counters(application))
         db.session.commit()
 
         return jsonify({'application': application.to_dict()}), 201
@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from ..models import Job
+from ..services.job_queue import ensure_workers
+from ..utils.auth_helpers import get_current_user_id
+from ..utils.pagination import MAX_PAGE_SIZE
+
+bp = Blueprint('jobs', __name__, url_prefix='/api')
+
+
+@bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    uid = get_current_user_id()
+    job = Job.query.filter_by(id=job_id, user_id=uid).first_or_404()
+    if job.status == 'queued':
+        # Make sure this process is working the queue (e.g. after a restart)
+        ensure_workers()
+    return jsonify({'job': job.to_dict()})
+
+
+@bp.route('/jobs', methods=['GET'])
+@jwt_required()
+def list_jobs():
+    uid = get_current_user_id()
+    query = Job.query.filter_by(user_id=uid)
+
+    status = request.args.get('status')
+    if status:
+        if status not in Job.VALID_STATUSES:
+            return jsonify({'error': {'message': f'Invalid status. Must be one of: {", ".join(Job.VALID_STATUSES)}'}}), 400
+        query = query.filter(Job.status == status)
+    kind = request.args.get('kind')
+    if kind:
+        query = query.filter(Job.kind == kind)
+
+    limit = min(request.args.get('limit', 20, type=int), MAX_PAGE_SIZE)
+    jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit).all()
+    return jsonify({'jobs': [j.to_dict() for j in jobs]})
@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required
 from ..extensions import db
 from ..models import UserProfile
 from ..services.pdf_service import extract_text_from_pdf
+from ..services.profile_cache import invalidate_profile
 from ..utils.auth_helpers import get_current_user_id
 
 bp = Blueprint('profile', __name__, url_prefix='/api')
@@ -50,6 +51,7 @@ def update_profile():
                 setattr(profile, field, val)
 
     db.session.commit()
+    invalidate_profile(profile.user_id)
     return jsonify({'profile': profile.to_dict()})
 
 
@@ -94,4 +96,5 @@ def complete_onboarding():
     profile = _get_or_create_profile()
     profile.onboarding_completed = True
     db.session.commit()
+    invalidate_profile(profile.user_id)
     return jsonify({'completed': True})
@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required
 from ..extensions import db
 from ..models import Application, Reminder
 from ..utils.auth_helpers import get_current_user_id
+from ..utils.pagination import keyset_page, wants_cursor_pagination
 
 bp = Blueprint('reminders', __name__, url_prefix='/api')
 
@@ -35,6 +36,21 @@ def list_reminders():
 
     if not include_dismissed:
         query = query.filter(Reminder.is_dismissed == False)
+
+    if wants_cursor_pagination():
+        try:
+            reminders, next_cursor = keyset_page(
+                query, Reminder.remind_at, Reminder.id, 'asc',
+                request.args.get('cursor'), request.args.get('per_page', 20, type=int),
+            )
+        except ValueError as e:
+            return jsonify({'error': {'message': str(e)}}), 400
+        return jsonify({
+            'reminders': [r.to_dict() for r in reminders],
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        })
+
     reminders = query.order_by(Reminder.remind_at.asc()).all()
     return jsonify({'reminders': [r.to_dict() for r in reminders]})
 
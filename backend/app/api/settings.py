@@ -54,10 +54,8 @@ def test_api_key():
         return jsonify({'valid': False, 'error': 'No API key configured'}), 200
 
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        model.generate_content('Say hello')
+        from ..services.gemini_service import get_gemini_service
+        get_gemini_service(api_key).model.generate_content('Say hello')
         return jsonify({'valid': True})
     except Exception as e:
         return jsonify({'valid': False, 'error': str(e)})
@@ -0,0 +1,25 @@
+import click
+from flask.cli import AppGroup
+from .services.dashboard_snapshot import reconcile
+from .services.job_queue import prune_jobs
+
+dashboard_cli = AppGroup('dashboard', help='Dashboard snapshot maintenance.')
+jobs_cli = AppGroup('jobs', help='Background job maintenance.')
+
+
+@dashboard_cli.command('reconcile')
+@click.option('--user-id', type=int, multiple=True, help='Only check these users (repeatable).')
+def reconcile_command(user_id):
+    """Rebuild dashboard snapshots that drifted from the applications data.
+
+    Meant to run periodically (e.g. a nightly cron: flask --app run dashboard reconcile).
+    """
+    repaired = reconcile(list(user_id) or None)
+    click.echo(f'Repaired {len(repaired)} snapshot(s){": " + ", ".join(map(str, repaired)) if repaired else ""}')
+
+
+@jobs_cli.command('prune')
+@click.option('--days', type=int, default=7, show_default=True, help='Delete finished jobs older than this.')
+def prune_command(days):
+    """Delete old finished background jobs and their stored results."""
+    click.echo(f'Deleted {prune_jobs(days)} job(s)')
@@ -16,6 +16,19 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool (not used for SQLite). A gevent worker serves many
+    # requests at once, so it needs more connections than a sync one; keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's limit.
+    if not SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        _gevent = os.environ.get('GUNICORN_WORKER_CLASS') == 'gevent'
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10 if _gevent else 5)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': 10,
+            'pool_pre_ping': True,
+            'pool_recycle': 300,
+        }
+
     # File uploads
     UPLOAD_FOLDER = os.path.join(os.path.dirname(BASE_DIR), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload
@@ -26,8 +39,83 @@ class Config:
 
     # Shared API keys (environment variables for online version)
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
+    # 'rest' or 'grpc' (the SDK default). gunicorn.conf.py picks 'rest' for
+    # gevent workers, where gRPC calls would block the whole worker.
+    GEMINI_TRANSPORT = os.environ.get('GEMINI_TRANSPORT') or None
+    # Upload each profile's prompt prefix to Gemini context caching once it is
+    # long enough to qualify (estimated tokens); shorter ones are sent inline
+    GEMINI_CONTEXT_CACHE = os.environ.get('GEMINI_CONTEXT_CACHE', 'true').lower() == 'true'
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS = int(os.environ.get('GEMINI_CONTEXT_CACHE_MIN_TOKENS', 4096))
+    GEMINI_CONTEXT_CACHE_TTL = int(os.environ.get('GEMINI_CONTEXT_CACHE_TTL', 3600))
+
+    # Gemini calls per process: the in-flight limit adapts between MIN and
+    # MAX (halved on 429/5xx or calls slower than GEMINI_SLOW_CALL seconds);
+    # up to GEMINI_QUEUE_SIZE callers wait GEMINI_QUEUE_TIMEOUT seconds for a slot
+    GEMINI_CONCURRENCY_MIN = int(os.environ.get('GEMINI_CONCURRENCY_MIN', 2))
+    GEMINI_CONCURRENCY_MAX = int(os.environ.get('GEMINI_CONCURRENCY_MAX', 16))
+    GEMINI_QUEUE_SIZE = int(os.environ.get('GEMINI_QUEUE_SIZE', 32))
+    GEMINI_QUEUE_TIMEOUT = float(os.environ.get('GEMINI_QUEUE_TIMEOUT', 10))  # seconds
+    GEMINI_SLOW_CALL = float(os.environ.get('GEMINI_SLOW_CALL', 30))  # seconds
+    # Circuit breaker: fail fast for GEMINI_BREAKER_OPEN_SECONDS once this share
+    # of the calls in the last GEMINI_BREAKER_WINDOW seconds failed upstream
+    GEMINI_BREAKER_ERROR_RATE = float(os.environ.get('GEMINI_BREAKER_ERROR_RATE', 0.5))
+    GEMINI_BREAKER_MIN_CALLS = int(os.environ.get('GEMINI_BREAKER_MIN_CALLS', 10))
+    GEMINI_BREAKER_WINDOW = int(os.environ.get('GEMINI_BREAKER_WINDOW', 60))  # seconds
+    GEMINI_BREAKER_OPEN_SECONDS = int(os.environ.get('GEMINI_BREAKER_OPEN_SECONDS', 30))
+    # Estimated input-token budgets; over-budget postings, work experience
+    # and chat history are compressed to fit. A profile prefix of at least
+    # GEMINI_CONTEXT_CACHE_MIN_TOKENS is cached provider-side instead, so
+    # PROFILE_TOKEN_BUDGET only applies to shorter ones (or with caching off)
+    PROMPT_TOKEN_BUDGET = int(os.environ.get('PROMPT_TOKEN_BUDGET', 8000))
+    PROFILE_TOKEN_BUDGET = int(os.environ.get('PROFILE_TOKEN_BUDGET', 3000))
+    CHAT_TOKEN_BUDGET = int(os.environ.get('CHAT_TOKEN_BUDGET', 3000))
+    # Application chats: messages kept verbatim, and how many older ones
+    # accumulate (still sent verbatim) before being folded into the summary
+    CHAT_HISTORY_MESSAGES = int(os.environ.get('CHAT_HISTORY_MESSAGES', 10))
+    CHAT_SUMMARY_BATCH = int(os.environ.get('CHAT_SUMMARY_BATCH', 10))
     ADZUNA_APP_ID = os.environ.get('ADZUNA_APP_ID', '')
     ADZUNA_API_KEY = os.environ.get('ADZUNA_API_KEY', '')
+    # With source=all, providers slower than this (seconds) are left out
+    JOB_SEARCH_PROVIDER_TIMEOUT = float(os.environ.get('JOB_SEARCH_PROVIDER_TIMEOUT', 8))
+    # Shared job-search results cache: seconds fresh, then seconds served
+    # stale while refreshing in the background. TTL 0 disables it.
+    JOB_SEARCH_CACHE_TTL = int(os.environ.get('JOB_SEARCH_CACHE_TTL', 600))
+    JOB_SEARCH_CACHE_STALE_TTL = int(os.environ.get('JOB_SEARCH_CACHE_STALE_TTL', 3600))
+    JOB_SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_SEARCH_CACHE_MAX_ENTRIES', 1000))
+    # Warm the next results page in the background, within hourly budgets
+    JOB_SEARCH_PREFETCH = os.environ.get('JOB_SEARCH_PREFETCH', 'true').lower() == 'true'
+    JOB_SEARCH_PREFETCH_PER_USER = int(os.environ.get('JOB_SEARCH_PREFETCH_PER_USER', 30))
+    JOB_SEARCH_PREFETCH_GLOBAL = int(os.environ.get('JOB_SEARCH_PREFETCH_GLOBAL', 300))
+    # Batch match analysis: jobs per request and Gemini calls in flight per request
+    MATCH_BATCH_MAX_JOBS = int(os.environ.get('MATCH_BATCH_MAX_JOBS', 20))
+    MATCH_BATCH_CONCURRENCY = int(os.environ.get('MATCH_BATCH_CONCURRENCY', 4))
+    # Seconds a cached profile is used before checking updated_at again
+    PROFILE_CACHE_TTL = int(os.environ.get('PROFILE_CACHE_TTL', 60))
+
+    # Serve dashboard stats/funnel from the incrementally maintained
+    # per-user snapshot instead of aggregating applications on every load
+    DASHBOARD_SNAPSHOTS = os.environ.get('DASHBOARD_SNAPSHOTS', 'true').lower() == 'true'
+
+    # AI response cache: 'memory' (per worker), 'database' (shared) or 'none'
+    AI_CACHE_BACKEND = os.environ.get('AI_CACHE_BACKEND', 'memory').lower()
+    AI_CACHE_TTL = int(os.environ.get('AI_CACHE_TTL', 24 * 3600))  # seconds
+    AI_CACHE_MAX_ENTRIES = int(os.environ.get('AI_CACHE_MAX_ENTRIES', 500))
+
+    # Identical AI calls in flight at once share one model call. With the
+    # database cache, other workers wait up to SINGLE_FLIGHT_WAIT seconds for
+    # the owner's result; an owner's lock lapses after SINGLE_FLIGHT_LOCK_TTL
+    SINGLE_FLIGHT_WAIT = int(os.environ.get('SINGLE_FLIGHT_WAIT', 60))  # seconds
+    SINGLE_FLIGHT_LOCK_TTL = int(os.environ.get('SINGLE_FLIGHT_LOCK_TTL', 120))  # seconds
+
+    # Background jobs: worker threads per process, idle poll interval and
+    # how long a running job may go before it is considered interrupted
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2))  # seconds
+    JOB_STALE_AFTER = int(os.environ.get('JOB_STALE_AFTER', 900))  # seconds
+
+    # Comma-separated emails of the users allowed to read the per-worker
+    # metrics endpoints (AI/search cache, Gemini and prompt stats); none by default
+    OPS_EMAILS = [e.strip().lower() for e in os.environ.get('OPS_EMAILS', '').split(',') if e.strip()]
 
     # Cloudinary
     CLOUDINARY_URL = os.environ.get('CLOUDINARY_URL', '')
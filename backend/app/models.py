@@ -49,6 +49,10 @@ class UserProfile(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_user_profile_user_id', 'user_id'),
+    )
+
     def _parse_json(self, field):
         val = getattr(self, field)
         if not val:
@@ -109,14 +113,29 @@ class Application(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_applications_user_applied', 'user_id', 'applied_date'),
+        db.Index('ix_applications_user_status_applied', 'user_id', 'status', 'applied_date'),
+        db.Index('ix_applications_user_deadline', 'user_id', 'deadline'),
+        db.Index('ix_applications_user_created', 'user_id', 'created_at'),
+    )
+
     status_history = db.relationship('StatusHistory', backref='application', cascade='all, delete-orphan', order_by='StatusHistory.changed_at.desc()')
     documents = db.relationship('Document', backref='application', cascade='all, delete-orphan', order_by='Document.uploaded_at.desc()')
     reminders = db.relationship('Reminder', backref='application', cascade='all, delete-orphan', order_by='Reminder.remind_at')
     chat_messages = db.relationship('ChatMessage', backref='application', cascade='all, delete-orphan', order_by='ChatMessage.created_at')
+    chat_summaries = db.relationship('ChatSummary', cascade='all, delete-orphan')
     interview_events = db.relationship('InterviewEvent', backref='application', cascade='all, delete-orphan', order_by='InterviewEvent.interview_date')
 
     VALID_STATUSES = ['draft', 'sent', 'interview', 'rejected']
 
+    # Columns the list view needs; everything heavy (posting text, generated
+    # documents, match analysis) is left out.
+    SUMMARY_FIELDS = ['id', 'company', 'role', 'location', 'status',
+                      'salary_min', 'salary_max', 'salary_currency', 'url',
+                      'applied_date', 'response_date', 'deadline', 'match_score',
+                      'created_at', 'updated_at']
+
     def _parse_json(self, field):
         val = getattr(self, field)
         if not val:
@@ -126,6 +145,24 @@ class Application(db.Model):
         except (json.JSONDecodeError, TypeError):
             return val
 
+    def to_partial_dict(self, fields):
+        """Serialize only the given columns, formatted like to_dict().
+
+        Only touches the listed attributes, so it is safe on rows loaded
+        with load_only() without triggering deferred loads.
+        """
+        data = {}
+        for field in fields:
+            if field == 'match_analysis':
+                data[field] = self._parse_json(field)
+                continue
+            val = getattr(self, field)
+            data[field] = val.isoformat() if isinstance(val, (date, datetime)) else val
+        return data
+
+    def to_summary_dict(self):
+        return self.to_partial_dict(self.SUMMARY_FIELDS)
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -164,6 +201,10 @@ class StatusHistory(db.Model):
     changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     note = db.Column(db.Text)
 
+    __table_args__ = (
+        db.Index('ix_status_history_app_to_status_changed', 'application_id', 'to_status', 'changed_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -189,6 +230,10 @@ class Document(db.Model):
     cloud_public_id = db.Column(db.String(300))
     uploaded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_documents_app_uploaded', 'application_id', 'uploaded_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -212,6 +257,10 @@ class Reminder(db.Model):
     is_dismissed = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_reminders_app_dismissed_remind', 'application_id', 'is_dismissed', 'remind_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -235,6 +284,11 @@ class ChatMessage(db.Model):
     step = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_chat_messages_app_created', 'application_id', 'created_at'),
+        db.Index('ix_chat_messages_app_step_id', 'application_id', 'step', 'id'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -246,6 +300,28 @@ class ChatMessage(db.Model):
         }
 
 
+class ChatSummary(db.Model):
+    """Rolling summary of an application's chat in one step.
+
+    Covers the messages up to ``summarized_until`` (a ChatMessage id); the
+    newer ones are sent to the model verbatim. Maintained by
+    services.chat_history.
+    """
+    __tablename__ = 'chat_summaries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
+    step = db.Column(db.String(50), nullable=False, default='')
+    summary = db.Column(db.Text, nullable=False, default='')
+    summarized_until = db.Column(db.Integer, nullable=False, default=0)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('application_id', 'step', name='uq_chat_summary_app_step'),
+    )
+
+
 class Setting(db.Model):
     __tablename__ = 'settings'
 
@@ -290,6 +366,10 @@ class InterviewEvent(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_interview_events_app_date', 'application_id', 'interview_date'),
+    )
+
     VALID_TYPES = ['phone_screen', 'technical', 'behavioral', 'final', 'other']
     VALID_OUTCOMES = ['pending', 'passed', 'failed', 'offer']
 
@@ -309,3 +389,92 @@ class InterviewEvent(db.Model):
             'company': self.application.company if self.application else None,
             'role': self.application.role if self.application else None,
         }
+
+
+class DashboardCounter(db.Model):
+    """One named counter of a user's materialized dashboard snapshot.
+
+    Keys: ``status:<status>``, ``day:<YYYY-MM-DD>`` (applications per
+    applied_date), ``response_count``, ``response_days``, ``score_count``,
+    ``score_sum``, ``interview_ever`` and the ``built`` marker. Maintained by
+    services.dashboard_snapshot.
+    """
+    __tablename__ = 'dashboard_counters'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    key = db.Column(db.String(40), nullable=False)
+    value = db.Column(db.Float, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_dashboard_counter'),
+    )
+
+
+class AICacheEntry(db.Model):
+    """A cached AI model response, used by the ``database`` AI cache backend."""
+    __tablename__ = 'ai_cache_entries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), nullable=False, unique=True)
+    method = db.Column(db.String(50))
+    response = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+
+class FlightLock(db.Model):
+    """An AI call in progress in some worker, used by services.single_flight."""
+    __tablename__ = 'flight_locks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), nullable=False, unique=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+
+class Job(db.Model):
+    """A unit of background work run by services.job_queue."""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    params = db.Column(db.Text)  # JSON
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    # Set when the AI service refused the call (services.llm_guard)
+    error_reason = db.Column(db.String(30))
+    retry_after = db.Column(db.Integer)  # seconds
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status_created', 'status', 'created_at'),
+        db.Index('ix_jobs_user_created', 'user_id', 'created_at'),
+    )
+
+    VALID_STATUSES = ['queued', 'running', 'succeeded', 'failed']
+
+    def to_dict(self):
+        result = None
+        if self.result:
+            try:
+                result = json.loads(self.result)
+            except (json.JSONDecodeError, TypeError):
+                result = None
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'result': result,
+            'error': self.error,
+            'error_reason': self.error_reason,
+            'retry_after': self.retry_after,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,4 +1,4 @@
-import requests
+from . import http_client
 
 
 class AdzunaService:
@@ -23,7 +23,7 @@ class AdzunaService:
         if location:
             params['where'] = location
 
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
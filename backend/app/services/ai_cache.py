@@ -0,0 +1,176 @@
+"""Content-addressed cache for AI model responses.
+
+Entries are keyed by the model name plus a SHA-256 of the fully rendered
+prompt, so any change to the inputs or to the prompt template is a miss.
+Two backends are available, selected with AI_CACHE_BACKEND:
+
+- ``memory``: per-process LRU with TTL (default)
+- ``database``: the ai_cache_entries table, shared by every gunicorn worker
+
+Set AI_CACHE_BACKEND=none to disable caching.
+"""
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..models import AICacheEntry
+
+
+def cache_key(model_name, prompt):
+    digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return hashlib.sha256(f'{model_name}\n{digest}'.encode('utf-8')).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Base class: hit/miss counters per method around a get/set backend."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, method, outcome):
+        with self._stats_lock:
+            counts = self._stats.setdefault(method, {'hits': 0, 'misses': 0})
+            counts[outcome] += 1
+
+    def get(self, key, method):
+        value = self._get(key)
+        self._count(method, 'hits' if value is not None else 'misses')
+        return value
+
+    def peek(self, key):
+        """The cached value without counting a hit or miss."""
+        return self._get(key)
+
+    def set(self, key, value, method):
+        self._set(key, value, method)
+
+    def stats(self):
+        with self._stats_lock:
+            methods = {m: dict(c) for m, c in self._stats.items()}
+        hits = sum(c['hits'] for c in methods.values())
+        misses = sum(c['misses'] for c in methods.values())
+        return {
+            'backend': self.name,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+            'methods': methods,
+        }
+
+    @abstractmethod
+    def _get(self, key):
+        """The stored value for ``key``, or None if missing or expired."""
+
+    @abstractmethod
+    def _set(self, key, value, method):
+        """Store ``value`` under ``key``."""
+
+
+class MemoryCache(ResponseCache):
+    """In-process LRU with a TTL. Each gunicorn worker has its own."""
+    name = 'memory'
+
+    def __init__(self, max_entries, ttl):
+        super().__init__(max_entries, ttl)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, method):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DatabaseCache(ResponseCache):
+    """Shared cache in the ai_cache_entries table.
+
+    Uses its own connection so cache writes never commit (or roll back) the
+    request's session. Eviction is oldest-first once max_entries is reached.
+    """
+    name = 'database'
+
+    def __init__(self, max_entries, ttl, engine):
+        super().__init__(max_entries, ttl)
+        self.engine = engine
+        self.table = AICacheEntry.__table__
+
+    def _get(self, key):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table.c.response).where(
+                    self.table.c.key == key,
+                    self.table.c.expires_at > datetime.utcnow(),
+                )
+            ).first()
+        return row.response if row else None
+
+    def _set(self, key, value, method):
+        now = datetime.utcnow()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.table).where(self.table.c.key == key))
+                conn.execute(insert(self.table).values(
+                    key=key, method=method, response=value,
+                    created_at=now, expires_at=now + timedelta(seconds=self.ttl),
+                ))
+                self._evict(conn, now)
+        except IntegrityError:
+            # Another worker stored the same response first
+            pass
+
+    def _evict(self, conn, now):
+        conn.execute(delete(self.table).where(self.table.c.expires_at <= now))
+        cutoff = conn.execute(
+            select(self.table.c.id).order_by(self.table.c.id.desc())
+            .offset(self.max_entries).limit(1)
+        ).scalar()
+        if cutoff is not None:
+            conn.execute(delete(self.table).where(self.table.c.id <= cutoff))
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache():
+    """The process-wide response cache for the current app, or None if disabled."""
+    if not has_app_context():
+        return None
+    config = current_app.config
+    backend = config.get('AI_CACHE_BACKEND', 'memory')
+    if backend == 'none':
+        return None
+
+    cache_id = (backend, config['SQLALCHEMY_DATABASE_URI'])
+    with _caches_lock:
+        if cache_id not in _caches:
+            max_entries = config.get('AI_CACHE_MAX_ENTRIES', 500)
+            ttl = config.get('AI_CACHE_TTL', 86400)
+            if backend == 'database':
+                _caches[cache_id] = DatabaseCache(max_entries, ttl, db.engine)
+            else:
+                _caches[cache_id] = MemoryCache(max_entries, ttl)
+        return _caches[cache_id]
@@ -0,0 +1,120 @@
+"""Chat history for application chats, read back from ChatMessage.
+
+The model sees a rolling summary of an application's chat in the current
+step (ChatSummary) followed by every message not yet folded into it,
+verbatim. Once CHAT_SUMMARY_BATCH messages are older than the newest
+CHAT_HISTORY_MESSAGES they are folded into the summary in the background,
+so the verbatim part stays below CHAT_HISTORY_MESSAGES + CHAT_SUMMARY_BATCH
+messages however long the conversation gets.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..models import ChatMessage, ChatSummary
+
+# Messages folded into the summary per model call
+MAX_FOLD = 30
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chat-summary')
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _messages(application_id, step):
+    query = ChatMessage.query.filter(ChatMessage.application_id == application_id)
+    return query.filter(ChatMessage.step.is_(None) if step is None else ChatMessage.step == step)
+
+
+def _summary_row(application_id, step):
+    return ChatSummary.query.filter_by(application_id=application_id, step=step or '').first()
+
+
+def load_history(application_id, step):
+    """``(summary, messages)`` for an application's chat in ``step``.
+
+    ``messages`` are the ones the summary does not cover yet, oldest first,
+    as ``{'role', 'content'}`` dicts; ``summary`` is '' until one is written.
+    Only if summarizing keeps failing are there more than window + batch of
+    them; then the oldest are left out.
+    """
+    config = current_app.config
+    row = _summary_row(application_id, step)
+    until = row.summarized_until if row else 0
+    recent = _messages(application_id, step).filter(ChatMessage.id > until).order_by(
+        ChatMessage.id.desc()
+    ).limit(config.get('CHAT_HISTORY_MESSAGES', 10) + config.get('CHAT_SUMMARY_BATCH', 10)).all()
+    messages = [{'role': m.role, 'content': m.content} for m in reversed(recent)]
+    return (row.summary if row else ''), messages
+
+
+def update_summary(gemini, application_id, step):
+    """Fold messages older than the verbatim window into the summary.
+
+    Does nothing until at least CHAT_SUMMARY_BATCH such messages exist.
+    Returns True if the summary was updated. Commits.
+    """
+    window = current_app.config.get('CHAT_HISTORY_MESSAGES', 10)
+    batch = current_app.config.get('CHAT_SUMMARY_BATCH', 10)
+    row = _summary_row(application_id, step)
+    until = row.summarized_until if row else 0
+
+    older = _messages(application_id, step).with_entities(ChatMessage.id).filter(
+        ChatMessage.id > until
+    ).order_by(ChatMessage.id.desc()).offset(window).limit(MAX_FOLD * 4).all()
+    if len(older) < batch:
+        return False
+    fold_ids = sorted(message_id for (message_id,) in older)[:MAX_FOLD]
+    fold = ChatMessage.query.filter(ChatMessage.id.in_(fold_ids)).order_by(ChatMessage.id).all()
+
+    summary = gemini.summarize_chat(
+        row.summary if row else '',
+        [{'role': m.role, 'content': m.content} for m in fold],
+    )
+    values = {
+        'summary': summary,
+        'summarized_until': fold_ids[-1],
+        'message_count': (row.message_count if row else 0) + len(fold),
+    }
+    if row is None:
+        db.session.add(ChatSummary(application_id=application_id, step=step or '', **values))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker wrote the first summary meanwhile
+            db.session.rollback()
+            return False
+        return True
+    # Only advance from the state this summary was built on
+    updated = ChatSummary.query.filter_by(id=row.id, summarized_until=until).update(
+        values, synchronize_session=False
+    )
+    db.session.commit()
+    return bool(updated)
+
+
+def schedule_summary(gemini, application_id, step):
+    """Run ``update_summary`` in the background after new messages are saved."""
+    app = current_app._get_current_object()
+    key = (id(app), application_id, step)
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    _executor.submit(_run, app, gemini, application_id, step, key)
+
+
+def _run(app, gemini, application_id, step, key):
+    with app.app_context():
+        try:
+            # Catch up in batches if many messages arrived at once
+            while update_summary(gemini, application_id, step):
+                pass
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f'Chat summary for application {application_id} failed: {e}')
+        finally:
+            db.session.remove()
+            with _pending_lock:
+                _pending.discard(key)
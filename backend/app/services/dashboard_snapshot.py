@@ -0,0 +1,257 @@
+"""Materialized per-user dashboard snapshot.
+
+Every application contributes a few counters to its owner's snapshot (see
+``application_counters``). Write paths capture those counters before and
+after a change and call ``record_change``, which applies the difference as
+atomic ``value = value + delta`` upserts in the caller's transaction. The
+dashboard then reads a handful of counter rows instead of scanning the
+user's applications. ``reconcile`` rebuilds snapshots from source data to
+heal any drift; run it periodically with ``flask dashboard reconcile``.
+"""
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..models import Application, StatusHistory, DashboardCounter
+from .dashboard_stats import count_if, days_between
+
+BUILT_KEY = 'built'
+DAY_PREFIX = 'day:'
+STATUS_PREFIX = 'status:'
+
+
+def _reached_interview(app):
+    return db.session.query(
+        StatusHistory.query.filter(
+            StatusHistory.application_id == app.id,
+            StatusHistory.to_status == 'interview',
+        ).exists()
+    ).scalar()
+
+
+def application_counters(app):
+    """The counters a single application contributes to its owner's snapshot.
+
+    Call it before and after mutating an application (after adding any
+    StatusHistory row, which autoflush makes visible) and pass both results
+    to ``record_change``.
+    """
+    counters = {f'{STATUS_PREFIX}{app.status}': 1}
+    if app.applied_date:
+        counters[f'{DAY_PREFIX}{app.applied_date.isoformat()}'] = 1
+    if app.response_date and app.applied_date:
+        counters['response_count'] = 1
+        counters['response_days'] = (app.response_date - app.applied_date).days
+    if app.match_score is not None:
+        counters['score_count'] = 1
+        counters['score_sum'] = float(app.match_score)
+    if app.id is not None and _reached_interview(app):
+        counters['interview_ever'] = 1
+    return counters
+
+
+def _upsert_insert():
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _increment(user_id, deltas):
+    insert = _upsert_insert()
+    if insert is None:
+        # No portable upsert: read-modify-write, healed by reconcile if raced
+        for key, delta in deltas.items():
+            counter = DashboardCounter.query.filter_by(user_id=user_id, key=key).first()
+            if counter:
+                counter.value = counter.value + delta
+            else:
+                db.session.add(DashboardCounter(user_id=user_id, key=key, value=delta))
+        return
+
+    stmt = insert(DashboardCounter).values([
+        {'user_id': user_id, 'key': key, 'value': delta} for key, delta in deltas.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'key'],
+        set_={'value': DashboardCounter.value + stmt.excluded.value},
+    )
+    db.session.execute(stmt)
+
+
+def record_change(user_id, before, after):
+    """Apply the difference between two ``application_counters`` results.
+
+    Pass ``{}`` as ``before`` for a new application and as ``after`` for a
+    deleted one. Does not commit.
+    """
+    deltas = {}
+    for key in set(before) | set(after):
+        delta = after.get(key, 0) - before.get(key, 0)
+        if delta:
+            deltas[key] = delta
+    if deltas:
+        _increment(user_id, deltas)
+
+
+def _source_counters(user_id):
+    """Recompute a user's counters from the applications tables."""
+    has_response = db.and_(
+        Application.response_date.isnot(None),
+        Application.applied_date.isnot(None),
+    )
+    counters = {BUILT_KEY: 1}
+
+    rows = db.session.query(
+        Application.status,
+        func.count(Application.id),
+        count_if(has_response),
+        func.sum(case((has_response, days_between(Application.response_date, Application.applied_date)), else_=None)),
+        func.count(Application.match_score),
+        func.sum(Application.match_score),
+    ).filter(Application.user_id == user_id).group_by(Application.status).all()
+    for status, count, resp_count, resp_days, score_count, score_sum in rows:
+        counters[f'{STATUS_PREFIX}{status}'] = count
+        for key, value in (('response_count', resp_count), ('response_days', resp_days),
+                           ('score_count', score_count), ('score_sum', score_sum)):
+            if value:
+                counters[key] = counters.get(key, 0) + value
+
+    days = db.session.query(Application.applied_date, func.count(Application.id)).filter(
+        Application.user_id == user_id, Application.applied_date.isnot(None),
+    ).group_by(Application.applied_date).all()
+    for day, count in days:
+        counters[f'{DAY_PREFIX}{day.isoformat()}'] = count
+
+    interview_ever = db.session.query(func.count(func.distinct(StatusHistory.application_id))).join(
+        Application, Application.id == StatusHistory.application_id
+    ).filter(
+        Application.user_id == user_id,
+        StatusHistory.to_status == 'interview',
+    ).scalar()
+    if interview_ever:
+        counters['interview_ever'] = interview_ever
+    return counters
+
+
+def _stored_counters(user_id, since_day=None):
+    query = db.session.query(DashboardCounter.key, DashboardCounter.value).filter(
+        DashboardCounter.user_id == user_id
+    )
+    if since_day:
+        query = query.filter(db.or_(
+            ~DashboardCounter.key.startswith(DAY_PREFIX),
+            DashboardCounter.key >= f'{DAY_PREFIX}{since_day.isoformat()}',
+        ))
+    return dict(query.all())
+
+
+def rebuild_snapshot(user_id, counters=None):
+    """Replace a user's snapshot with counters recomputed from source. Does not commit."""
+    counters = counters if counters is not None else _source_counters(user_id)
+    DashboardCounter.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    db.session.add_all([
+        DashboardCounter(user_id=user_id, key=key, value=value) for key, value in counters.items()
+    ])
+    return counters
+
+
+def _differs(stored, source):
+    for key in set(stored) | set(source):
+        if abs(stored.get(key, 0) - source.get(key, 0)) > 1e-6:
+            return True
+    return False
+
+
+def reconcile(user_ids=None):
+    """Rebuild every snapshot that drifted from source data.
+
+    Checks the given users, or every user that has applications or a
+    snapshot. Returns the list of user ids that were repaired.
+    """
+    if user_ids is None:
+        with_apps = db.session.query(Application.user_id).distinct()
+        with_snapshot = db.session.query(DashboardCounter.user_id).distinct()
+        user_ids = sorted({uid for (uid,) in with_apps.union(with_snapshot).all()})
+
+    repaired = []
+    for user_id in user_ids:
+        source = _source_counters(user_id)
+        if _differs(_stored_counters(user_id), source):
+            rebuild_snapshot(user_id, source)
+            repaired.append(user_id)
+        db.session.commit()
+    if repaired:
+        current_app.logger.warning(f'Dashboard snapshot drift repaired for users: {repaired}')
+    return repaired
+
+
+def load_snapshot(user_id, since_day=None):
+    """Counters for a user, building the snapshot on first use.
+
+    Day counters older than ``since_day`` are not loaded.
+    """
+    counters = _stored_counters(user_id, since_day)
+    if BUILT_KEY not in counters:
+        rebuild_snapshot(user_id)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request built it first
+            db.session.rollback()
+        counters = _stored_counters(user_id, since_day)
+    return counters
+
+
+def _status_counts(counters):
+    return {
+        key[len(STATUS_PREFIX):]: int(value)
+        for key, value in counters.items()
+        if key.startswith(STATUS_PREFIX) and value
+    }
+
+
+def _days_since(counters, since):
+    return int(sum(
+        value for key, value in counters.items()
+        if key.startswith(DAY_PREFIX) and key >= f'{DAY_PREFIX}{since.isoformat()}'
+    ))
+
+
+def snapshot_stats(user_id, today=None):
+    """Same payload as dashboard_stats.compute_stats, read from the snapshot."""
+    today = today or date.today()
+    start_of_week = today - timedelta(days=today.weekday())
+    start_of_month = today.replace(day=1)
+    counters = load_snapshot(user_id, since_day=min(start_of_week, start_of_month))
+
+    by_status = _status_counts(counters)
+    total = sum(by_status.values())
+    responded = sum(count for status, count in by_status.items() if status not in ('sent', 'draft'))
+    response_count = counters.get('response_count', 0)
+    score_count = counters.get('score_count', 0)
+
+    return {
+        'total_applications': total,
+        'by_status': by_status,
+        'response_rate': round((responded / total) * 100, 1) if total > 0 else 0,
+        'avg_response_days': round(counters.get('response_days', 0) / response_count, 1) if response_count else 0,
+        'this_week': _days_since(counters, start_of_week),
+        'this_month': _days_since(counters, start_of_month),
+        'avg_match_score': round(counters.get('score_sum', 0) / score_count, 1) if score_count else None,
+    }
+
+
+def snapshot_funnel_counts(user_id):
+    """(total, sent, interview_ever, rejected) for the funnel, read from the snapshot."""
+    # date.max skips every day counter; the funnel needs none of them
+    counters = load_snapshot(user_id, since_day=date.max)
+    by_status = _status_counts(counters)
+    total = sum(by_status.values())
+    sent = sum(by_status.get(s, 0) for s in ('sent', 'interview', 'rejected'))
+    return total, sent, int(counters.get('interview_ever', 0)), by_status.get('rejected', 0)
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from sqlalchemy import case, func
+from ..extensions import db
+from ..models import Application
+
+
+def days_between(end, start):
+    """Whole days between two DATE columns, portable across SQLite and PostgreSQL."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return func.julianday(end) - func.julianday(start)
+    return end - start
+
+
+def count_if(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def compute_stats(user_id, today=None):
+    """Compute the dashboard stats for a user in a single aggregate query.
+
+    Rows are grouped by status so ``by_status`` keeps any status value stored
+    in the table; every other figure is a conditional aggregate folded
+    together in Python. No ORM objects are loaded.
+    """
+    today = today or date.today()
+    start_of_week = today - timedelta(days=today.weekday())
+    start_of_month = today.replace(day=1)
+
+    has_response = db.and_(
+        Application.response_date.isnot(None),
+        Application.applied_date.isnot(None),
+    )
+
+    rows = db.session.query(
+        Application.status,
+        func.count(Application.id),
+        count_if(has_response),
+        func.sum(case((has_response, days_between(Application.response_date, Application.applied_date)), else_=None)),
+        count_if(Application.applied_date >= start_of_week),
+        count_if(Application.applied_date >= start_of_month),
+        func.count(Application.match_score),
+        func.sum(Application.match_score),
+    ).filter(
+        Application.user_id == user_id
+    ).group_by(Application.status).all()
+
+    total = 0
+    responded = 0
+    by_status = {}
+    response_count = response_days = 0
+    this_week = this_month = 0
+    scored_count = score_sum = 0
+
+    for status, count, resp_count, resp_days, week, month, n_scored, s_scored in rows:
+        by_status[status] = count
+        total += count
+        if status not in ('sent', 'draft'):
+            responded += count
+        response_count += resp_count or 0
+        response_days += resp_days or 0
+        this_week += week or 0
+        this_month += month or 0
+        scored_count += n_scored or 0
+        score_sum += s_scored or 0
+
+    return {
+        'total_applications': total,
+        'by_status': by_status,
+        'response_rate': round((responded / total) * 100, 1) if total > 0 else 0,
+        'avg_response_days': round(response_days / response_count, 1) if response_count else 0,
+        'this_week': this_week,
+        'this_month': this_month,
+        'avg_match_score': round(score_sum / scored_count, 1) if scored_count else None,
+    }
@@ -1,7 +1,13 @@
 import json
 import re
+import threading
+from datetime import timedelta
 import google.generativeai as genai
+from google.generativeai import caching
+from flask import current_app, has_app_context
 from ..utils.prompts import (
+    CANDIDATE_PROFILE_PREFIX,
+    CANDIDATE_CONTACT_DETAILS,
     PARSE_JOB_POST_PROMPT,
     GENERATE_CV_PROMPT,
     GENERATE_COVER_LETTER_PROMPT,
@@ -13,19 +19,297 @@ from ..utils.prompts import (
     TAILOR_CV_WITH_TEMPLATE_PROMPT,
     GENERATE_COVER_LETTER_HTML_PROMPT,
     CHAT_PROMPT,
+    CHAT_SUMMARY_PROMPT,
     GENERATE_FOLLOWUP_PROMPT,
     INTERVIEW_PREP_PROMPT,
 )
+from .ai_cache import cache_key, get_response_cache
+from .profile_context import ProfileContexts, profile_version
+from .llm_guard import LLMGuard
+from .single_flight import SingleFlight, get_flight_locks
+from .prompt_budget import (
+    Section, compress_experiences, compress_posting, estimate_tokens, fit_sections, truncate, window_history,
+)
+
+MODEL_NAME = 'gemini-2.0-flash'
+# Context caching needs an explicit model version
+CONTEXT_CACHE_MODEL = 'models/gemini-2.0-flash-001'
+
+
+def _profile_json(profile, field):
+    """A profile JSON field as prompt text, pre-serialized if the profile is cached."""
+    serialized = getattr(profile, 'serialized', None)
+    if serialized is not None and field in serialized:
+        return serialized[field]
+    return json.dumps(profile.get(field, []), ensure_ascii=False)
+
+
+def _config(name, default):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+class ProfilePrompt:
+    """A prompt made of the candidate-profile prefix and a task suffix.
+
+    ``version`` identifies the prefix (see profile_context.profile_version);
+    ``str()`` gives the full prompt text.
+    """
+
+    def __init__(self, prefix, suffix, version):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.version = version
+
+    def __str__(self):
+        return self.prefix + self.suffix
+
+
+_HTML_FENCE_RE = re.compile(r'```(?:html)?\s*')
+# The trailing run of whitespace, backticks and "html" prefixes right after
+# a backtick: a fence may still be forming in it, and the final strip may
+# remove it, so it is only decided once more text (or the end) arrives
+_HTML_FENCE_TAIL_RE = re.compile(r'(?:\s|`|(?<=`)h(?:t(?:m(?:l)?)?)?)*$')
+
+
+def strip_html_fences(text):
+    """Remove markdown code fences the model sometimes wraps HTML in."""
+    cleaned = _HTML_FENCE_RE.sub('', text)
+    return cleaned.strip().rstrip('`')
+
+
+class HtmlFenceStripper:
+    """Incremental strip_html_fences for streamed output.
+
+    Feed chunks as they arrive and send on what ``feed`` returns; call
+    ``finish`` once at the end. The concatenated output equals
+    strip_html_fences() of the whole text, however it is split: text is cut
+    only after a character no fence can include, so everything before the
+    cut is stripped exactly as in the whole text. The trailing whitespace
+    and backticks (with any "html" after them) are held back until then.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._started = False
+
+    def feed(self, chunk):
+        text = self._pending + chunk
+        hold = _HTML_FENCE_TAIL_RE.search(text).start()
+        self._pending = text[hold:]
+        return self._emit(_HTML_FENCE_RE.sub('', text[:hold]))
+
+    def finish(self):
+        tail = _HTML_FENCE_RE.sub('', self._pending).rstrip().rstrip('`')
+        self._pending = ''
+        return self._emit(tail)
+
+    def _emit(self, text):
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_gemini_service(api_key):
+    """The process-wide GeminiService for ``api_key``, created on first use.
+
+    The service (and the model's underlying client and connections) is
+    shared by every request and thread in the worker. ``genai.configure`` is
+    global to the process, so only one key is active at a time: a different
+    key (e.g. after rotating GEMINI_API_KEY) replaces the shared service.
+    """
+    global _service
+    transport = current_app.config.get('GEMINI_TRANSPORT') if has_app_context() else None
+    service = _service
+    if service is not None and service.api_key == api_key and service.transport == transport:
+        return service
+    with _service_lock:
+        if _service is None or _service.api_key != api_key or _service.transport != transport:
+            _service = GeminiService(api_key, transport=transport)
+        return _service
+
+
+def reset_gemini_service():
+    """Drop the shared service so the next call rebuilds it."""
+    global _service
+    with _service_lock:
+        _service = None
 
 
 class GeminiService:
-    def __init__(self, api_key):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+    def __init__(self, api_key, cache=None, transport=None):
+        genai.configure(api_key=api_key, transport=transport)
+        self.api_key = api_key
+        self.transport = transport
+        self.model_name = MODEL_NAME
+        self.model = genai.GenerativeModel(MODEL_NAME)
+        self._cache = cache
+        # Cached contexts belong to the API key, so they live with the service
+        self.contexts = ProfileContexts()
+        self.flights = SingleFlight()
+        self.guard = LLMGuard.from_config(current_app.config if has_app_context() else {})
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else get_response_cache()
+
+    def _generate(self, prompt, cache_as=None, parse=None):
+        """Send a prompt to the model.
+
+        Methods whose output is deterministic enough to reuse opt in to the
+        response cache by passing ``cache_as`` (their name, used for the
+        hit/miss counters). Creative methods leave it unset and always call
+        the model. ``parse`` runs before a response is cached, so output
+        that fails to parse is never stored.
+        """
+        # One key for the response cache and both single-flight layers:
+        # prompts differing only in whitespace get the same answer
+        key = cache_key(self.model_name, ' '.join(str(prompt).split()))
+        cached = bool(cache_as and self.cache)
+        if cached:
+            text = self.cache.get(key, cache_as)
+            if text is not None:
+                return parse(text) if parse else text
+
+        def call():
+            model, contents = self._request(prompt)
+            text = self.guard.call(lambda: model.generate_content(contents)).text
+            value = parse(text) if parse else text
+            if cached:
+                self.cache.set(key, text, cache_as)
+            return value
+
+        # Identical prompts already being answered (double submits, several
+        # tabs) wait for that call instead of making their own
+        return self.flights.do(key, lambda: self._call_across_workers(key, call, parse) if cached else call())
+
+    def _call_across_workers(self, key, call, parse=None):
+        """``call()``, unless another worker is making it: then its cached result.
+
+        Only for cached methods with the shared database cache; the result is
+        picked up from there once the other worker stores it, and parsed
+        with ``parse`` like ``call()``'s own.
+        """
+        if getattr(self.cache, 'name', None) != 'database' or not has_app_context():
+            return call()
+        config = current_app.config
+        locks = get_flight_locks(self.cache.engine, config.get('SINGLE_FLIGHT_LOCK_TTL', 120))
+        if not locks.acquire(key):
+            text = locks.wait(key, lambda: self.cache.peek(key), config.get('SINGLE_FLIGHT_WAIT', 60))
+            if text is not None:
+                return parse(text) if parse else text
+            return call()
+        try:
+            return call()
+        finally:
+            locks.release(key)
 
-    def _generate(self, prompt):
-        response = self.model.generate_content(prompt)
-        return response.text
+    def _generate_stream(self, prompt):
+        """Yield the response text chunk by chunk as the model produces it."""
+        model, contents = self._request(prompt)
+        for chunk in self.guard.stream(lambda: model.generate_content(contents, stream=True)):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. only safety ratings)
+                continue
+            if text:
+                yield text
+
+    def _request(self, prompt):
+        """The model and contents to send ``prompt`` with.
+
+        A ProfilePrompt whose prefix has a provider-side cached context
+        (GEMINI_CONTEXT_CACHE) sends only its suffix to a model bound to that
+        context; anything else is sent as a single text.
+        """
+        if isinstance(prompt, ProfilePrompt) and has_app_context():
+            config = current_app.config
+            if config.get('GEMINI_CONTEXT_CACHE', True):
+                model = self.contexts.provider_handle(
+                    prompt.version, self._create_context,
+                    ttl=config.get('GEMINI_CONTEXT_CACHE_TTL', 3600),
+                    min_tokens=config.get('GEMINI_CONTEXT_CACHE_MIN_TOKENS', 4096),
+                )
+                if model is not None:
+                    return model, prompt.suffix
+        return self.model, str(prompt)
+
+    def _create_context(self, prefix, ttl):
+        cached = caching.CachedContent.create(
+            model=CONTEXT_CACHE_MODEL, contents=[prefix], ttl=timedelta(seconds=ttl),
+        )
+        return genai.GenerativeModel.from_cached_content(cached)
+
+    def _profile_prompt(self, profile, template, endpoint, contact=False, **fields):
+        """CANDIDATE_PROFILE_PREFIX for ``profile`` followed by ``template``.
+
+        Contact details are not part of the shared prefix; ``contact=True``
+        adds them to the task (``{contact_section}``) for the documents
+        that print them.
+
+        Work experience is compressed to fit PROFILE_TOKEN_BUDGET when the
+        prefix is rendered, unless the whole prefix is long enough for a
+        provider-side cached context (GEMINI_CONTEXT_CACHE_MIN_TOKENS): then
+        it is kept whole, since compressing it would only stop it from being
+        cached. ``job_posting`` is compressed so the whole prompt fits
+        PROMPT_TOKEN_BUDGET.
+        """
+        version = profile_version(profile)
+
+        def render():
+            other = dict(
+                full_name=profile.get('full_name', ''),
+                location=profile.get('location', ''),
+                professional_summary=profile.get('professional_summary', ''),
+                education=_profile_json(profile, 'education'),
+                skills=_profile_json(profile, 'skills'),
+                languages=_profile_json(profile, 'languages'),
+                certifications=_profile_json(profile, 'certifications'),
+            )
+            budget = _config('PROFILE_TOKEN_BUDGET', 3000)
+            if _config('GEMINI_CONTEXT_CACHE', True):
+                full = CANDIDATE_PROFILE_PREFIX.format(
+                    work_experiences=_profile_json(profile, 'work_experiences'), **other)
+                if estimate_tokens(full) >= _config('GEMINI_CONTEXT_CACHE_MIN_TOKENS', 4096):
+                    budget = max(budget, estimate_tokens(full))
+            texts = fit_sections(
+                'profile', budget,
+                CANDIDATE_PROFILE_PREFIX.format(work_experiences='', **other),
+                [Section('work_experiences', profile.get('work_experiences', []),
+                         render=lambda _: _profile_json(profile, 'work_experiences'),
+                         compress=compress_experiences)],
+            )
+            return CANDIDATE_PROFILE_PREFIX.format(work_experiences=texts['work_experiences'], **other)
+
+        prefix = self.contexts.prefix(version, render)
+        if contact:
+            fields['contact_section'] = CANDIDATE_CONTACT_DETAILS.format(
+                email=profile.get('email', ''),
+                phone=profile.get('phone', ''),
+                linkedin_url=profile.get('linkedin_url', ''),
+                portfolio_url=profile.get('portfolio_url', ''),
+            )
+        texts = fit_sections(
+            endpoint, _config('PROMPT_TOKEN_BUDGET', 8000),
+            prefix + template.format(**{**fields, 'job_posting': ''}),
+            [Section('job_posting', fields['job_posting'] or '', compress=compress_posting)],
+        )
+        return ProfilePrompt(prefix, template.format(**{**fields, 'job_posting': texts['job_posting']}), version)
+
+    def _stream_html(self, prompt):
+        stripper = HtmlFenceStripper()
+        for chunk in self._generate_stream(prompt):
+            cleaned = stripper.feed(chunk)
+            if cleaned:
+                yield cleaned
+        cleaned = stripper.finish()
+        if cleaned:
+            yield cleaned
 
     def _parse_json_response(self, text):
         cleaned = re.sub(r'```(?:json)?\s*', '', text)
@@ -33,9 +317,12 @@ class GeminiService:
         return json.loads(cleaned)
 
     def parse_job_posting(self, text):
-        prompt = PARSE_JOB_POST_PROMPT.format(text=text)
-        result = self._generate(prompt)
-        return self._parse_json_response(result)
+        texts = fit_sections(
+            'parse_job_posting', _config('PROMPT_TOKEN_BUDGET', 8000), PARSE_JOB_POST_PROMPT.format(text=''),
+            [Section('text', text or '', compress=compress_posting)],
+        )
+        prompt = PARSE_JOB_POST_PROMPT.format(text=texts['text'])
+        return self._generate(prompt, cache_as='parse_job_posting', parse=self._parse_json_response)
 
     def generate_cv(self, job_description, current_cv=None, instructions=None):
         current_cv_section = ""
@@ -83,7 +370,7 @@ class GeminiService:
             requirements=application_data.get('requirements', 'Not provided'),
             notes=application_data.get('notes', 'None'),
         )
-        return self._generate(prompt)
+        return self._generate(prompt, cache_as='summarize_application')
 
     def improve_text(self, text, instructions=None):
         instructions_section = ""
@@ -98,74 +385,40 @@ class GeminiService:
 
     def extract_profile_from_cv(self, cv_text):
         prompt = EXTRACT_CV_PROFILE_PROMPT.format(text=cv_text)
-        result = self._generate(prompt)
-        return self._parse_json_response(result)
+        return self._generate(prompt, cache_as='extract_profile_from_cv', parse=self._parse_json_response)
 
     def analyze_match(self, job_posting, profile):
-        skills_str = ', '.join(profile.get('skills', [])) if isinstance(profile.get('skills'), list) else str(profile.get('skills', ''))
-        experiences_str = json.dumps(profile.get('work_experiences', []), ensure_ascii=False)
-        education_str = json.dumps(profile.get('education', []), ensure_ascii=False)
-        languages_str = json.dumps(profile.get('languages', []), ensure_ascii=False)
-
-        prompt = MATCH_ANALYSIS_PROMPT.format(
-            full_name=profile.get('full_name', 'N/A'),
-            professional_summary=profile.get('professional_summary', 'N/A'),
-            skills=skills_str,
-            work_experiences=experiences_str,
-            education=education_str,
-            languages=languages_str,
-            job_posting=job_posting,
-        )
-        result = self._generate(prompt)
-        return self._parse_json_response(result)
+        prompt = self._profile_prompt(profile, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting=job_posting)
+        return self._generate(prompt, cache_as='analyze_match', parse=self._parse_json_response)
 
-    def tailor_cv_html(self, job_posting, profile, instructions=None):
+    def _tailor_cv_html_prompt(self, job_posting, profile, instructions=None):
         instructions_section = ""
         if instructions:
             instructions_section = f"Additional instructions: {instructions}"
 
-        prompt = TAILOR_CV_HTML_PROMPT.format(
-            full_name=profile.get('full_name', ''),
-            email=profile.get('email', ''),
-            phone=profile.get('phone', ''),
-            location=profile.get('location', ''),
-            linkedin_url=profile.get('linkedin_url', ''),
-            portfolio_url=profile.get('portfolio_url', ''),
-            professional_summary=profile.get('professional_summary', ''),
-            work_experiences=json.dumps(profile.get('work_experiences', []), ensure_ascii=False),
-            education=json.dumps(profile.get('education', []), ensure_ascii=False),
-            skills=json.dumps(profile.get('skills', []), ensure_ascii=False),
-            languages=json.dumps(profile.get('languages', []), ensure_ascii=False),
-            certifications=json.dumps(profile.get('certifications', []), ensure_ascii=False),
+        return self._profile_prompt(
+            profile, TAILOR_CV_HTML_PROMPT, 'tailor_cv_html', contact=True,
             job_posting=job_posting,
             instructions_section=instructions_section,
         )
-        result = self._generate(prompt)
-        # Strip any markdown code fences
-        cleaned = re.sub(r'```(?:html)?\s*', '', result)
-        cleaned = cleaned.strip().rstrip('`')
-        return cleaned
 
-    def tailor_cv_with_template(self, job_posting, profile, template_id='classic',
-                                include_photo=False, max_pages=1, skills_format='list',
-                                instructions=None):
+    def tailor_cv_html(self, job_posting, profile, instructions=None):
+        prompt = self._tailor_cv_html_prompt(job_posting, profile, instructions)
+        return strip_html_fences(self._generate(prompt))
+
+    def stream_tailor_cv_html(self, job_posting, profile, instructions=None):
+        prompt = self._tailor_cv_html_prompt(job_posting, profile, instructions)
+        return self._stream_html(prompt)
+
+    def _tailor_cv_with_template_prompt(self, job_posting, profile, template_id='classic',
+                                        include_photo=False, max_pages=1, skills_format='list',
+                                        instructions=None):
         instructions_section = ""
         if instructions:
             instructions_section = f"Additional instructions: {instructions}"
 
-        prompt = TAILOR_CV_WITH_TEMPLATE_PROMPT.format(
-            full_name=profile.get('full_name', ''),
-            email=profile.get('email', ''),
-            phone=profile.get('phone', ''),
-            location=profile.get('location', ''),
-            linkedin_url=profile.get('linkedin_url', ''),
-            portfolio_url=profile.get('portfolio_url', ''),
-            professional_summary=profile.get('professional_summary', ''),
-            work_experiences=json.dumps(profile.get('work_experiences', []), ensure_ascii=False),
-            education=json.dumps(profile.get('education', []), ensure_ascii=False),
-            skills=json.dumps(profile.get('skills', []), ensure_ascii=False),
-            languages=json.dumps(profile.get('languages', []), ensure_ascii=False),
-            certifications=json.dumps(profile.get('certifications', []), ensure_ascii=False),
+        return self._profile_prompt(
+            profile, TAILOR_CV_WITH_TEMPLATE_PROMPT, 'tailor_cv_with_template', contact=True,
             job_posting=job_posting,
             template_id=template_id,
             include_photo=str(include_photo).lower(),
@@ -173,30 +426,35 @@ class GeminiService:
             skills_format=skills_format,
             instructions_section=instructions_section,
         )
-        result = self._generate(prompt)
-        cleaned = re.sub(r'```(?:html)?\s*', '', result)
-        cleaned = cleaned.strip().rstrip('`')
-        return cleaned
 
-    def generate_cover_letter_html(self, job_posting, profile, company, role, instructions=None):
+    def tailor_cv_with_template(self, job_posting, profile, **options):
+        prompt = self._tailor_cv_with_template_prompt(job_posting, profile, **options)
+        return strip_html_fences(self._generate(prompt))
+
+    def stream_tailor_cv_with_template(self, job_posting, profile, **options):
+        prompt = self._tailor_cv_with_template_prompt(job_posting, profile, **options)
+        return self._stream_html(prompt)
+
+    def _cover_letter_html_prompt(self, job_posting, profile, company, role, instructions=None):
         instructions_section = ""
         if instructions:
             instructions_section = f"Additional instructions: {instructions}"
 
-        prompt = GENERATE_COVER_LETTER_HTML_PROMPT.format(
-            full_name=profile.get('full_name', ''),
-            professional_summary=profile.get('professional_summary', ''),
-            work_experiences=json.dumps(profile.get('work_experiences', []), ensure_ascii=False),
-            skills=json.dumps(profile.get('skills', []), ensure_ascii=False),
+        return self._profile_prompt(
+            profile, GENERATE_COVER_LETTER_HTML_PROMPT, 'cover_letter_html', contact=True,
             company=company,
             role=role,
             job_posting=job_posting,
             instructions_section=instructions_section,
         )
-        result = self._generate(prompt)
-        cleaned = re.sub(r'```(?:html)?\s*', '', result)
-        cleaned = cleaned.strip().rstrip('`')
-        return cleaned
+
+    def generate_cover_letter_html(self, job_posting, profile, company, role, instructions=None):
+        prompt = self._cover_letter_html_prompt(job_posting, profile, company, role, instructions)
+        return strip_html_fences(self._generate(prompt))
+
+    def stream_cover_letter_html(self, job_posting, profile, company, role, instructions=None):
+        prompt = self._cover_letter_html_prompt(job_posting, profile, company, role, instructions)
+        return self._stream_html(prompt)
 
     def generate_followup(self, application_data, profile, context_description):
         prompt = GENERATE_FOLLOWUP_PROMPT.format(
@@ -212,53 +470,70 @@ class GeminiService:
         return self._parse_json_response(result)
 
     def generate_interview_prep(self, application_data, profile):
-        skills_str = ', '.join(profile.get('skills', [])) if isinstance(profile.get('skills'), list) else str(profile.get('skills', ''))
-        experiences_str = json.dumps(profile.get('work_experiences', []), ensure_ascii=False)
-        education_str = json.dumps(profile.get('education', []), ensure_ascii=False)
-        languages_str = json.dumps(profile.get('languages', []), ensure_ascii=False)
-
-        prompt = INTERVIEW_PREP_PROMPT.format(
-            full_name=profile.get('full_name', 'N/A'),
-            professional_summary=profile.get('professional_summary', 'N/A'),
-            skills=skills_str,
-            work_experiences=experiences_str,
-            education=education_str,
-            languages=languages_str,
+        prompt = self._profile_prompt(
+            profile, INTERVIEW_PREP_PROMPT, 'interview_prep',
             company=application_data.get('company', 'N/A'),
             role=application_data.get('role', 'N/A'),
             job_posting=application_data.get('job_posting_text', 'Not available'),
         )
-        result = self._generate(prompt)
-        return self._parse_json_response(result)
+        return self._generate(prompt, cache_as='generate_interview_prep', parse=self._parse_json_response)
 
-    def chat(self, message, context):
+    def _chat_prompt(self, message, context):
         profile_section = ""
         if context.get('profile'):
             p = context['profile']
             profile_section = f"Candidate profile: {p.get('full_name', 'N/A')}, Skills: {', '.join(p.get('skills', []))}"
 
-        job_posting_section = ""
-        if context.get('job_posting'):
-            job_posting_section = f"Job posting:\n{context['job_posting'][:500]}"
-
         match_section = ""
         if context.get('match_analysis'):
             ma = context['match_analysis']
             match_section = f"Match score: {ma.get('match_score', 'N/A')}/10"
 
-        history_parts = []
-        for msg in context.get('history', [])[-10:]:
-            history_parts.append(f"{msg['role']}: {msg['content']}")
-        history = '\n'.join(history_parts) if history_parts else 'No previous messages.'
-
-        prompt = CHAT_PROMPT.format(
+        fields = dict(
             step=context.get('step', 'general'),
             company=context.get('company', 'N/A'),
             role=context.get('role', 'N/A'),
             profile_section=profile_section,
-            job_posting_section=job_posting_section,
             match_section=match_section,
-            history=history,
             message=message,
         )
-        return self._generate(prompt)
+        # History is windowed before the posting is shortened further
+        texts = fit_sections(
+            'chat', _config('CHAT_TOKEN_BUDGET', 3000),
+            CHAT_PROMPT.format(job_posting_section='', history='', **fields),
+            [
+                Section('history', context.get('history', []),
+                        render=lambda h: window_history(h, float('inf')), compress=window_history),
+                Section('job_posting', context.get('job_posting') or '', compress=compress_posting, limit=250),
+                Section('summary', context.get('summary') or '', compress=truncate, limit=400),
+            ],
+        )
+        job_posting_section = f"Job posting:\n{texts['job_posting']}" if texts['job_posting'] else ""
+        history = texts['history'] or 'No previous messages.'
+        if texts['summary']:
+            history = f"Summary of the earlier conversation: {texts['summary']}\n\nLatest messages:\n{history}"
+        return CHAT_PROMPT.format(
+            job_posting_section=job_posting_section,
+            history=history,
+            **fields,
+        )
+
+    def summarize_chat(self, summary, messages):
+        """``summary`` updated with ``messages`` (oldest first)."""
+        texts = fit_sections(
+            'chat_summary', _config('CHAT_TOKEN_BUDGET', 3000),
+            CHAT_SUMMARY_PROMPT.format(summary='', messages=''),
+            [
+                Section('messages', messages, render=lambda m: window_history(m, float('inf')),
+                        compress=window_history),
+                Section('summary', summary, compress=truncate),
+            ],
+        )
+        prompt = CHAT_SUMMARY_PROMPT.format(summary=texts['summary'] or '(none yet)', messages=texts['messages'])
+        return self._generate(prompt).strip()
+
+    def chat(self, message, context):
+        return self._generate(self._chat_prompt(message, context))
+
+    def stream_chat(self, message, context):
+        return self._generate_stream(self._chat_prompt(message, context))
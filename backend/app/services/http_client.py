@@ -0,0 +1,76 @@
+"""Shared HTTP client for outbound integrations.
+
+One ``requests.Session`` per process keeps connections alive in per-host
+pools instead of paying a TCP+TLS handshake on every call, and retries
+transient failures (connection errors, 429 and 5xx on idempotent methods)
+with jittered exponential backoff, honoring ``Retry-After`` up to
+MAX_RETRY_AFTER seconds; a response asking for a longer wait is returned
+as is rather than slept on.
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 15
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRY_AFTER = 5  # seconds
+
+
+class CappedRetry(Retry):
+    """Retry that gives up on a Retry-After longer than MAX_RETRY_AFTER.
+
+    urllib3 sleeps for the full Retry-After (backoff_max does not cap it),
+    so a 429 asking for minutes would hold the request thread that long.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                # With raise_on_status=False the pool returns the response
+                raise MaxRetryError(_pool, url, ResponseError(f'Retry-After {retry_after:.0f}s'))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    retry = CappedRetry(
+        total=3,
+        connect=3,
+        read=2,
+        status=3,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        backoff_max=10,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response to raise_for_status()
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """The process-wide pooled, retrying session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url, timeout=None, **kwargs):
+    """GET through the shared session with separate connect/read timeouts."""
+    return get_session().get(url, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs)
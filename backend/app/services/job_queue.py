@@ -0,0 +1,168 @@
+"""Background jobs backed by the jobs table.
+
+Endpoints submit work with ``submit_job`` and return the job id right away;
+``/api/jobs/<id>`` reports status and, once finished, the stored result, so
+a page reload can pick it up. Each app process runs JOB_WORKERS worker
+threads that claim queued jobs from the table with a conditional UPDATE, so
+several gunicorn workers can share the queue without an external broker.
+
+Handlers are registered with ``@job_handler(kind)`` and called as
+``handler(job, params)``; they return a JSON-serializable result.
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from ..extensions import db
+from ..models import Job
+from .llm_guard import UpstreamUnavailable
+
+_handlers = {}
+
+
+def job_handler(kind):
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def submit_job(user_id, kind, params):
+    """Queue a job and wake a worker. Commits and returns the Job."""
+    if kind not in _handlers:
+        raise ValueError(f'Unknown job kind: {kind}')
+    job = Job(user_id=user_id, kind=kind, params=json.dumps(params, ensure_ascii=False))
+    db.session.add(job)
+    db.session.commit()
+    ensure_workers().notify()
+    return job
+
+
+def set_progress(job, progress):
+    """Report a handler's progress (0-100). Commits."""
+    job.progress = max(0, min(100, int(progress)))
+    db.session.commit()
+
+
+def _claim_next():
+    """Mark the oldest queued job as running and return its id, or None."""
+    candidates = db.session.query(Job.id).filter(Job.status == 'queued').order_by(
+        Job.created_at, Job.id
+    ).limit(5).all()
+    for (job_id,) in candidates:
+        # Only one worker (in any process) sees its UPDATE match
+        claimed = Job.query.filter(Job.id == job_id, Job.status == 'queued').update(
+            {'status': 'running', 'started_at': datetime.utcnow()}, synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return job_id
+    return None
+
+
+def _fail_stale(stale_after):
+    """Fail jobs left running by a process that died mid-job."""
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+    Job.query.filter(Job.status == 'running', Job.started_at < cutoff).update({
+        'status': 'failed',
+        'error': 'Job was interrupted. Please try again.',
+        'finished_at': datetime.utcnow(),
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def _execute(job_id):
+    job = db.session.get(Job, job_id)
+    handler = _handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f'Unknown job kind: {job.kind}')
+        result = handler(job, json.loads(job.params or '{}'))
+        job.result = json.dumps(result, ensure_ascii=False)
+        job.status = 'succeeded'
+        job.progress = 100
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f'Job {job_id} ({job.kind}) failed: {e}')
+        job = db.session.get(Job, job_id)
+        job.status = 'failed'
+        job.error = str(e)
+        if isinstance(e, UpstreamUnavailable):
+            job.error_reason = e.reason
+            job.retry_after = e.retry_after
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+class JobWorkers:
+    """A fixed pool of worker threads for one app in one process."""
+
+    def __init__(self, app, size, poll_interval, stale_after):
+        self.app = app
+        self.size = size
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._wake = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.size):
+            thread = threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            job_id = None
+            with self.app.app_context():
+                try:
+                    job_id = _claim_next()
+                    if job_id is not None:
+                        _execute(job_id)
+                    else:
+                        _fail_stale(self.stale_after)
+                except Exception as e:
+                    db.session.rollback()
+                    current_app.logger.error(f'Job worker error: {e}')
+                finally:
+                    db.session.remove()
+            if job_id is None:
+                # Idle: sleep until a local submit or the next poll, which
+                # picks up jobs queued by other processes
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def ensure_workers(app=None):
+    """Start this process's worker threads for ``app`` if not running yet."""
+    app = app or current_app._get_current_object()
+    with _workers_lock:
+        workers = _workers.get(id(app))
+        if workers is None:
+            workers = JobWorkers(
+                app,
+                size=app.config.get('JOB_WORKERS', 2),
+                poll_interval=app.config.get('JOB_POLL_INTERVAL', 2),
+                stale_after=app.config.get('JOB_STALE_AFTER', 900),
+            )
+            workers.start()
+            _workers[id(app)] = workers
+        return workers
+
+
+def prune_jobs(older_than_days):
+    """Delete finished jobs older than the given age. Returns how many."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = Job.query.filter(
+        Job.status.in_(['succeeded', 'failed']),
+        Job.finished_at < cutoff,
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,99 @@
+"""Query several job-search providers at once and merge their results.
+
+Providers run concurrently on a shared thread pool; whatever has not answered
+within the deadline is reported as timed out and left out, so a search takes
+about as long as the slowest provider that made it in time.
+"""
+import re
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='job-search')
+
+
+def _normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.findall(r'\w+', text))
+
+
+def dedupe_key(job):
+    """Identity of a posting across providers: title, company and city."""
+    city = (job.get('location') or '').split(',')[0]
+    return _normalize(job.get('title')), _normalize(job.get('company')), _normalize(city)
+
+
+def _run(search):
+    start = time.perf_counter()
+    result = search()
+    return result, time.perf_counter() - start
+
+
+def search_providers(searches, deadline):
+    """Run ``{provider: callable}`` searches concurrently and merge them.
+
+    Each callable returns a provider's normalized results dict (jobs, total,
+    page, pages). Jobs are interleaved by rank so every provider shows up on
+    the first page, tagged with ``source``, and postings found by more than
+    one provider are kept once with all of them listed in ``sources``.
+    ``providers`` reports per-provider status: ok, timeout or error.
+    """
+    started = time.perf_counter()
+    futures = {_executor.submit(_run, search): name for name, search in searches.items()}
+    done, pending = wait(futures, timeout=deadline)
+
+    providers = {}
+    results = {}
+    for future, name in futures.items():
+        if future in pending:
+            future.cancel()
+            providers[name] = {'status': 'timeout', 'elapsed_ms': round(deadline * 1000)}
+            continue
+        try:
+            result, elapsed = future.result()
+        except Exception as e:
+            providers[name] = {'status': 'error', 'error': _error_message(e),
+                               'elapsed_ms': round((time.perf_counter() - started) * 1000)}
+            continue
+        results[name] = result
+        providers[name] = {'status': 'ok', 'count': len(result.get('jobs', [])),
+                           'elapsed_ms': round(elapsed * 1000)}
+
+    jobs = []
+    by_key = {}
+    ranked = [results[name].get('jobs', []) for name in searches if name in results]
+    names = [name for name in searches if name in results]
+    for rank in range(max((len(r) for r in ranked), default=0)):
+        for name, provider_jobs in zip(names, ranked):
+            if rank >= len(provider_jobs):
+                continue
+            job = provider_jobs[rank]
+            key = dedupe_key(job)
+            if key in by_key:
+                by_key[key]['sources'].append(name)
+                continue
+            job = {**job, 'source': name, 'sources': [name]}
+            by_key[key] = job
+            jobs.append(job)
+
+    return {
+        'jobs': jobs,
+        'total': sum(r.get('total', 0) for r in results.values()),
+        'page': max((r.get('page', 1) for r in results.values()), default=1),
+        'pages': max((r.get('pages', 0) for r in results.values()), default=0),
+        'providers': providers,
+        'partial': len(results) < len(searches),
+    }
+
+
+def _error_message(e):
+    # Same extraction as the single-provider path in api/job_search.py
+    response = getattr(e, 'response', None)
+    if response is not None:
+        try:
+            body = response.json()
+            return body.get('message', body.get('error', str(e)))
+        except Exception:
+            return response.text[:200] or str(e)
+    return str(e)
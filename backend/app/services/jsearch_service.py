@@ -1,4 +1,4 @@
-import requests
+from . import http_client
 
 
 class JSearchService:
@@ -24,7 +24,7 @@ class JSearchService:
             'num_pages': 1,
         }
 
-        response = requests.get(self.BASE_URL, headers=headers, params=params, timeout=15)
+        response = http_client.get(self.BASE_URL, headers=headers, params=params)
 
         # Debug: log error details before raising
         if response.status_code != 200:
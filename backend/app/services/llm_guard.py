@@ -0,0 +1,282 @@
+"""Per-process admission control for Gemini calls.
+
+When Gemini slows down or answers 429, every request thread would otherwise
+keep calling it and hold its worker until the call times out. ``LLMGuard``
+puts three things in front of each model call:
+
+- an adaptive concurrency limit (AIMD): the number of calls in flight grows
+  by about one per limit's worth of fast successful calls and halves on an
+  overload signal (429, 5xx, timeout, or a call slower than ``slow_call``),
+  at most once per ``decrease_interval``;
+- a bounded queue: callers over the limit wait up to ``queue_timeout``
+  seconds, and at most ``max_queue`` of them wait at a time;
+- a circuit breaker: once ``error_rate`` of the calls in the last ``window``
+  seconds failed upstream (with at least ``min_calls`` calls), calls fail
+  immediately for ``open_seconds``; then one trial call decides whether it
+  closes again.
+
+Rejected calls raise ``UpstreamUnavailable``, which routes turn into a 503
+with Retry-After. Errors that are not upstream trouble (invalid requests,
+unparseable output) pass through without counting as failures.
+"""
+import threading
+import time
+from collections import deque
+import requests
+from google.api_core import exceptions as google_exceptions
+
+# Errors that mean Gemini is overloaded or down rather than the request being
+# bad. The REST transport (used under gevent) lets requests' timeouts and
+# connection errors through unconverted; they are OSErrors, like the
+# builtin TimeoutError and ConnectionError.
+UPSTREAM_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServerError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.RetryError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    OSError,
+)
+
+
+class UpstreamUnavailable(Exception):
+    """A call refused by the guard; ``reason`` says why."""
+
+    MESSAGES = {
+        'circuit_open': 'The AI service is having problems. Please try again shortly.',
+        'queue_full': 'The AI service is busy. Please try again shortly.',
+        'queue_timeout': 'The AI service is busy. Please try again shortly.',
+    }
+
+    def __init__(self, reason, retry_after):
+        super().__init__(self.MESSAGES[reason])
+        self.reason = reason
+        self.retry_after = max(1, round(retry_after))
+
+
+class AdaptiveLimiter:
+
+    def __init__(self, initial, min_limit, max_limit, max_queue, slow_call, decrease_interval=5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.slow_call = slow_call
+        self.decrease_interval = decrease_interval
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+        self._last_decrease = 0.0
+
+    def acquire(self, timeout):
+        """Take a slot, waiting up to ``timeout`` seconds for one."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+            if self.waiting >= self.max_queue:
+                raise UpstreamUnavailable('queue_full', timeout)
+            deadline = time.monotonic() + timeout
+            self.waiting += 1
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise UpstreamUnavailable('queue_timeout', timeout)
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self, latency, overloaded):
+        """Free a slot and adjust the limit. ``latency`` None: not timed."""
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded or (latency is not None and latency > self.slow_call):
+                # One burst of 429s is a single signal, not one per call
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+            elif saturated:
+                # Only grow a limit that is actually being used
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+
+    def __init__(self, error_rate, min_calls, window, open_seconds):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.state = 'closed'
+        self.opened = 0
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (time, failed)
+        self._open_until = 0.0
+        self._probing = False
+
+    def allow(self):
+        """Raise UpstreamUnavailable unless a call may go ahead now."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'open':
+                if now < self._open_until:
+                    raise UpstreamUnavailable('circuit_open', self._open_until - now)
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'half_open':
+                if self._probing:
+                    raise UpstreamUnavailable('circuit_open', self.open_seconds)
+                self._probing = True
+
+    def record(self, failed):
+        """The outcome of an allowed call; None if it never reached Gemini."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'half_open':
+                self._probing = False
+                if failed:
+                    self._open(now)
+                elif failed is not None:
+                    self.state = 'closed'
+                    self._outcomes.clear()
+                return
+            if failed is None:
+                return
+            self._outcomes.append((now, failed))
+            self._trim(now)
+            failures = sum(f for _, f in self._outcomes)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open(now)
+
+    def _open(self, now):
+        self.state = 'open'
+        self.opened += 1
+        self._open_until = now + self.open_seconds
+        self._outcomes.clear()
+
+    def _trim(self, now):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def error_rate_now(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            if not self._outcomes:
+                return None
+            return round(sum(f for _, f in self._outcomes) / len(self._outcomes), 3)
+
+
+class LLMGuard:
+
+    def __init__(self, limiter, breaker, queue_timeout):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0, 'succeeded': 0, 'upstream_errors': 0, 'other_errors': 0,
+            'rejected_circuit_open': 0, 'rejected_queue_full': 0, 'rejected_queue_timeout': 0,
+            'queue_wait_ms': 0, 'latency_ms': 0, 'timed_calls': 0,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        max_limit = config.get('GEMINI_CONCURRENCY_MAX', 16)
+        return cls(
+            AdaptiveLimiter(
+                initial=max_limit // 2,
+                min_limit=config.get('GEMINI_CONCURRENCY_MIN', 2),
+                max_limit=max_limit,
+                max_queue=config.get('GEMINI_QUEUE_SIZE', 32),
+                slow_call=config.get('GEMINI_SLOW_CALL', 30),
+            ),
+            CircuitBreaker(
+                error_rate=config.get('GEMINI_BREAKER_ERROR_RATE', 0.5),
+                min_calls=config.get('GEMINI_BREAKER_MIN_CALLS', 10),
+                window=config.get('GEMINI_BREAKER_WINDOW', 60),
+                open_seconds=config.get('GEMINI_BREAKER_OPEN_SECONDS', 30),
+            ),
+            queue_timeout=config.get('GEMINI_QUEUE_TIMEOUT', 10),
+        )
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def _enter(self):
+        try:
+            self.breaker.allow()
+        except UpstreamUnavailable:
+            self._count(rejected_circuit_open=1)
+            raise
+        start = time.monotonic()
+        try:
+            self.limiter.acquire(self.queue_timeout)
+        except UpstreamUnavailable as e:
+            self.breaker.record(None)
+            self._count(**{f'rejected_{e.reason}': 1})
+            raise
+        self._count(calls=1, queue_wait_ms=round((time.monotonic() - start) * 1000))
+
+    def _exit(self, latency, error):
+        upstream = isinstance(error, UPSTREAM_ERRORS)
+        self.limiter.release(latency, upstream)
+        self.breaker.record(upstream if error is None or upstream else None)
+        if error is None:
+            self._count(succeeded=1)
+        else:
+            self._count(**{'upstream_errors' if upstream else 'other_errors': 1})
+        if latency is not None and error is None:
+            self._count(timed_calls=1, latency_ms=round(latency * 1000))
+
+    def call(self, fn):
+        """``fn()`` (one model call) under the limiter and circuit breaker."""
+        self._enter()
+        start = time.monotonic()
+        error = None
+        try:
+            return fn()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._exit(time.monotonic() - start, error)
+
+    def stream(self, chunks):
+        """Yield from ``chunks()`` holding one slot until the stream ends.
+
+        Stream durations depend on the output length, so they are not used
+        as a latency signal.
+        """
+        self._enter()
+        error = None
+        try:
+            yield from chunks()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._exit(None, error)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        timed, latency, queue_wait = stats.pop('timed_calls'), stats.pop('latency_ms'), stats.pop('queue_wait_ms')
+        stats['avg_latency_ms'] = round(latency / timed) if timed else None
+        stats['avg_queue_wait_ms'] = round(queue_wait / stats['calls']) if stats['calls'] else None
+        with self.limiter._cond:
+            stats['concurrency_limit'] = int(self.limiter.limit)
+            stats['in_flight'] = self.limiter.in_flight
+            stats['waiting'] = self.limiter.waiting
+        stats['circuit'] = self.breaker.state
+        stats['circuit_opened'] = self.breaker.opened
+        stats['error_rate'] = self.breaker.error_rate_now()
+        return stats
@@ -0,0 +1,50 @@
+"""Score several job postings against one profile with bounded concurrency.
+
+Each posting gets its own match-analysis prompt, so results stream back as
+they complete and share response-cache entries with the single-job endpoint.
+The candidate-profile part of the prompts is rendered once per profile
+version by GeminiService and reused across the batch.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from flask import current_app
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='match-batch')
+
+
+def analyze_matches(gemini, postings, profile, concurrency):
+    """Yield ``(index, analysis, error)`` per posting, in completion order.
+
+    At most ``concurrency`` analyses are in flight at a time; a failed one
+    yields its exception as ``error`` and does not stop the rest.
+    """
+    app = current_app._get_current_object()
+
+    def analyze(posting):
+        # The response cache is looked up through the app config
+        with app.app_context():
+            return gemini.analyze_match(posting, profile)
+
+    queue = iter(enumerate(postings))
+    pending = {}
+
+    def submit_next():
+        for index, posting in queue:
+            pending[_executor.submit(analyze, posting)] = index
+            return
+
+    for _ in range(max(1, concurrency)):
+        submit_next()
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                submit_next()
+                try:
+                    yield index, future.result(), None
+                except Exception as e:
+                    yield index, None, e
+    finally:
+        # Client went away: don't start analyses nobody will read
+        for future in pending:
+            future.cancel()
@@ -65,10 +65,37 @@ DEFAULT_CSS = """
 """
 
 
+def _gevent_active():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def _off_hub(fn, *args, **kwargs):
+    """Call CPU-bound ``fn`` where it cannot stall a gevent worker.
+
+    Under gunicorn's gevent worker, request handlers and job-queue workers
+    are greenlets: parsing or rendering a PDF in one would hold the hub and
+    stall every other request on the worker until it finished. gevent's
+    threadpool runs ``fn`` on a native thread while the caller waits
+    cooperatively. Without gevent this is a plain call.
+    """
+    if _gevent_active():
+        from gevent import get_hub
+        return get_hub().threadpool.apply(fn, args, kwargs)
+    return fn(*args, **kwargs)
+
+
 def extract_text_from_pdf(source):
     """Extract text from a PDF file using pdfplumber.
     source can be a filepath (str) or a file-like object (BytesIO / FileStorage).
     """
+    return _off_hub(_extract_text, source)
+
+
+def _extract_text(source):
     import pdfplumber
     text_parts = []
     with pdfplumber.open(source) as pdf:
@@ -104,7 +131,7 @@ def html_to_pdf(html_content, upload_folder=None, doc_type='cv', template_id=Non
 </html>"""
 
     buffer = BytesIO()
-    pisa_status = pisa.CreatePDF(full_html, dest=buffer)
+    pisa_status = _off_hub(pisa.CreatePDF, full_html, dest=buffer)
     if pisa_status.err:
         raise RuntimeError(f'PDF generation failed with {pisa_status.err} errors')
 
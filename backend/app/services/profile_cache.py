@@ -0,0 +1,85 @@
+"""Per-user cache of the profile used to build AI prompts.
+
+AI endpoints read the whole profile on every call; this keeps each user's
+``UserProfile.to_dict()`` in memory together with its JSON fields already
+serialized for prompts, so a call skips the query, the ``json.loads`` of
+the JSON columns and the ``json.dumps`` back into the prompt.
+
+Entries are versioned by ``updated_at``. Writes in this process drop the
+entry (``invalidate_profile``); within PROFILE_CACHE_TTL seconds an entry is
+used as is, after that it is revalidated with a query for ``updated_at``
+alone, which also picks up writes made by other processes.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from ..extensions import db
+from ..models import UserProfile
+
+JSON_FIELDS = ('work_experiences', 'education', 'skills', 'languages', 'certifications')
+MAX_ENTRIES = 1000
+
+
+class ProfileSnapshot(dict):
+    """A profile dict plus ``serialized``: its JSON fields as prompt-ready text.
+
+    ``version`` ((user id, profile id, updated_at)) identifies what was
+    loaded for whom; derived caches key on it (profile_context.profile_version).
+    Shared between requests: treat it as read-only.
+    """
+
+    def __init__(self, data, user_id):
+        super().__init__(data)
+        self.version = (user_id, data.get('id'), data.get('updated_at'))
+        self.serialized = {
+            field: json.dumps(data.get(field, []), ensure_ascii=False) for field in JSON_FIELDS
+        }
+
+
+_entries = OrderedDict()  # (database, user_id) -> (checked_at, updated_at, snapshot)
+_lock = threading.Lock()
+
+
+def _key(user_id):
+    return current_app.config['SQLALCHEMY_DATABASE_URI'], user_id
+
+
+def get_profile(user_id):
+    """The user's profile as a ProfileSnapshot, or {} if there is none."""
+    key = _key(user_id)
+    ttl = current_app.config.get('PROFILE_CACHE_TTL', 60)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+    if entry is not None:
+        checked_at, updated_at, snapshot = entry
+        if now - checked_at < ttl:
+            return snapshot
+        current = db.session.query(UserProfile.updated_at).filter_by(user_id=user_id).scalar()
+        if current is not None and current == updated_at:
+            with _lock:
+                if key in _entries:
+                    _entries[key] = (now, updated_at, snapshot)
+            return snapshot
+
+    profile = UserProfile.query.filter_by(user_id=user_id).first()
+    if not profile:
+        return {}
+    snapshot = ProfileSnapshot(profile.to_dict(), user_id)
+    if ttl > 0:
+        with _lock:
+            _entries[key] = (now, profile.updated_at, snapshot)
+            _entries.move_to_end(key)
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return snapshot
+
+
+def invalidate_profile(user_id):
+    """Drop the cached profile after it changes. Call after committing."""
+    with _lock:
+        _entries.pop(_key(user_id), None)
@@ -0,0 +1,99 @@
+"""Per-profile-version prompt contexts.
+
+Profile-based prompts start with the same candidate-profile block
+(``CANDIDATE_PROFILE_PREFIX``); only the task after it changes between
+calls. ``ProfileContexts`` renders that block once per profile version
+(see ``profile_version``) and, when it is long enough for Gemini's context
+caching, keeps a handle to a provider-side cached copy so requests send
+only the task part. Shorter blocks are sent inline as the first part of the
+prompt, where the API's implicit prefix caching can still reuse them.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+CHARS_PER_TOKEN = 4  # rough estimate; avoids a count_tokens call per profile
+
+
+def profile_version(profile):
+    """A cache key for what ``profile`` renders to.
+
+    A profile loaded server-side (a ProfileSnapshot) is keyed by its owner
+    and stored version. Any other dict, e.g. a profile sent in a request
+    body, is keyed by a hash of its content: its id and updated_at come from
+    the client, so they say nothing about what it contains or whose it is.
+    """
+    version = getattr(profile, 'version', None)
+    if version is not None:
+        return ('stored',) + version
+    content = json.dumps(profile, sort_keys=True, default=str, ensure_ascii=False)
+    return ('content', hashlib.sha256(content.encode('utf-8')).hexdigest())
+
+
+class ProfileContexts:
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # version -> {'prefix', 'handle', 'expires', 'state'}
+        self._stats = {'hits': 0, 'misses': 0, 'provider_created': 0, 'provider_reused': 0, 'provider_errors': 0}
+
+    def prefix(self, version, render):
+        """The rendered prefix for ``version``, calling ``render()`` on a miss."""
+        if version is None:
+            return render()
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is not None:
+                self._stats['hits'] += 1
+                self._entries.move_to_end(version)
+                return entry['prefix']
+            self._stats['misses'] += 1
+        prefix = render()
+        with self._lock:
+            self._entries[version] = {'prefix': prefix, 'handle': None, 'expires': 0, 'state': None}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prefix
+
+    def provider_handle(self, version, create, ttl, min_tokens):
+        """A provider-side cached context for ``version``'s prefix, or None.
+
+        ``create(prefix, ttl)`` uploads the prefix and returns a handle. None
+        means "send the prefix inline": the prefix is too short, an upload
+        for it is in progress, or uploading failed (not retried for this
+        version).
+        """
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None or len(entry['prefix']) / CHARS_PER_TOKEN < min_tokens:
+                return None
+            if entry['handle'] is not None and time.monotonic() < entry['expires']:
+                self._stats['provider_reused'] += 1
+                return entry['handle']
+            if entry['state'] in ('creating', 'failed'):
+                return None
+            entry['state'] = 'creating'
+            prefix = entry['prefix']
+        try:
+            handle = create(prefix, ttl)
+        except Exception:
+            with self._lock:
+                entry['state'] = 'failed'
+                self._stats['provider_errors'] += 1
+            return None
+        with self._lock:
+            entry['handle'] = handle
+            # Stop using it a minute before the provider drops it
+            entry['expires'] = time.monotonic() + ttl - 60
+            entry['state'] = None
+            self._stats['provider_created'] += 1
+        return handle
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
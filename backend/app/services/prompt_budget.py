@@ -0,0 +1,206 @@
+"""Token budgets for prompt assembly.
+
+Prompts are built from named sections (the job posting, the profile's work
+experience, chat history, ...). ``fit_sections`` estimates each section's
+tokens and, when the prompt would exceed its endpoint's budget, compresses
+sections in priority order until it fits:
+
+- job postings drop boilerplate (equal-opportunity and privacy notices,
+  share/apply links, repeated lines), then are cut at a sentence boundary;
+- work experience keeps the most recent roles in full and reduces older
+  ones to title, company and dates;
+- chat history keeps the newest messages that fit.
+
+Per-endpoint section sizes are logged and kept as counters for
+``/api/ai/prompt-stats``.
+"""
+import json
+import math
+import re
+import threading
+from flask import current_app, has_app_context
+
+CHARS_PER_TOKEN = 4
+MIN_SECTION_TOKENS = 50
+RECENT_EXPERIENCES = 3
+HISTORY_MESSAGE_CHARS = 1500
+
+_BOILERPLATE_RE = re.compile(
+    r'equal (?:employment )?opportunit|\beeo\b|affirmative action|reasonable accommodation'
+    r'|regardless of (?:race|gender|age)|privacy (?:policy|notice)|cookie|gdpr|dati personali'
+    r'|d\.\s?lgs|ai sensi|l\. ?903|legge 903|pari opportunit|share this job|apply now|click here'
+    r'|follow us on|candidati ora|condividi',
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)."""
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+
+def truncate(text, max_tokens):
+    """``text`` cut to about ``max_tokens``, at a sentence or line end if possible."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = max(cut.rfind('. '), cut.rfind('\n'))
+    if end > limit // 2:
+        cut = cut[:end + 1]
+    return cut.rstrip() + ' [...]'
+
+
+def compress_posting(text, max_tokens):
+    """A job posting without boilerplate lines, then cut to ``max_tokens``."""
+    lines = []
+    seen = set()
+    for line in (text or '').splitlines():
+        line = ' '.join(line.split())
+        key = line.lower()
+        if line and (key in seen or _BOILERPLATE_RE.search(line)):
+            continue
+        if line:
+            seen.add(key)
+        elif lines and not lines[-1]:
+            continue
+        lines.append(line)
+    return truncate('\n'.join(lines).strip(), max_tokens)
+
+
+def compress_experiences(experiences, max_tokens):
+    """Work experience as prompt JSON within ``max_tokens``.
+
+    The most recent roles (listed first) stay whole; older ones keep only
+    title, company and dates. If that is still too long, descriptions of
+    the recent roles are shortened and the oldest roles dropped.
+    """
+    experiences = [e for e in experiences or [] if isinstance(e, dict)]
+    recent = experiences[:RECENT_EXPERIENCES]
+    older = [
+        {k: e[k] for k in ('title', 'company', 'start_date', 'end_date') if e.get(k)}
+        for e in experiences[RECENT_EXPERIENCES:]
+    ]
+
+    def render(items):
+        return json.dumps(items, ensure_ascii=False)
+
+    text = render(recent + older)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    share = max(200, max_tokens * CHARS_PER_TOKEN // max(len(recent), 1) // 2)
+    recent = [
+        {k: (truncate(v, share // CHARS_PER_TOKEN) if isinstance(v, str) and len(v) > share else v) for k, v in e.items()}
+        for e in recent
+    ]
+    while older and estimate_tokens(render(recent + older)) > max_tokens:
+        older.pop()
+    return render(recent + older)
+
+
+def window_history(history, max_tokens):
+    """The newest chat messages that fit in ``max_tokens``, oldest first."""
+    lines = []
+    used = 0
+    for msg in reversed(history or []):
+        content = msg.get('content', '')
+        if len(content) > HISTORY_MESSAGE_CHARS:
+            content = content[:HISTORY_MESSAGE_CHARS] + ' [...]'
+        line = f"{msg.get('role', 'user')}: {content}"
+        cost = estimate_tokens(line) + 1
+        if lines and used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    omitted = len(history or []) - len(lines)
+    if omitted:
+        lines.append(f'({omitted} earlier messages omitted)')
+    return '\n'.join(reversed(lines))
+
+
+class Section:
+    """A named prompt section.
+
+    ``render(value)`` gives its full text; ``compress(value, max_tokens)``
+    a shorter one (None: the section is never compressed). ``limit`` caps
+    the section's tokens even when the prompt fits its budget.
+    """
+
+    def __init__(self, name, value, render=str, compress=None, limit=None):
+        self.name = name
+        self.value = value
+        self.render = render
+        self.compress = compress
+        self.limit = limit
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def fit_sections(endpoint, budget, fixed_text, sections):
+    """Texts for ``sections`` so that, with ``fixed_text``, the prompt fits ``budget``.
+
+    Sections are compressed in list order (least important first) until the
+    estimated total is within budget. Returns {name: text}.
+    """
+    texts = {}
+    for section in sections:
+        text = section.render(section.value)
+        if section.compress and section.limit and estimate_tokens(text) > section.limit:
+            text = section.compress(section.value, section.limit)
+        texts[section.name] = text
+    before = {s.name: estimate_tokens(s.render(s.value)) for s in sections}
+    fixed = estimate_tokens(fixed_text)
+    total = fixed + sum(estimate_tokens(t) for t in texts.values())
+
+    for section in sections:
+        if total <= budget:
+            break
+        if section.compress is None:
+            continue
+        others = total - estimate_tokens(texts[section.name])
+        texts[section.name] = section.compress(section.value, max(budget - others, MIN_SECTION_TOKENS))
+        total = others + estimate_tokens(texts[section.name])
+
+    after = {name: estimate_tokens(text) for name, text in texts.items()}
+    _record(endpoint, budget, fixed, before, after)
+    return texts
+
+
+def _record(endpoint, budget, fixed, before, after):
+    compressed = [name for name in after if after[name] < before[name]]
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, {
+            'prompts': 0, 'compressed': 0, 'over_budget': 0, 'fixed_tokens': 0,
+            'section_tokens': {}, 'tokens_saved': 0,
+        })
+        stats['prompts'] += 1
+        stats['compressed'] += bool(compressed)
+        stats['over_budget'] += fixed + sum(after.values()) > budget
+        stats['fixed_tokens'] += fixed
+        for name, tokens in after.items():
+            stats['section_tokens'][name] = stats['section_tokens'].get(name, 0) + tokens
+        stats['tokens_saved'] += sum(before.values()) - sum(after.values())
+    if has_app_context():
+        sizes = ', '.join(f'{name}={before[name]}->{after[name]}' if name in compressed
+                          else f'{name}={after[name]}' for name in after)
+        log = current_app.logger.info if compressed else current_app.logger.debug
+        log(f'Prompt {endpoint}: ~{fixed + sum(after.values())}/{budget} tokens (fixed={fixed}, {sizes})')
+
+
+def stats():
+    """Per-endpoint prompt counts and average estimated tokens per section."""
+    with _stats_lock:
+        result = {}
+        for endpoint, s in _stats.items():
+            n = s['prompts']
+            result[endpoint] = {
+                'prompts': n,
+                'compressed': s['compressed'],
+                'over_budget': s['over_budget'],
+                'tokens_saved': s['tokens_saved'],
+                'avg_fixed_tokens': round(s['fixed_tokens'] / n),
+                'avg_section_tokens': {name: round(t / n) for name, t in s['section_tokens'].items()},
+            }
+        return result
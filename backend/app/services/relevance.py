@@ -0,0 +1,137 @@
+"""Local relevance ranking of job-search results against a profile.
+
+A deterministic BM25 score of each posting (title and description) against
+the profile's skills, recent job titles and summary, with the page of
+results as the corpus and a small boost for postings in the profile's
+location. It costs a few milliseconds per page and no API calls, so results
+can be ordered before deciding which few to send for a Gemini match
+analysis.
+
+Profile term weights are cached per stored profile version.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+K1 = 1.2
+B = 0.75
+SKILL_WEIGHT = 3.0
+TITLE_WEIGHT = 2.0
+SUMMARY_WEIGHT = 0.5
+LOCATION_BOOST = 1.15
+
+STOPWORDS = frozenset('''
+a an and are as at be by for from has have in is it its of on or our the to we will with you your
+al alla che con da dei del della di e gli i il in la le per un una
+'''.split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+
+def tokenize(text):
+    """Lowercased, accent-free word tokens; keeps c++, c#, node.js intact."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return [t for t in _TOKEN_RE.findall(text) if (len(t) > 1 or t in ('c', 'r')) and t not in STOPWORDS]
+
+
+def _skill_names(profile):
+    skills = profile.get('skills') or []
+    if not isinstance(skills, list):
+        skills = str(skills).split(',')
+    names = (s.get('name', '') if isinstance(s, dict) else str(s) for s in skills)
+    return [name.strip() for name in names if name and name.strip()]
+
+
+def _build_profile_terms(profile):
+    weights = {}
+
+    def add(tokens, weight):
+        for token in tokens:
+            weights[token] = max(weights.get(token, 0), weight)
+
+    skills = []
+    for name in _skill_names(profile):
+        tokens = tokenize(name)
+        if tokens:
+            skills.append((name, tokens))
+            # A multi-word skill spreads its weight over its words
+            add(tokens, SKILL_WEIGHT / len(tokens))
+    for exp in (profile.get('work_experiences') or [])[:3]:
+        if isinstance(exp, dict):
+            add(tokenize(exp.get('title', '')), TITLE_WEIGHT)
+    add(tokenize(profile.get('professional_summary', '')), SUMMARY_WEIGHT)
+    location = set(tokenize((profile.get('location') or '').split(',')[0]))
+    return {'weights': weights, 'skills': skills, 'location': location}
+
+
+_profile_terms = OrderedDict()
+_profile_terms_lock = threading.Lock()
+_PROFILE_TERMS_MAX = 256
+
+
+def profile_terms(profile):
+    """Term weights for ``profile``, cached until the profile is updated.
+
+    Only server-loaded profiles (ProfileSnapshot) are cached: a plain dict's
+    id and updated_at may not describe its content.
+    """
+    version = getattr(profile, 'version', None)
+    if version is None:
+        return _build_profile_terms(profile)
+    with _profile_terms_lock:
+        terms = _profile_terms.get(version)
+        if terms is not None:
+            _profile_terms.move_to_end(version)
+            return terms
+    terms = _build_profile_terms(profile)
+    with _profile_terms_lock:
+        _profile_terms[version] = terms
+        while len(_profile_terms) > _PROFILE_TERMS_MAX:
+            _profile_terms.popitem(last=False)
+    return terms
+
+
+def rank_jobs(jobs, profile):
+    """Copies of ``jobs`` sorted by relevance to ``profile``, best first.
+
+    Each copy gets ``relevance`` (0-100, relative to the best posting on the
+    page) and ``matched_skills`` (profile skills found in the posting).
+    Ties keep the provider's order.
+    """
+    if not jobs:
+        return []
+    terms = profile_terms(profile)
+    weights = terms['weights']
+
+    docs = []
+    for job in jobs:
+        # The title counts twice: it says more about the role than the body
+        title = tokenize(job.get('title', ''))
+        docs.append(Counter(title * 2 + tokenize(job.get('description', ''))))
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = (sum(lengths) / len(lengths)) or 1
+    df = Counter(term for doc in docs for term in doc if term in weights)
+    n = len(docs)
+    idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    scored = []
+    for index, (job, doc, length) in enumerate(zip(jobs, docs, lengths)):
+        norm = K1 * (1 - B + B * length / avg_length)
+        score = sum(
+            weights[term] * idf[term] * doc[term] * (K1 + 1) / (doc[term] + norm)
+            for term in idf if term in doc
+        )
+        if terms['location'] and terms['location'] & set(tokenize(job.get('location', ''))):
+            score *= LOCATION_BOOST
+        matched = [name for name, tokens in terms['skills'] if all(t in doc for t in tokens)]
+        scored.append((score, index, matched))
+
+    best = max(score for score, _, _ in scored)
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [
+        {**jobs[index], 'relevance': round(100 * score / best) if best > 0 else 0, 'matched_skills': matched}
+        for score, index, matched in scored
+    ]
@@ -0,0 +1,219 @@
+"""Shared cache for external job-search results.
+
+Results are cached per process for every user, keyed by provider and the
+normalized search parameters (never by API key). A fresh entry is served
+as is; an entry past JOB_SEARCH_CACHE_TTL but within
+JOB_SEARCH_CACHE_STALE_TTL more seconds is served immediately while one
+background refresh replaces it (stale-while-revalidate). The least recently
+used entries are evicted beyond JOB_SEARCH_CACHE_MAX_ENTRIES.
+
+``prefetch`` warms an entry in the background (e.g. the next results page)
+within per-user and global hourly budgets, and the stats report how many
+prefetched entries were actually used.
+
+Concurrent loads of the same key (a miss, a refresh or a prefetch) share one
+upstream call.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from .single_flight import SingleFlight
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='search-refresh')
+
+
+def search_key(provider, query, location='', country='', page=1, per_page=15):
+    """Cache key for a provider search; equivalent searches share a key."""
+    def norm(value):
+        return ' '.join(str(value or '').lower().split())
+    return (provider, norm(query), norm(location), norm(country), int(page), int(per_page))
+
+
+class PrefetchBudget:
+    """Fixed-window limits on speculative upstream calls, per user and overall."""
+
+    def __init__(self, per_user, total, window=3600):
+        self.per_user = per_user
+        self.total = total
+        self.window = window
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._used_total = 0
+        self._used_by_user = {}
+
+    def take(self, user_id):
+        """Spend one prefetch for ``user_id``; False if either budget is used up."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._used_total = 0
+                self._used_by_user = {}
+            used = self._used_by_user.get(user_id, 0)
+            if self._used_total >= self.total or used >= self.per_user:
+                return False
+            self._used_total += 1
+            self._used_by_user[user_id] = used + 1
+            return True
+
+
+class SearchResultsCache:
+
+    def __init__(self, ttl, stale_ttl, max_entries, prefetch_budget=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.prefetch_budget = prefetch_budget
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (fresh_until, stale_until, results)
+        self._refreshing = set()
+        self._prefetched = set()  # warmed by prefetch and not read yet
+        self._flights = SingleFlight()
+        self._stats = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0,
+            'prefetches': 0, 'prefetch_hits': 0, 'prefetch_skipped_budget': 0, 'prefetch_errors': 0,
+        }
+
+    def _count(self, name):
+        # Callers hold self._lock
+        self._stats[name] += 1
+
+    def peek(self, key):
+        """True if a fresh entry exists for ``key``. Does not count as a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() < entry[0]
+
+    def fetch(self, key, load):
+        """Results for ``key``, calling ``load()`` on a miss.
+
+        The returned dict is shared with other requests: treat it as read-only.
+        """
+        if self.ttl <= 0:
+            return self._load(key, load)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if key in self._prefetched:
+                self._prefetched.discard(key)
+                if entry is not None:
+                    self._count('prefetch_hits')
+            if entry is not None:
+                fresh_until, stale_until, results = entry
+                if now < fresh_until:
+                    self._count('hits')
+                    self._entries.move_to_end(key)
+                    return results
+                if now < stale_until:
+                    self._count('stale_hits')
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        _refresh_executor.submit(self._refresh, key, load)
+                    return results
+                del self._entries[key]
+            self._count('misses')
+
+        results = self._load(key, load)
+        self.store(key, results)
+        return results
+
+    def _load(self, key, load):
+        """``load()``, or the result of a load already running for ``key``."""
+        return self._flights.do(key, load)
+
+    def store(self, key, results):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._prefetched.discard(evicted)
+
+    def _refresh(self, key, load):
+        try:
+            results = self._load(key, load)
+        except Exception:
+            # Keep serving the stale entry until it expires
+            with self._lock:
+                self._refreshing.discard(key)
+                self._count('refresh_errors')
+            return
+        self.store(key, results)
+        with self._lock:
+            self._refreshing.discard(key)
+            self._count('refreshes')
+
+    def prefetch(self, key, load, user_id):
+        """Warm ``key`` in the background unless it is fresh or over budget."""
+        if self.ttl <= 0 or self.prefetch_budget is None:
+            return False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return False
+            if key in self._refreshing:
+                return False
+            if not self.prefetch_budget.take(user_id):
+                self._count('prefetch_skipped_budget')
+                return False
+            self._refreshing.add(key)
+            self._count('prefetches')
+        _refresh_executor.submit(self._prefetch, key, load)
+        return True
+
+    def _prefetch(self, key, load):
+        try:
+            results = self._load(key, load)
+        except Exception:
+            with self._lock:
+                self._refreshing.discard(key)
+                self._count('prefetch_errors')
+            return
+        self.store(key, results)
+        with self._lock:
+            self._refreshing.discard(key)
+            self._prefetched.add(key)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        flights = self._flights.stats()
+        stats['upstream_calls'] = flights['calls']
+        stats['coalesced'] = flights['coalesced']
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else None
+        # Share of prefetched pages that a user went on to request
+        stats['prefetch_hit_rate'] = (
+            round(stats['prefetch_hits'] / stats['prefetches'], 3) if stats['prefetches'] else None
+        )
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache():
+    """The process-wide results cache for the current app."""
+    app = current_app._get_current_object()
+    with _caches_lock:
+        if id(app) not in _caches:
+            budget = None
+            if app.config.get('JOB_SEARCH_PREFETCH', True):
+                budget = PrefetchBudget(
+                    per_user=app.config.get('JOB_SEARCH_PREFETCH_PER_USER', 30),
+                    total=app.config.get('JOB_SEARCH_PREFETCH_GLOBAL', 300),
+                )
+            _caches[id(app)] = SearchResultsCache(
+                ttl=app.config.get('JOB_SEARCH_CACHE_TTL', 600),
+                stale_ttl=app.config.get('JOB_SEARCH_CACHE_STALE_TTL', 3600),
+                max_entries=app.config.get('JOB_SEARCH_CACHE_MAX_ENTRIES', 1000),
+                prefetch_budget=budget,
+            )
+        return _caches[id(app)]
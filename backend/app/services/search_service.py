@@ -0,0 +1,176 @@
+import html
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import load_only
+from ..extensions import db
+from ..models import Application
+
+SEARCH_COLUMNS = ['company', 'role', 'location', 'notes', 'requirements', 'job_posting_text']
+
+# Weighted document used on PostgreSQL. Must stay identical to the GIN
+# expression index created in migration 9b41d6e0c2a7, otherwise the planner
+# will not use the index.
+PG_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', coalesce(company, '') || ' ' || coalesce(role, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(notes, '') || ' ' || coalesce(requirements, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(job_posting_text, '')), 'D')"
+)
+PG_HEADLINE_SOURCE_SQL = (
+    "coalesce(company, '') || ' — ' || coalesce(role, '') || ' ' || coalesce(location, '') || ' ' || "
+    "coalesce(notes, '') || ' ' || coalesce(requirements, '') || ' ' || coalesce(job_posting_text, '')"
+)
+
+# Snippets are highlighted with control characters in SQL, then HTML-escaped
+# and turned into <mark> tags here, so user text can never inject markup.
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+# bm25 column weights, in SEARCH_COLUMNS order
+_FTS5_WEIGHTS = '10.0, 10.0, 4.0, 2.0, 2.0, 1.0'
+
+_fts_tables = {}
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _tokens(term):
+    return re.findall(r'\w+', term or '', flags=re.UNICODE)
+
+
+def _fts5_query(tokens):
+    # Every token must match, each as a prefix ("pyth" finds "python")
+    return ' '.join('"{}"*'.format(t.replace('"', '""')) for t in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join(f'{t}:*' for t in tokens)
+
+
+def fts_available():
+    """Whether the full-text index exists for the current database.
+
+    PostgreSQL always qualifies (the document is an expression, the GIN index
+    only speeds it up). SQLite needs the applications_fts table from the
+    migration; databases built with db.create_all() fall back to ILIKE.
+    """
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        return True
+    if dialect != 'sqlite':
+        return False
+    url = str(db.engine.url)
+    if url not in _fts_tables:
+        _fts_tables[url] = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'applications_fts'")
+        ).first() is not None
+    return _fts_tables[url]
+
+
+def match_clause(term):
+    """A WHERE clause restricting Application rows to full-text matches of ``term``."""
+    tokens = _tokens(term)
+    if not tokens:
+        return db.true()
+
+    if not fts_available():
+        like = f'%{term}%'
+        return db.or_(*[getattr(Application, c).ilike(like) for c in SEARCH_COLUMNS])
+
+    if _dialect() == 'postgresql':
+        return text(f"({PG_DOCUMENT_SQL}) @@ to_tsquery('simple', :fts_query)").bindparams(
+            fts_query=_tsquery(tokens))
+    return Application.id.in_(
+        text('SELECT rowid FROM applications_fts WHERE applications_fts MATCH :fts_query')
+        .bindparams(fts_query=_fts5_query(tokens))
+        .columns(rowid=db.Integer)
+    )
+
+
+def _render_snippet(raw):
+    if not raw:
+        return ''
+    escaped = html.escape(raw)
+    return escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def _ranked_ids_sqlite(user_id, tokens, limit, offset):
+    rows = db.session.execute(text(f"""
+        SELECT a.id,
+               bm25(applications_fts, {_FTS5_WEIGHTS}) AS rank,
+               snippet(applications_fts, -1, :start, :stop, '…', 16) AS snippet
+        FROM applications_fts
+        JOIN applications a ON a.id = applications_fts.rowid
+        WHERE applications_fts MATCH :fts_query AND a.user_id = :user_id
+        ORDER BY rank
+        LIMIT :limit OFFSET :offset
+    """), {
+        'start': _MARK_START, 'stop': _MARK_END, 'fts_query': _fts5_query(tokens),
+        'user_id': user_id, 'limit': limit, 'offset': offset,
+    }).all()
+    # bm25() is lower-is-better; flip it so every backend reports higher = better
+    return [(row.id, -row.rank, row.snippet) for row in rows]
+
+
+def _ranked_ids_postgresql(user_id, tokens, limit, offset):
+    rows = db.session.execute(text(f"""
+        SELECT id,
+               ts_rank({PG_DOCUMENT_SQL}, q.query) AS rank,
+               ts_headline('simple', {PG_HEADLINE_SOURCE_SQL}, q.query, :headline_opts) AS snippet
+        FROM applications, to_tsquery('simple', :fts_query) AS q(query)
+        WHERE user_id = :user_id AND ({PG_DOCUMENT_SQL}) @@ q.query
+        ORDER BY rank DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    """), {
+        'headline_opts': f'StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=24, MinWords=8, MaxFragments=2',
+        'fts_query': _tsquery(tokens), 'user_id': user_id, 'limit': limit, 'offset': offset,
+    }).all()
+    return [(row.id, row.rank, row.snippet) for row in rows]
+
+
+def _ranked_ids_fallback(user_id, term, limit, offset):
+    apps = Application.query.options(load_only(Application.id)).filter(
+        Application.user_id == user_id, match_clause(term),
+    ).order_by(Application.applied_date.desc(), Application.id.desc()).limit(limit).offset(offset).all()
+    return [(a.id, None, '') for a in apps]
+
+
+def search_applications(user_id, term, limit=20, offset=0):
+    """Ranked full-text search over a user's applications.
+
+    Returns (results, has_more) where each result is a dict with the summary
+    projection of the application, its relevance ``rank`` (higher is better)
+    and an HTML ``snippet`` with matches wrapped in <mark>.
+    """
+    tokens = _tokens(term)
+    if not tokens:
+        return [], False
+
+    if not fts_available():
+        ranked = _ranked_ids_fallback(user_id, term, limit + 1, offset)
+    elif _dialect() == 'postgresql':
+        ranked = _ranked_ids_postgresql(user_id, tokens, limit + 1, offset)
+    else:
+        ranked = _ranked_ids_sqlite(user_id, tokens, limit + 1, offset)
+
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+    if not ranked:
+        return [], False
+
+    apps = Application.query.options(
+        load_only(*[getattr(Application, f) for f in Application.SUMMARY_FIELDS])
+    ).filter(Application.id.in_([app_id for app_id, _, _ in ranked])).all()
+    by_id = {a.id: a for a in apps}
+
+    results = []
+    for app_id, rank, snippet in ranked:
+        if app_id in by_id:
+            results.append({
+                'application': by_id[app_id].to_summary_dict(),
+                'rank': rank,
+                'snippet': _render_snippet(snippet),
+            })
+    return results, has_more
@@ -0,0 +1,127 @@
+"""Coalescing of identical concurrent calls (single-flight).
+
+``SingleFlight.do(key, fn)`` runs ``fn`` once per key at a time within a
+process: callers that arrive while it is running wait for it and get the
+same result, or the same exception. Double-clicks and re-renders that fire
+the same request several times then cost one upstream call.
+
+``FlightLocks`` does the same across gunicorn workers, through the
+flight_locks table: the worker that inserts a key's row makes the call and
+the others wait for the result to appear in a store they share (the
+database AI cache). Rows expire, so a worker that dies mid-call does not
+block the key for long.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from ..models import FlightLock
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """``fn()``, shared with any concurrent call for the same ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['calls'] += 1
+            else:
+                self._stats['coalesced'] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+class FlightLocks:
+    """Cross-process call ownership in the flight_locks table."""
+
+    def __init__(self, engine, ttl):
+        self.engine = engine
+        self.ttl = ttl
+        self.table = FlightLock.__table__
+
+    def acquire(self, key):
+        """True if this process now owns ``key``; False if another does."""
+        now = datetime.utcnow()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.table).where(
+                    self.table.c.key == key, self.table.c.expires_at <= now,
+                ))
+                conn.execute(insert(self.table).values(
+                    key=key, expires_at=now + timedelta(seconds=self.ttl),
+                ))
+            return True
+        except IntegrityError:
+            return False
+
+    def release(self, key):
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+    def held(self, key):
+        with self.engine.connect() as conn:
+            return conn.execute(select(self.table.c.id).where(
+                self.table.c.key == key, self.table.c.expires_at > datetime.utcnow(),
+            )).first() is not None
+
+    def wait(self, key, lookup, timeout, interval=0.25):
+        """Poll ``lookup()`` while another process owns ``key``.
+
+        Returns its first non-None value, or None once the owner is gone
+        without producing one or ``timeout`` seconds pass.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            value = lookup()
+            if value is not None:
+                return value
+            if not self.held(key):
+                return lookup()
+            time.sleep(interval)
+        return None
+
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def get_flight_locks(engine, ttl):
+    with _locks_lock:
+        if engine not in _locks:
+            _locks[engine] = FlightLocks(engine, ttl)
+        return _locks[engine]
@@ -0,0 +1,23 @@
+"""Error responses for failed AI calls."""
+from flask import jsonify
+from ..services.llm_guard import UpstreamUnavailable
+
+
+def unavailable_details(e):
+    """``{'reason', 'retry_after'}`` for a call refused by the Gemini guard, else {}."""
+    if isinstance(e, UpstreamUnavailable):
+        return {'reason': e.reason, 'retry_after': e.retry_after}
+    return {}
+
+
+def ai_error(prefix, e):
+    """Error response for a failed AI call.
+
+    A call refused while Gemini is overloaded is a 503 with Retry-After;
+    anything else a 500 with ``prefix`` and the error.
+    """
+    if isinstance(e, UpstreamUnavailable):
+        response = jsonify({'error': {'message': str(e), **unavailable_details(e)}})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+    return jsonify({'error': {'message': f'{prefix}: {str(e)}'}}), 500
@@ -1,5 +1,8 @@
+from functools import wraps
+from flask import current_app, jsonify
 from flask_jwt_extended import get_jwt_identity
-from ..models import User, UserProfile
+from ..models import User
+from ..services.profile_cache import get_profile
 
 
 def get_current_user_id():
@@ -14,7 +17,16 @@ def get_current_user():
 
 
 def get_current_profile():
-    """Get the current user's profile, or empty dict if none."""
-    user_id = int(get_jwt_identity())
-    profile = UserProfile.query.filter_by(user_id=user_id).first()
-    return profile.to_dict() if profile else {}
+    """Get the current user's profile (cached, read-only), or empty dict if none."""
+    return get_profile(int(get_jwt_identity()))
+
+
+def ops_required(fn):
+    """Limit a route (under @jwt_required) to the users listed in OPS_EMAILS."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        user = get_current_user()
+        if user is None or user.email.lower() not in current_app.config.get('OPS_EMAILS', []):
+            return jsonify({'error': {'message': 'Not allowed'}}), 403
+        return fn(*args, **kwargs)
+    return wrapper
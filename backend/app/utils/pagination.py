@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import request
+from ..extensions import db
+
+MAX_PAGE_SIZE = 100
+
+
+def wants_cursor_pagination():
+    """True when the request asked for keyset pagination (?pagination=cursor or ?cursor=...)."""
+    return request.args.get('pagination') == 'cursor' or bool(request.args.get('cursor'))
+
+
+def encode_cursor(sort_key, order, value, row_id):
+    """Build an opaque cursor from the last row's sort value and id."""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps([sort_key, order, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_key, order, column):
+    """Return (sort value, id) from a cursor. Raises ValueError if it is malformed
+    or was issued for a different sort."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        row_id = int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Malformed cursor') from e
+    if key != sort_key or cursor_order != order:
+        raise ValueError('Cursor does not match the requested sort order')
+
+    if value is not None:
+        value = _cursor_value(value, column.type.python_type)
+    return value, row_id
+
+
+def _cursor_value(value, python_type):
+    """``value`` from a cursor as ``python_type``; ValueError if it is not one."""
+    try:
+        if python_type in (date, datetime):
+            return python_type.fromisoformat(value)
+        if python_type in (int, float) and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if python_type is int and value != int(value):
+                raise ValueError(value)
+            return python_type(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Malformed cursor') from e
+    if not isinstance(value, python_type) or isinstance(value, bool) != (python_type is bool):
+        raise ValueError('Malformed cursor')
+    return value
+
+
+def keyset_page(query, column, id_column, order, cursor, limit, sort_key=None):
+    """Fetch one page of ``query`` ordered by (column, id) after ``cursor``.
+
+    The sort column must be non-nullable. Cost is O(limit) regardless of how
+    deep the page is, because the cursor becomes a range predicate instead of
+    an OFFSET. Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    sort_key = sort_key or column.key
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key, order, column)
+        if order == 'asc':
+            query = query.filter(db.or_(column > value, db.and_(column == value, id_column > row_id)))
+        else:
+            query = query.filter(db.or_(column < value, db.and_(column == value, id_column < row_id)))
+
+    if order == 'asc':
+        query = query.order_by(column.asc(), id_column.asc())
+    else:
+        query = query.order_by(column.desc(), id_column.desc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, order, getattr(last, column.key), last.id)
+    return rows, next_cursor
@@ -138,18 +138,34 @@ CV Text:
 {text}
 ---"""
 
-MATCH_ANALYSIS_PROMPT = """You are an expert recruiter and career advisor. Analyze the match between this candidate's profile and the job posting.
-
-Candidate Profile:
+# The profile-based prompts below start with this block. It only changes
+# when the profile does, so GeminiService renders it once per profile
+# version and can hand it to Gemini's context caching as a shared prefix.
+CANDIDATE_PROFILE_PREFIX = """Candidate Profile:
 ---
 Name: {full_name}
+Location: {location}
 Summary: {professional_summary}
-Skills: {skills}
 Experience: {work_experiences}
 Education: {education}
+Skills: {skills}
 Languages: {languages}
+Certifications: {certifications}
 ---
 
+"""
+
+# Only for the documents that print them; kept out of the shared prefix
+CANDIDATE_CONTACT_DETAILS = """Candidate contact details:
+Email: {email}
+Phone: {phone}
+LinkedIn: {linkedin_url}
+Portfolio: {portfolio_url}
+
+"""
+
+MATCH_ANALYSIS_PROMPT = """You are an expert recruiter and career advisor. Analyze the match between the candidate's profile above and the job posting.
+
 Job Posting:
 ---
 {job_posting}
@@ -166,25 +182,9 @@ Return your response as a valid JSON object with these exact fields:
 Be realistic and honest in scoring. A score of 7+ means strong match, 5-7 moderate, below 5 weak.
 Only return the JSON object, no additional text or markdown code fences."""
 
-TAILOR_CV_HTML_PROMPT = """You are an expert CV writer. Generate a professional CV tailored to the job posting, using the candidate's profile data.
+TAILOR_CV_HTML_PROMPT = """You are an expert CV writer. Generate a professional CV tailored to the job posting, using the candidate's profile data above.
 
-Candidate Profile:
----
-Name: {full_name}
-Email: {email}
-Phone: {phone}
-Location: {location}
-LinkedIn: {linkedin_url}
-Portfolio: {portfolio_url}
-Summary: {professional_summary}
-Experience: {work_experiences}
-Education: {education}
-Skills: {skills}
-Languages: {languages}
-Certifications: {certifications}
----
-
-Job Posting:
+{contact_section}Job Posting:
 ---
 {job_posting}
 ---
@@ -211,17 +211,9 @@ Guidelines:
 - Write in the same language as the job posting
 - Return ONLY the HTML content, no markdown, no code fences"""
 
-GENERATE_COVER_LETTER_HTML_PROMPT = """You are an expert cover letter writer. Generate a professional cover letter using the candidate's profile for this job.
-
-Candidate Profile:
----
-Name: {full_name}
-Summary: {professional_summary}
-Experience: {work_experiences}
-Skills: {skills}
----
+GENERATE_COVER_LETTER_HTML_PROMPT = """You are an expert cover letter writer. Generate a professional cover letter using the candidate's profile above for this job.
 
-Company: {company}
+{contact_section}Company: {company}
 Role: {role}
 
 Job Posting:
@@ -272,17 +264,7 @@ Return your response as a valid JSON object with these exact fields:
 
 Only return the JSON object, no additional text or markdown code fences."""
 
-INTERVIEW_PREP_PROMPT = """You are an expert interview coach. Prepare a comprehensive interview preparation guide for this candidate and position.
-
-Candidate Profile:
----
-Name: {full_name}
-Summary: {professional_summary}
-Skills: {skills}
-Experience: {work_experiences}
-Education: {education}
-Languages: {languages}
----
+INTERVIEW_PREP_PROMPT = """You are an expert interview coach. Prepare a comprehensive interview preparation guide for the candidate above and this position.
 
 Company: {company}
 Role: {role}
@@ -316,25 +298,9 @@ Generate a detailed interview preparation guide. Return your response as a valid
 Write in the same language as the job posting.
 Only return the JSON object, no additional text or markdown code fences."""
 
-TAILOR_CV_WITH_TEMPLATE_PROMPT = """You are an expert CV writer. Generate a professional CV tailored to the job posting, using the candidate's profile data and following a specific template layout.
+TAILOR_CV_WITH_TEMPLATE_PROMPT = """You are an expert CV writer. Generate a professional CV tailored to the job posting, using the candidate's profile data above and following a specific template layout.
 
-Candidate Profile:
----
-Name: {full_name}
-Email: {email}
-Phone: {phone}
-Location: {location}
-LinkedIn: {linkedin_url}
-Portfolio: {portfolio_url}
-Summary: {professional_summary}
-Experience: {work_experiences}
-Education: {education}
-Skills: {skills}
-Languages: {languages}
-Certifications: {certifications}
----
-
-Job Posting:
+{contact_section}Job Posting:
 ---
 {job_posting}
 ---
@@ -398,3 +364,14 @@ Respond helpfully and concisely. If the user asks about their chances, refer to
 If they ask for improvements, give specific actionable advice.
 Keep responses focused and under 200 words unless more detail is needed.
 Respond in the same language the user writes in."""
+
+CHAT_SUMMARY_PROMPT = """Update the running summary of a conversation between a job seeker and their AI career advisor about one job application.
+
+Summary so far:
+{summary}
+
+New messages:
+{messages}
+
+Write the updated summary in at most 150 words. Keep facts about the candidate and the role, decisions, the user's preferences and open questions; drop greetings and repetition.
+Write in the language of the conversation. Return only the summary text."""
@@ -0,0 +1,31 @@
+"""Gunicorn settings, loaded by: gunicorn -c gunicorn.conf.py "app:create_app()"
+
+The API mostly waits on Gemini, Adzuna, JSearch and Cloudinary, so the
+recommended mode is GUNICORN_WORKER_CLASS=gevent: each worker then serves up
+to GUNICORN_WORKER_CONNECTIONS requests concurrently on greenlets instead of
+one at a time. Worker count comes from WEB_CONCURRENCY and the bind address
+from PORT, as usual for gunicorn.
+"""
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# AI generation regularly takes longer than gunicorn's 30 s default
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+if worker_class == 'gevent':
+    # The gevent worker monkey-patches sockets before loading the app, so
+    # requests-based clients (Adzuna, JSearch, Cloudinary, Gemini over REST)
+    # yield while waiting. Gemini's default gRPC transport would not.
+    # CPU-bound work never yields: background job workers are greenlets
+    # too, so PDF parsing and rendering (pdf_service) run on gevent's native
+    # threadpool instead of blocking the worker's other requests.
+    os.environ.setdefault('GEMINI_TRANSPORT', 'rest')
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent' and os.environ.get('DATABASE_URL', '').startswith('postgres'):
+        # Make psycopg2 wait on the database cooperatively too
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -51,6 +51,20 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave schema objects created by hand in migrations out of autogenerate.
+
+    The full-text search objects from 9b41d6e0c2a7 (the SQLite FTS5 table
+    and its shadow tables, the PostgreSQL expression index) have no model,
+    so autogenerate would otherwise emit drops for them.
+    """
+    if type_ == 'table' and name.startswith('applications_fts'):
+        return False
+    if type_ == 'index' and name == 'ix_applications_fts':
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +79,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -93,6 +108,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
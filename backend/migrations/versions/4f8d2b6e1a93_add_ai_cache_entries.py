@@ -0,0 +1,31 @@
+"""add ai cache entries
+
+Revision ID: 4f8d2b6e1a93
+Revises: e3a7c9152d84
+Create Date: 2026-10-17 15:21:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8d2b6e1a93'
+down_revision = 'e3a7c9152d84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_cache_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('key', sa.String(64), nullable=False, unique=True),
+        sa.Column('method', sa.String(50)),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('ai_cache_entries')
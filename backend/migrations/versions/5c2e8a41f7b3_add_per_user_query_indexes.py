@@ -0,0 +1,72 @@
+"""add per-user query indexes
+
+Revision ID: 5c2e8a41f7b3
+Revises: d0599d7dfc18
+Create Date: 2026-10-17 09:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a41f7b3'
+down_revision = 'd0599d7dfc18'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) — each one mirrors a filter + ORDER BY shape
+# used by the blueprints. settings(user_id, key) is already served by the
+# uq_user_setting unique constraint.
+INDEXES = [
+    # list_applications (default sort), calendar, timeline, stats date windows
+    ('ix_applications_user_applied', 'applications', ['user_id', 'applied_date']),
+    # list_applications?status=..., followup suggestions, deadline alerts by status
+    ('ix_applications_user_status_applied', 'applications', ['user_id', 'status', 'applied_date']),
+    # dashboard deadline alerts
+    ('ix_applications_user_deadline', 'applications', ['user_id', 'deadline']),
+    # dashboard recent applications
+    ('ix_applications_user_created', 'applications', ['user_id', 'created_at']),
+    # application detail history, funnel and follow-up "entered interview" lookups
+    ('ix_status_history_app_to_status_changed', 'status_history', ['application_id', 'to_status', 'changed_at']),
+    # application detail documents
+    ('ix_documents_app_uploaded', 'documents', ['application_id', 'uploaded_at']),
+    # reminders list / upcoming
+    ('ix_reminders_app_dismissed_remind', 'reminders', ['application_id', 'is_dismissed', 'remind_at']),
+    # application detail chat history
+    ('ix_chat_messages_app_created', 'chat_messages', ['application_id', 'created_at']),
+    # interviews list and calendar month window
+    ('ix_interview_events_app_date', 'interview_events', ['application_id', 'interview_date']),
+    # get_current_profile() on every AI call
+    ('ix_user_profile_user_id', 'user_profile', ['user_id']),
+]
+
+
+def upgrade():
+    # interview_events is mapped in the models but was never created by a
+    # migration; create it here so databases built with `flask db upgrade`
+    # have it before it gets indexed.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('interview_events'):
+        op.create_table('interview_events',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('application_id', sa.Integer(), sa.ForeignKey('applications.id'), nullable=False),
+            sa.Column('interview_date', sa.DateTime(), nullable=False),
+            sa.Column('interview_type', sa.String(50)),
+            sa.Column('phase_number', sa.Integer(), server_default='1'),
+            sa.Column('location', sa.String(300)),
+            sa.Column('notes', sa.Text()),
+            sa.Column('outcome', sa.String(30), server_default='pending'),
+            sa.Column('salary_offered', sa.String(100)),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
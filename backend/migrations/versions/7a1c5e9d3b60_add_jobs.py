@@ -0,0 +1,40 @@
+"""add jobs
+
+Revision ID: 7a1c5e9d3b60
+Revises: 4f8d2b6e1a93
+Create Date: 2026-10-17 16:48:12.630915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1c5e9d3b60'
+down_revision = '4f8d2b6e1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('params', sa.Text()),
+        sa.Column('result', sa.Text()),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+    op.create_index('ix_jobs_status_created', 'jobs', ['status', 'created_at'])
+    op.create_index('ix_jobs_user_created', 'jobs', ['user_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_user_created', table_name='jobs')
+    op.drop_index('ix_jobs_status_created', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,79 @@
+"""add application full-text search
+
+Revision ID: 9b41d6e0c2a7
+Revises: 5c2e8a41f7b3
+Create Date: 2026-10-17 11:40:05.902117
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b41d6e0c2a7'
+down_revision = '5c2e8a41f7b3'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ['company', 'role', 'location', 'notes', 'requirements', 'job_posting_text']
+
+# Must match PG_DOCUMENT_SQL in app/services/search_service.py
+PG_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', coalesce(company, '') || ' ' || coalesce(role, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(notes, '') || ' ' || coalesce(requirements, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(job_posting_text, '')), 'D')"
+)
+
+
+def _sqlite_upgrade():
+    cols = ', '.join(COLUMNS)
+    new_cols = ', '.join(f'new.{c}' for c in COLUMNS)
+    old_cols = ', '.join(f'old.{c}' for c in COLUMNS)
+
+    # External-content FTS5 table: stores only the index, reads text from applications
+    op.execute(
+        f"CREATE VIRTUAL TABLE applications_fts USING fts5({cols}, "
+        f"content='applications', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(f"""
+        CREATE TRIGGER applications_fts_ai AFTER INSERT ON applications BEGIN
+            INSERT INTO applications_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER applications_fts_ad AFTER DELETE ON applications BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER applications_fts_au AFTER UPDATE OF {cols} ON applications BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO applications_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """)
+    op.execute("INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')")
+
+
+def _sqlite_downgrade():
+    op.execute('DROP TRIGGER IF EXISTS applications_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS applications_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS applications_fts_ai')
+    op.execute('DROP TABLE IF EXISTS applications_fts')
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Expression index: always in sync with the row, no triggers needed
+        op.execute(f'CREATE INDEX ix_applications_fts ON applications USING gin (({PG_DOCUMENT_SQL}))')
+    elif dialect == 'sqlite':
+        _sqlite_upgrade()
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_applications_fts')
+    elif dialect == 'sqlite':
+        _sqlite_downgrade()
@@ -0,0 +1,35 @@
+"""add chat summaries
+
+Revision ID: b8e4f1a7c265
+Revises: 7a1c5e9d3b60
+Create Date: 2026-10-17 19:02:44.518337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f1a7c265'
+down_revision = '7a1c5e9d3b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_summaries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('application_id', sa.Integer(), sa.ForeignKey('applications.id'), nullable=False),
+        sa.Column('step', sa.String(50), nullable=False, server_default=''),
+        sa.Column('summary', sa.Text(), nullable=False, server_default=''),
+        sa.Column('summarized_until', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('application_id', 'step', name='uq_chat_summary_app_step'),
+    )
+    op.create_index('ix_chat_messages_app_step_id', 'chat_messages', ['application_id', 'step', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_chat_messages_app_step_id', table_name='chat_messages')
+    op.drop_table('chat_summaries')
@@ -0,0 +1,28 @@
+"""add flight locks
+
+Revision ID: d51c7e3f9a08
+Revises: b8e4f1a7c265
+Create Date: 2026-10-17 20:14:09.731652
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd51c7e3f9a08'
+down_revision = 'b8e4f1a7c265'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('flight_locks',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('key', sa.String(64), nullable=False, unique=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('flight_locks')
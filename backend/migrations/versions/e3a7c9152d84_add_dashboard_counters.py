@@ -0,0 +1,31 @@
+"""add dashboard counters
+
+Revision ID: e3a7c9152d84
+Revises: 9b41d6e0c2a7
+Create Date: 2026-10-17 14:02:51.447310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c9152d84'
+down_revision = '9b41d6e0c2a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Snapshots are built lazily on each user's first dashboard load
+    op.create_table('dashboard_counters',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('key', sa.String(40), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False, server_default='0'),
+        sa.UniqueConstraint('user_id', 'key', name='uq_dashboard_counter'),
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_counters')
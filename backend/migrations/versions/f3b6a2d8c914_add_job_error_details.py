@@ -0,0 +1,28 @@
+"""add job error details
+
+Revision ID: f3b6a2d8c914
+Revises: d51c7e3f9a08
+Create Date: 2026-10-17 23:02:41.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b6a2d8c914'
+down_revision = 'd51c7e3f9a08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('error_reason', sa.String(length=30), nullable=True))
+        batch_op.add_column(sa.Column('retry_after', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_column('retry_after')
+        batch_op.drop_column('error_reason')
@@ -0,0 +1,58 @@
+"""Benchmark the per-request cost of getting a ready-to-use Gemini client.
+
+Compares building a new GeminiService on every request (what the blueprints
+used to do) with the shared get_gemini_service() registry. The setup cost
+includes creating the underlying API client, which the first
+generate_content() call does and genai.configure() discards. No API
+requests are sent, so any key works.
+
+Usage (from backend/):
+    python scripts/bench_gemini_setup.py [--iterations 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _ready_client(service):
+    # What the first generate_content() call does before any network I/O
+    from google.generativeai import client as genai_client
+    if service.model._client is None:
+        service.model._client = genai_client.get_default_generative_client()
+    return service.model._client
+
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    from app.services.gemini_service import GeminiService, get_gemini_service, reset_gemini_service
+
+    key = 'bench-key-not-used-for-requests'
+    per_request = _time(lambda: _ready_client(GeminiService(key)), args.iterations)
+    reset_gemini_service()
+    shared = _time(lambda: _ready_client(get_gemini_service(key)), args.iterations)
+
+    print(f"{'setup':<28}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'new GeminiService/request':<28}{per_request[0]:>10.3f}{per_request[1]:>10.3f}")
+    print(f"{'shared get_gemini_service':<28}{shared[0]:>10.3f}{shared[1]:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark application search: full-text index vs the old ILIKE filter.
+
+Builds a throwaway database with the real migrations, seeds one user with
+--count applications (default 10,000) of realistic-looking text plus a
+second user of equal size as noise, then times each search path.
+
+Usage (from backend/):
+    python scripts/bench_search.py [--count 10000] [--runs 30]
+    BENCH_DATABASE_URL=postgresql://... python scripts/bench_search.py
+
+Without BENCH_DATABASE_URL a temporary SQLite file is used. Point it only
+at a disposable PostgreSQL database: the script creates its own schema.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Searchable words, spread across a Zipf-distributed vocabulary so that
+# some terms are common and others rare, as in real postings.
+WORDS = (
+    'python java kubernetes docker react typescript golang rust sql postgres aws azure gcp '
+    'terraform backend frontend fullstack data engineer analyst scientist machine learning '
+    'product manager designer agile scrum remote hybrid milano roma london berlin senior '
+    'junior lead architect platform security devops mobile android ios testing automation '
+    'team stakeholders customers growth startup enterprise fintech healthcare ecommerce'
+).split()
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne']
+TERMS = ['team', 'python', 'kubernetes senior', 'milano', 'ecommerce', 'acme', 'zzznotfound']
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'tu', 'ra', 'so', 've', 'di', 'po', 'ze', 'bu', 'fa', 'gi', 'ho']
+VOCAB_SIZE = 20000
+
+
+def _vocabulary(rng):
+    vocab = set()
+    while len(vocab) < VOCAB_SIZE - len(WORDS):
+        vocab.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    vocab = sorted(vocab)
+    rng.shuffle(vocab)
+    # WORDS[i] lands at rank 1 + 8 * i**2: from very common to quite rare
+    for i, word in enumerate(WORDS):
+        vocab.insert(1 + 8 * i * i, word)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    cum_weights = []
+    total = 0.0
+    for w in weights:
+        total += w
+        cum_weights.append(total)
+    return vocab, cum_weights
+
+
+def _text(rng, vocab, n):
+    words, cum_weights = vocab
+    return ' '.join(rng.choices(words, cum_weights=cum_weights, k=n))
+
+
+def _seed(db, Application, User, count):
+    rng = random.Random(42)
+    vocab = _vocabulary(rng)
+    users = [User(email=f'bench{i}@example.com', password_hash='x', full_name=f'Bench {i}') for i in range(2)]
+    db.session.add_all(users)
+    db.session.flush()
+    today = date.today()
+    for user in users:
+        rows = [{
+            'user_id': user.id,
+            'company': rng.choice(COMPANIES) + f' {i}',
+            'role': _text(rng, vocab, 3),
+            'location': rng.choice(['Milano', 'Roma', 'London', 'Berlin', 'Remote']),
+            'status': rng.choice(Application.VALID_STATUSES),
+            'notes': _text(rng, vocab, 20),
+            'requirements': _text(rng, vocab, 30),
+            'job_posting_text': _text(rng, vocab, 400),
+            'applied_date': today - timedelta(days=rng.randint(0, 365)),
+        } for i in range(count)]
+        db.session.execute(db.insert(Application), rows)
+    db.session.commit()
+    return users[0].id
+
+
+def _time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000, help='applications per user')
+    parser.add_argument('--runs', type=int, default=30, help='timed runs per term')
+    args = parser.parse_args()
+
+    url = os.environ.get('BENCH_DATABASE_URL') or f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+    os.environ['DATABASE_URL'] = url
+
+    from flask_migrate import upgrade
+    from app import create_app
+    from app.extensions import db
+    from app.models import Application, User
+    from app.services.search_service import SEARCH_COLUMNS, match_clause, search_applications
+
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=os.path.join(BACKEND_DIR, 'migrations'))
+        print(f'Seeding {args.count} applications x 2 users on {db.engine.dialect.name} ...')
+        start = time.perf_counter()
+        uid = _seed(db, Application, User, args.count)
+        print(f'  seeded in {time.perf_counter() - start:.1f}s\n')
+
+        def ilike_search(term):
+            like = f'%{term}%'
+            return Application.query.filter(
+                Application.user_id == uid,
+                db.or_(*[getattr(Application, c).ilike(like) for c in SEARCH_COLUMNS]),
+            ).order_by(Application.applied_date.desc()).limit(20).all()
+
+        def fts_filter(term):
+            return Application.query.filter(
+                Application.user_id == uid, match_clause(term),
+            ).order_by(Application.applied_date.desc()).limit(20).all()
+
+        print(f"{'term':<20}{'hits':>8}{'ILIKE p50/p95 ms':>22}{'FTS filter p50/p95':>22}{'ranked+snippet':>22}")
+        for term in TERMS:
+            hits = Application.query.filter(Application.user_id == uid, match_clause(term)).count()
+            ilike = _time(lambda: ilike_search(term), args.runs)
+            fts = _time(lambda: fts_filter(term), args.runs)
+            ranked = _time(lambda: search_applications(uid, term, limit=20), args.runs)
+            print(f'{term:<20}{hits:>8}'
+                  f'{ilike[0]:>12.1f} / {ilike[1]:<7.1f}'
+                  f'{fts[0]:>12.1f} / {fts[1]:<7.1f}'
+                  f'{ranked[0]:>12.1f} / {ranked[1]:<7.1f}')
+
+
+if __name__ == '__main__':
+    main()
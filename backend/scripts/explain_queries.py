@@ -0,0 +1,102 @@
+"""Print the query plan of every SELECT issued by the per-user hot endpoints.
+
+Each endpoint is called through the Flask test client as an existing user;
+the SQL it emits is captured with its bound parameters and re-run under
+EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (PostgreSQL), so the plans always
+reflect the queries the blueprints actually send.
+
+Usage (from backend/):
+    python scripts/explain_queries.py [--user-id N] [--no-seqscan]
+
+--no-seqscan sets enable_seqscan=off on PostgreSQL, which shows whether an
+index *can* serve a query on a database too small for the planner to pick it.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Application, User  # noqa: E402
+
+
+def _endpoints(app_id):
+    endpoints = [
+        '/api/applications',
+        '/api/applications?status=sent',
+        '/api/applications?sort_by=created_at',
+        '/api/applications/calendar',
+        '/api/dashboard/stats',
+        '/api/dashboard/timeline?period=weekly',
+        '/api/dashboard/timeline?period=daily',
+        '/api/dashboard/timeline',
+        '/api/dashboard/recent',
+        '/api/dashboard/deadline-alerts',
+        '/api/dashboard/funnel',
+        '/api/dashboard/followup-suggestions',
+        '/api/reminders',
+        '/api/reminders/upcoming',
+        '/api/settings',
+    ]
+    if app_id:
+        endpoints += [
+            f'/api/applications/{app_id}',
+            f'/api/applications/{app_id}/interviews',
+        ]
+    return endpoints
+
+
+def _capture(client, headers, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return response.status_code, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--user-id', type=int, help='user to run the endpoints as (default: first user)')
+    parser.add_argument('--no-seqscan', action='store_true', help='PostgreSQL only: SET enable_seqscan = off')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        user = db.session.get(User, args.user_id) if args.user_id else User.query.order_by(User.id).first()
+        if not user:
+            sys.exit('No user found; create an account first.')
+
+        first_app = Application.query.filter_by(user_id=user.id).first()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        client = app.test_client()
+
+        dialect = db.engine.dialect.name
+        prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+
+        for url in _endpoints(first_app.id if first_app else None):
+            status, statements = _capture(client, headers, url)
+            print('=' * 100)
+            print(f'GET {url}  ->  {status}  ({len(statements)} SELECTs)')
+            for statement, parameters in statements:
+                print('-' * 100)
+                print(' '.join(statement.split()))
+                with db.engine.connect() as conn:
+                    if args.no_seqscan and dialect == 'postgresql':
+                        conn.exec_driver_sql('SET enable_seqscan = off')
+                    for row in conn.exec_driver_sql(prefix + statement, parameters):
+                        print('    ' + ' | '.join(str(col) for col in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Load test: concurrent job searches, sync vs gevent gunicorn workers.
+
+Starts a stub Adzuna API that answers each request after --upstream-delay
+seconds, then for each worker class runs a single gunicorn worker (with
+gunicorn.conf.py) against a throwaway SQLite database and fires --requests
+authenticated /api/job-search/search calls from --concurrency clients. With
+one sync worker throughput is capped at 1 / upstream delay; a gevent worker
+overlaps the waits.
+
+Usage (from backend/):
+    python scripts/load_test.py [--requests 40] [--concurrency 20] [--upstream-delay 0.5]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+JWT_SECRET = 'load-test-secret-not-for-production'
+
+
+def stubbed_app():
+    """App factory for the gunicorn workers: Adzuna points at the stub."""
+    from app import create_app
+    from app.services.adzuna_service import AdzunaService
+    AdzunaService.BASE_URL = os.environ['LOAD_TEST_UPSTREAM']
+    return create_app()
+
+
+def _stub_upstream(delay):
+    body = json.dumps({'count': 1, 'results': [{
+        'id': 1, 'title': 'Backend Engineer', 'company': {'display_name': 'Acme'},
+        'location': {'display_name': 'Milano'}, 'description': 'Python, Flask',
+        'redirect_url': 'https://example.com/job/1', 'created': '2026-10-01T00:00:00Z',
+    }]}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _prepare_database(url):
+    """Migrate a fresh database and return a JWT for a test user."""
+    os.environ['DATABASE_URL'] = url
+    os.environ['JWT_SECRET_KEY'] = JWT_SECRET
+    from flask_migrate import upgrade
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=os.path.join(BACKEND_DIR, 'migrations'))
+    response = app.test_client().post('/api/auth/register', json={
+        'email': 'load@example.com', 'password': 'load-test', 'full_name': 'Load Test',
+    })
+    return response.get_json()['token']
+
+
+def _wait_ready(base_url, proc, timeout=30):
+    import requests
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            requests.get(f'{base_url}/api/job-search/search', timeout=5)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError('gunicorn did not start in time')
+
+
+def _run(worker_class, args, db_url, upstream_url, token):
+    import requests
+    port = _free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=db_url, JWT_SECRET_KEY=JWT_SECRET,
+        ADZUNA_APP_ID='load-test', ADZUNA_API_KEY='load-test',
+        LOAD_TEST_UPSTREAM=upstream_url, GUNICORN_WORKER_CLASS=worker_class,
+    )
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-w', '1',
+         '-b', f'127.0.0.1:{port}', '--log-level', 'warning', 'scripts.load_test:stubbed_app()'],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        _wait_ready(base_url, proc)
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def call(i):
+            start = time.perf_counter()
+            r = requests.get(f'{base_url}/api/job-search/search', params={'q': f'python {i}'},
+                             headers=headers, timeout=120)
+            return time.perf_counter() - start, r.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(call, range(args.requests)))
+        wall = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+    return {
+        'wall': wall,
+        'rps': len(results) / wall,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--upstream-delay', type=float, default=0.5, help='seconds per stubbed Adzuna call')
+    parser.add_argument('--worker-class', action='append', choices=['sync', 'gthread', 'gevent'],
+                        help='repeatable; default: sync and gevent')
+    args = parser.parse_args()
+
+    upstream = _stub_upstream(args.upstream_delay)
+    upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}'
+    db_url = f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+    token = _prepare_database(db_url)
+
+    print(f'{args.requests} requests, {args.concurrency} concurrent clients, '
+          f'{args.upstream_delay:.2f}s upstream delay, 1 gunicorn worker\n')
+    print(f"{'worker':<10}{'wall s':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for worker_class in args.worker_class or ['sync', 'gevent']:
+        r = _run(worker_class, args, db_url, upstream_url, token)
+        print(f"{worker_class:<10}{r['wall']:>9.2f}{r['rps']:>9.1f}{r['p50']:>10.0f}{r['p95']:>10.0f}{r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
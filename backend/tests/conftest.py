@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+# Config reads the environment at import time: point it at an in-memory
+# database before the app package is imported
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['JWT_SECRET_KEY'] = 'test-secret-key-long-enough-for-hs256'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post('/api/auth/register', json={
+        'email': 'test@example.com', 'password': 'secret123', 'full_name': 'Test User',
+    })
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
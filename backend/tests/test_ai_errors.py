@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from app.extensions import db
+from app.models import Job, UserProfile
+from app.services import job_queue
+from app.services.gemini_service import get_gemini_service
+from app.services.llm_guard import UpstreamUnavailable
+
+JOB = {'job_title': 'Engineer', 'company': 'Acme', 'job_description': 'Build things.'}
+
+
+@pytest.fixture
+def open_circuit(app, auth_headers):
+    app.config['GEMINI_API_KEY'] = 'test-key'
+    profile = UserProfile.query.first() or UserProfile(user_id=1)
+    profile.full_name = 'Test User'
+    db.session.add(profile)
+    db.session.commit()
+    guard = get_gemini_service('test-key').guard
+    guard.breaker._open(time.monotonic())
+    yield
+    guard.breaker.state = 'closed'
+
+
+def test_refused_call_is_a_503_with_retry_after(client, auth_headers, open_circuit):
+    response = client.post('/api/job-search/analyze-match', json=JOB, headers=auth_headers)
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) > 0
+    error = response.get_json()['error']
+    assert error['reason'] == 'circuit_open'
+    assert error['retry_after'] == int(response.headers['Retry-After'])
+
+
+def test_batch_results_carry_the_refusal(client, auth_headers, open_circuit):
+    response = client.post('/api/job-search/analyze-match/batch', json={'jobs': [JOB, JOB]}, headers=auth_headers)
+
+    results = response.get_json()['results']
+    assert [r['reason'] for r in results] == ['circuit_open', 'circuit_open']
+    assert all(r['retry_after'] > 0 for r in results)
+
+
+def test_failed_job_records_the_refusal(app, auth_headers):
+    @job_queue.job_handler('test_refused')
+    def refused(job, params):
+        raise UpstreamUnavailable('queue_timeout', 10)
+
+    job = Job(user_id=1, kind='test_refused', params='{}')
+    db.session.add(job)
+    db.session.commit()
+    try:
+        job_queue._execute(job.id)
+    finally:
+        job_queue._handlers.pop('test_refused')
+
+    data = db.session.get(Job, job.id).to_dict()
+    assert data['status'] == 'failed'
+    assert data['error_reason'] == 'queue_timeout'
+    assert data['retry_after'] == 10
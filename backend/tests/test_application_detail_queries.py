@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Application, ChatMessage, Document, InterviewEvent, Reminder, StatusHistory, User
+
+ROWS_PER_SECTION = 5
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def application_id(app, auth_headers):
+    user = User.query.filter_by(email='test@example.com').one()
+    application = Application(user_id=user.id, company='Acme', role='Engineer')
+    db.session.add(application)
+    db.session.flush()
+    when = datetime(2026, 1, 1)
+    for i in range(ROWS_PER_SECTION):
+        db.session.add_all([
+            Document(application_id=application.id, filename=f'cv{i}.pdf', stored_filename=f'cv{i}.pdf',
+                     file_type='application/pdf', file_size=100),
+            Reminder(application_id=application.id, remind_at=when + timedelta(days=i), message='Follow up'),
+            StatusHistory(application_id=application.id, to_status='applied'),
+            ChatMessage(application_id=application.id, role='user', content=f'message {i}'),
+            InterviewEvent(application_id=application.id, interview_date=when + timedelta(days=i)),
+        ])
+    db.session.commit()
+    application_id = application.id
+    # Start the request from an empty identity map, as a real one would
+    db.session.expunge_all()
+    return application_id
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', 6),
+    ('?include=documents,reminders', 3),
+    ('?include=', 1),
+])
+def test_detail_statement_count(client, auth_headers, application_id, query, expected):
+    with count_statements() as statements:
+        response = client.get(f'/api/applications/{application_id}{query}', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(statements) == expected, statements
+
+
+def test_detail_sections(client, auth_headers, application_id):
+    response = client.get(f'/api/applications/{application_id}?include=documents,reminders', headers=auth_headers)
+
+    data = response.get_json()['application']
+    assert len(data['documents']) == ROWS_PER_SECTION
+    assert len(data['reminders']) == ROWS_PER_SECTION
+    assert 'chat_messages' not in data
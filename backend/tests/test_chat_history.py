@@ -0,0 +1,54 @@
+from app.extensions import db
+from app.models import Application, ChatMessage, User
+from app.services.chat_history import load_history, update_summary
+
+
+class FakeGemini:
+
+    def __init__(self):
+        self.folded = []
+
+    def summarize_chat(self, summary, messages):
+        self.folded.extend(m['content'] for m in messages)
+        return f'{len(self.folded)} messages so far'
+
+
+def _chat(count):
+    user = User(email='chat@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    application = Application(user_id=user.id, company='Acme', role='Engineer')
+    db.session.add(application)
+    db.session.flush()
+    for i in range(count):
+        db.session.add(ChatMessage(
+            application_id=application.id, role='user' if i % 2 == 0 else 'assistant',
+            content=f'message {i}', step='cv',
+        ))
+    db.session.commit()
+    return application.id
+
+
+def test_unsummarized_messages_are_all_sent(app):
+    app.config.update(CHAT_HISTORY_MESSAGES=10, CHAT_SUMMARY_BATCH=10)
+    application_id = _chat(19)
+
+    # 9 messages have left the window: too few to fold, so they stay verbatim
+    assert not update_summary(FakeGemini(), application_id, 'cv')
+    summary, messages = load_history(application_id, 'cv')
+
+    assert summary == ''
+    assert [m['content'] for m in messages] == [f'message {i}' for i in range(19)]
+
+
+def test_folded_messages_move_to_the_summary(app):
+    app.config.update(CHAT_HISTORY_MESSAGES=10, CHAT_SUMMARY_BATCH=10)
+    application_id = _chat(25)
+    gemini = FakeGemini()
+
+    assert update_summary(gemini, application_id, 'cv')
+    summary, messages = load_history(application_id, 'cv')
+
+    assert gemini.folded == [f'message {i}' for i in range(15)]
+    assert summary == '15 messages so far'
+    assert [m['content'] for m in messages] == [f'message {i}' for i in range(15, 25)]
@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+
+from app.extensions import db
+from app.models import DashboardCounter
+from app.services.dashboard_snapshot import reconcile, snapshot_stats
+from app.services.dashboard_stats import compute_stats
+
+USER_ID = 1
+
+
+def _create(client, headers, **fields):
+    response = client.post('/api/applications', json={'role': 'Engineer', **fields}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['application']['id']
+
+
+def _assert_in_sync():
+    assert snapshot_stats(USER_ID) == compute_stats(USER_ID)
+    assert reconcile() == []
+
+
+def test_snapshot_follows_application_changes(client, auth_headers):
+    today = date.today()
+    first = _create(client, auth_headers, company='Acme', status='sent',
+                    applied_date=(today - timedelta(days=3)).isoformat(), match_score=8)
+    second = _create(client, auth_headers, company='Globex', status='sent',
+                     applied_date=(today - timedelta(days=40)).isoformat())
+    third = _create(client, auth_headers, company='Initech', match_score=5)
+
+    # The first dashboard load builds the snapshot; later writes update it
+    assert client.get('/api/dashboard/stats', headers=auth_headers).get_json() == compute_stats(USER_ID)
+
+    client.patch(f'/api/applications/{first}/status', json={'status': 'interview'}, headers=auth_headers)
+    _assert_in_sync()
+
+    client.patch(f'/api/applications/{first}/status', json={'status': 'rejected'}, headers=auth_headers)
+    client.patch(f'/api/applications/{second}/status', json={'status': 'rejected'}, headers=auth_headers)
+    _assert_in_sync()
+
+    client.put(f'/api/applications/{third}', json={'match_score': 9, 'applied_date': today.isoformat()},
+               headers=auth_headers)
+    _assert_in_sync()
+
+    client.delete(f'/api/applications/{second}', headers=auth_headers)
+    _assert_in_sync()
+
+    stats = snapshot_stats(USER_ID)
+    assert stats['total_applications'] == 2
+    assert stats['by_status'] == {'rejected': 1, 'draft': 1}
+    assert stats['avg_match_score'] == 8.5
+
+
+def test_reconcile_repairs_drift(client, auth_headers):
+    _create(client, auth_headers, company='Acme', status='sent')
+    snapshot_stats(USER_ID)
+    DashboardCounter.query.filter_by(user_id=USER_ID, key='status:sent').update({'value': 5})
+    db.session.commit()
+
+    assert reconcile() == [USER_ID]
+    assert snapshot_stats(USER_ID) == compute_stats(USER_ID)
@@ -0,0 +1,74 @@
+import json
+import threading
+from types import SimpleNamespace
+
+from app.extensions import db
+from app.services.ai_cache import DatabaseCache, MemoryCache
+from app.services.gemini_service import GeminiService
+
+
+class FakeModel:
+
+    def __init__(self, text, gate=None):
+        self.text = text
+        self.gate = gate
+        self.calls = 0
+
+    def generate_content(self, contents):
+        self.calls += 1
+        if self.gate:
+            self.gate.wait(5)
+        return SimpleNamespace(text=self.text)
+
+
+def _service(cache, model):
+    service = GeminiService('test-key', cache=cache)
+    service.model = model
+    return service
+
+
+def test_whitespace_variants_share_the_cache_entry(app):
+    model = FakeModel('answer')
+    service = _service(MemoryCache(16, 60), model)
+
+    assert service._generate('Summarize  this\n application', cache_as='summary') == 'answer'
+    assert service._generate('Summarize this application', cache_as='summary') == 'answer'
+    assert model.calls == 1
+
+
+def test_response_is_parsed_once(app):
+    model = FakeModel('{"score": 80}')
+    service = _service(MemoryCache(16, 60), model)
+    parsed = []
+
+    def parse(text):
+        parsed.append(text)
+        return json.loads(text)
+
+    assert service._generate('Analyze', cache_as='analyze_match', parse=parse) == {'score': 80}
+    assert len(parsed) == 1
+
+
+def test_concurrent_whitespace_variants_make_one_call(app):
+    gate = threading.Event()
+    model = FakeModel('answer', gate)
+    service = _service(DatabaseCache(16, 60, db.engine), model)
+    results = []
+
+    def run(prompt):
+        with app.app_context():
+            results.append(service._generate(prompt, cache_as='summary'))
+
+    threads = [threading.Thread(target=run, args=(p,)) for p in ('Same prompt', 'Same\n  prompt')]
+    for thread in threads:
+        thread.start()
+    for _ in range(500):
+        if service.flights.stats()['coalesced']:
+            break
+        threading.Event().wait(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['answer', 'answer']
+    assert model.calls == 1
@@ -0,0 +1,37 @@
+from itertools import combinations
+
+import pytest
+
+from app.services.gemini_service import HtmlFenceStripper, strip_html_fences
+
+SAMPLES = [
+    '```html\n<h1>Jane Doe</h1>\n<p>Engineer</p>\n```',
+    '  ```\n<p>a</p>```  \n',
+    '<p>Uses ```html fences``` inline</p>``',
+    '`````html\n\n<div>html</div>\n``` `',
+    '```ht<p>x</p> ```htmlx',
+    '<p>`</p>\n\n``` \n````',
+]
+
+
+def _stream(chunks):
+    stripper = HtmlFenceStripper()
+    return ''.join(stripper.feed(chunk) for chunk in chunks) + stripper.finish()
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_any_split_matches_whole_text_stripping(text):
+    expected = strip_html_fences(text)
+
+    assert _stream(text) == expected
+    for cuts in combinations(range(1, len(text)), 2):
+        chunks = [text[:cuts[0]], text[cuts[0]:cuts[1]], text[cuts[1]:]]
+        assert _stream(chunks) == expected, chunks
+
+
+def test_content_is_not_held_back():
+    stripper = HtmlFenceStripper()
+
+    assert stripper.feed('```html\n<p>Hello') == '<p>Hello'
+    assert stripper.feed(' world</p>\n``') == ' world</p>'
+    assert stripper.finish() == '\n'
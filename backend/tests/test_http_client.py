@@ -0,0 +1,55 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app.services import http_client
+
+
+@pytest.fixture
+def server():
+    """A local server answering each GET with the next (status, headers)."""
+    responses = []
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            status, headers = responses.pop(0) if responses else (200, {})
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/', responses, hits
+    httpd.shutdown()
+
+
+def test_long_retry_after_is_not_slept_on(server):
+    url, responses, hits = server
+    responses.append((429, {'Retry-After': '600'}))
+
+    start = time.monotonic()
+    response = http_client.get(url)
+
+    assert response.status_code == 429
+    assert len(hits) == 1
+    assert time.monotonic() - start < 2
+
+
+def test_short_retry_after_is_retried(server):
+    url, responses, hits = server
+    responses.append((429, {'Retry-After': '1'}))
+
+    response = http_client.get(url)
+
+    assert response.status_code == 200
+    assert len(hits) == 2
@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Job
+from app.services import job_queue
+from app.services.llm_guard import UpstreamUnavailable
+
+USER_ID = 1
+
+
+@pytest.fixture
+def handlers(auth_headers, monkeypatch):
+    def echo(job, params):
+        job_queue.set_progress(job, 50)
+        return {'echo': params['text']}
+
+    def broken(job, params):
+        raise ValueError('Bad input')
+
+    def refused(job, params):
+        raise UpstreamUnavailable('circuit_open', 12)
+
+    for kind, fn in (('echo', echo), ('broken', broken), ('refused', refused)):
+        monkeypatch.setitem(job_queue._handlers, kind, fn)
+
+
+def _queue(kind, params=None, **fields):
+    # Added directly rather than with submit_job, which starts worker threads
+    job = Job(user_id=USER_ID, kind=kind, params=json.dumps(params or {}), **fields)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def _run_next():
+    job_id = job_queue._claim_next()
+    if job_id is not None:
+        job_queue._execute(job_id)
+    return job_id
+
+
+def test_jobs_are_claimed_oldest_first_and_once(handlers):
+    now = datetime.utcnow()
+    newer = _queue('echo', {'text': 'b'}, created_at=now)
+    older = _queue('echo', {'text': 'a'}, created_at=now - timedelta(seconds=5))
+
+    assert job_queue._claim_next() == older
+    assert job_queue._claim_next() == newer
+    assert job_queue._claim_next() is None
+    assert {job.status for job in Job.query.all()} == {'running'}
+
+
+def test_finished_job_stores_its_result(client, auth_headers, handlers):
+    job_id = _queue('echo', {'text': 'hello'})
+
+    assert _run_next() == job_id
+    job = client.get(f'/api/jobs/{job_id}', headers=auth_headers).get_json()['job']
+    assert job['status'] == 'succeeded'
+    assert job['progress'] == 100
+    assert job['result'] == {'echo': 'hello'}
+    assert job['finished_at'] is not None
+
+
+def test_failed_job_records_the_error(handlers):
+    job_id = _queue('broken')
+
+    _run_next()
+    job = db.session.get(Job, job_id)
+    assert job.status == 'failed'
+    assert job.error == 'Bad input'
+    assert job.error_reason is None
+
+
+def test_refused_job_says_when_to_retry(handlers):
+    job_id = _queue('refused')
+
+    _run_next()
+    job = db.session.get(Job, job_id)
+    assert job.status == 'failed'
+    assert (job.error_reason, job.retry_after) == ('circuit_open', 12)
+
+    # A failed job is not picked up again; retrying means submitting anew
+    assert _run_next() is None
+    retry_id = _queue('echo', {'text': 'again'})
+    assert _run_next() == retry_id
+    assert db.session.get(Job, retry_id).status == 'succeeded'
+
+
+def test_interrupted_jobs_are_failed_once_stale(handlers):
+    started = datetime.utcnow() - timedelta(seconds=120)
+    stale = _queue('echo', status='running', started_at=started)
+    fresh = _queue('echo', status='running', started_at=datetime.utcnow())
+
+    job_queue._fail_stale(60)
+    db.session.expire_all()
+    assert db.session.get(Job, stale).status == 'failed'
+    assert db.session.get(Job, fresh).status == 'running'
+
+
+def test_unknown_kind_is_rejected(app):
+    with pytest.raises(ValueError):
+        job_queue.submit_job(USER_ID, 'no-such-kind', {})
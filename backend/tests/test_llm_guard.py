@@ -0,0 +1,58 @@
+import pytest
+import requests
+from google.api_core import exceptions as google_exceptions
+
+from app.services.llm_guard import LLMGuard, UpstreamUnavailable
+
+CONFIG = {
+    'GEMINI_BREAKER_MIN_CALLS': 4,
+    'GEMINI_BREAKER_ERROR_RATE': 0.5,
+    'GEMINI_BREAKER_OPEN_SECONDS': 30,
+}
+
+
+def _fail_with(error):
+    def call():
+        raise error
+    return call
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.ReadTimeout('read timed out'),
+    requests.exceptions.ConnectionError('connection reset'),
+    google_exceptions.DeadlineExceeded('deadline exceeded'),
+    google_exceptions.ServiceUnavailable('unavailable'),
+    google_exceptions.ResourceExhausted('quota'),
+    TimeoutError('timed out'),
+])
+def test_upstream_errors_open_the_circuit(error):
+    guard = LLMGuard.from_config(CONFIG)
+    for _ in range(4):
+        with pytest.raises(type(error)):
+            guard.call(_fail_with(error))
+
+    assert guard.breaker.state == 'open'
+    assert guard.stats()['upstream_errors'] == 4
+    with pytest.raises(UpstreamUnavailable) as rejected:
+        guard.call(lambda: 'ok')
+    assert rejected.value.reason == 'circuit_open'
+
+
+def test_upstream_errors_halve_the_limit():
+    guard = LLMGuard.from_config(CONFIG)
+    limit = guard.limiter.limit
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        guard.call(_fail_with(requests.exceptions.ReadTimeout()))
+    assert guard.limiter.limit == limit / 2
+
+
+def test_request_errors_do_not_open_the_circuit():
+    guard = LLMGuard.from_config(CONFIG)
+    for _ in range(6):
+        with pytest.raises(google_exceptions.InvalidArgument):
+            guard.call(_fail_with(google_exceptions.InvalidArgument('bad request')))
+        with pytest.raises(ValueError):
+            guard.call(_fail_with(ValueError('unparseable output')))
+
+    assert guard.breaker.state == 'closed'
+    assert guard.stats()['other_errors'] == 12
@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.ai_cache import ResponseCache
+
+STATS_URLS = ['/api/ai/cache-stats', '/api/ai/gemini-stats', '/api/ai/prompt-stats', '/api/job-search/cache-stats']
+
+
+@pytest.mark.parametrize('url', STATS_URLS)
+def test_stats_are_refused_to_other_users(client, auth_headers, url):
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize('url', STATS_URLS)
+def test_stats_are_served_to_ops_users(app, client, auth_headers, url):
+    app.config['OPS_EMAILS'] = ['test@example.com']
+
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_response_cache_backends_must_implement_storage():
+
+    class Incomplete(ResponseCache):
+        name = 'incomplete'
+
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete(10, 60)
@@ -0,0 +1,52 @@
+from datetime import date
+
+import pytest
+
+from app.models import Application
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize('value', [12345, 'not-a-date', ['2026-01-01']])
+def test_bad_date_in_cursor_is_malformed(app, value):
+    cursor = encode_cursor('applied_date', 'desc', value, 1)
+
+    with pytest.raises(ValueError, match='Malformed cursor'):
+        decode_cursor(cursor, 'applied_date', 'desc', Application.applied_date)
+
+
+def test_bad_date_in_cursor_is_a_400(client, auth_headers):
+    cursor = encode_cursor('applied_date', 'desc', 12345, 1)
+
+    response = client.get(f'/api/applications?cursor={cursor}', headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['error']['message'] == 'Malformed cursor'
+
+
+def test_cursor_round_trip(app):
+    cursor = encode_cursor('applied_date', 'desc', date(2026, 1, 2), 7)
+
+    assert decode_cursor(cursor, 'applied_date', 'desc', Application.applied_date) == (date(2026, 1, 2), 7)
+
+
+@pytest.mark.parametrize('value', [['a'], {'a': 1}, 12, True])
+def test_wrong_type_in_cursor_is_malformed(app, value):
+    cursor = encode_cursor('company', 'asc', value, 1)
+
+    with pytest.raises(ValueError, match='Malformed cursor'):
+        decode_cursor(cursor, 'company', 'asc', Application.company)
+
+
+def test_wrong_type_in_cursor_is_a_400(client, auth_headers):
+    cursor = encode_cursor('company', 'asc', {'a': 1}, 1)
+
+    response = client.get(f'/api/applications?cursor={cursor}&sort_by=company&order=asc', headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['error']['message'] == 'Malformed cursor'
+
+
+def test_numeric_cursor_values_are_coerced(app):
+    cursor = encode_cursor('salary_min', 'asc', 50000.0, 1)
+
+    assert decode_cursor(cursor, 'salary_min', 'asc', Application.salary_min) == (50000, 1)
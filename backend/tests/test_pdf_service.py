@@ -0,0 +1,28 @@
+import threading
+
+import pytest
+
+from app.services import pdf_service
+
+
+def test_cpu_bound_work_runs_inline_without_gevent(monkeypatch):
+    monkeypatch.setattr(pdf_service, '_gevent_active', lambda: False)
+
+    assert pdf_service._off_hub(threading.get_ident) == threading.get_ident()
+
+
+def test_cpu_bound_work_leaves_the_hub_under_gevent(monkeypatch):
+    monkeypatch.setattr(pdf_service, '_gevent_active', lambda: True)
+
+    assert pdf_service._off_hub(threading.get_ident) != threading.get_ident()
+
+
+def test_html_to_pdf_under_gevent(monkeypatch):
+    pytest.importorskip('xhtml2pdf')
+    monkeypatch.setattr(pdf_service, '_gevent_active', lambda: True)
+
+    filename, pdf_bytes, size = pdf_service.html_to_pdf('<h1>Test User</h1><p>CV</p>')
+
+    assert filename.endswith('.pdf')
+    assert pdf_bytes.startswith(b'%PDF')
+    assert size == len(pdf_bytes)
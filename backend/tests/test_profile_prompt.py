@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from app.services.gemini_service import GeminiService
+from app.services.profile_cache import ProfileSnapshot
+from app.services.prompt_budget import estimate_tokens
+from app.utils.prompts import MATCH_ANALYSIS_PROMPT
+
+
+def _profile(experience_chars):
+    return {
+        'id': 1,
+        'updated_at': datetime(2026, 1, 1).isoformat(),
+        'full_name': 'Test User',
+        'work_experiences': [
+            {'title': f'Role {i}', 'company': 'Acme', 'description': 'x' * (experience_chars // 8)}
+            for i in range(8)
+        ],
+    }
+
+
+def _prefix_tokens(app, profile):
+    service = GeminiService('test-key')
+    prompt = service._profile_prompt(profile, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+    return estimate_tokens(prompt.prefix)
+
+
+def test_prefix_long_enough_to_cache_is_not_compressed(app):
+    app.config.update(GEMINI_CONTEXT_CACHE=True, GEMINI_CONTEXT_CACHE_MIN_TOKENS=4096, PROFILE_TOKEN_BUDGET=3000)
+    assert _prefix_tokens(app, _profile(24000)) >= 4096
+
+
+def test_prefix_below_cache_minimum_is_compressed(app):
+    app.config.update(GEMINI_CONTEXT_CACHE=True, GEMINI_CONTEXT_CACHE_MIN_TOKENS=4096, PROFILE_TOKEN_BUDGET=3000)
+    assert _prefix_tokens(app, _profile(14000)) <= 3000
+
+
+def test_prefix_is_compressed_when_caching_is_off(app):
+    app.config.update(GEMINI_CONTEXT_CACHE=False, PROFILE_TOKEN_BUDGET=3000)
+    assert _prefix_tokens(app, _profile(24000)) <= 3000
+
+
+def test_contact_details_only_in_document_prompts(app):
+    profile = {**_profile(800), 'email': 'test@example.com', 'phone': '+39 123 456'}
+    service = GeminiService('test-key')
+
+    match = service._profile_prompt(profile, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+    cover_letter = service._cover_letter_html_prompt('A job', profile, 'Acme', 'Engineer')
+
+    assert 'test@example.com' not in str(match)
+    assert 'test@example.com' not in cover_letter.prefix
+    assert 'test@example.com' in cover_letter.suffix
+    assert '+39 123 456' in cover_letter.suffix
+    assert cover_letter.prefix == match.prefix
+
+
+def test_body_profile_is_not_served_a_stored_prefix(app):
+    service = GeminiService('test-key')
+    stored = ProfileSnapshot({**_profile(800), 'skills': ['Secret skill']}, user_id=1)
+    service._profile_prompt(stored, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+
+    # Same id and updated_at, sent by another client with other content
+    body = {**_profile(800), 'skills': ['Own skill']}
+    prompt = service._profile_prompt(body, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+
+    assert 'Own skill' in prompt.prefix
+    assert 'Secret skill' not in prompt.prefix
+
+
+def test_edited_body_profile_is_rendered_again(app):
+    service = GeminiService('test-key')
+    first = service._profile_prompt(_profile(800), MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+    edited = {**_profile(800), 'full_name': 'Edited Name'}
+    second = service._profile_prompt(edited, MATCH_ANALYSIS_PROMPT, 'analyze_match', job_posting='A job')
+
+    assert 'Edited Name' in second.prefix
+    assert first.version != second.version
@@ -0,0 +1,71 @@
+import importlib.util
+import os
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.extensions import db
+from app.services import search_service
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'migrations', 'versions', '9b41d6e0c2a7_add_application_full_text_search.py',
+)
+
+
+def _migration():
+    spec = importlib.util.spec_from_file_location('fts_migration', MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fts(app, monkeypatch):
+    """The SQLite FTS5 table and sync triggers, as the migration creates them."""
+    migration = _migration()
+    monkeypatch.setattr(search_service, '_fts_tables', {})
+    with db.engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+        migration.upgrade()
+    assert search_service.fts_available()
+    yield
+    db.session.remove()
+    with db.engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+        migration.downgrade()
+
+
+def _search(client, headers, q):
+    response = client.get('/api/applications/search', query_string={'q': q}, headers=headers)
+    assert response.status_code == 200
+    return [r['application']['company'] for r in response.get_json()['results']]
+
+
+def _create(client, headers, **fields):
+    response = client.post('/api/applications', json=fields, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['application']['id']
+
+
+def test_search_follows_inserts_updates_and_deletes(client, auth_headers, fts):
+    app_id = _create(client, auth_headers, company='Acme', role='Backend Engineer', notes='Kubernetes team')
+    _create(client, auth_headers, company='Globex', role='Designer')
+
+    assert _search(client, auth_headers, 'kube') == ['Acme']
+
+    client.put(f'/api/applications/{app_id}', json={'notes': 'Terraform platform'}, headers=auth_headers)
+    assert _search(client, auth_headers, 'kubernetes') == []
+    assert _search(client, auth_headers, 'terraform') == ['Acme']
+
+    client.delete(f'/api/applications/{app_id}', headers=auth_headers)
+    assert _search(client, auth_headers, 'terraform') == []
+    assert _search(client, auth_headers, 'designer') == ['Globex']
+
+
+def test_search_is_scoped_to_the_user(client, auth_headers, fts):
+    _create(client, auth_headers, company='Acme', role='Engineer')
+    other = client.post('/api/auth/register', json={
+        'email': 'other@example.com', 'password': 'secret123', 'full_name': 'Other User',
+    }).get_json()['token']
+
+    assert _search(client, {'Authorization': f'Bearer {other}'}, 'acme') == []
@@ -0,0 +1,114 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import search_cache
+from app.services.search_cache import PrefetchBudget, SearchResultsCache, search_key
+
+KEY = search_key('adzuna', 'Python  Developer', 'Milan')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_equivalent_searches_share_a_key():
+    assert search_key('adzuna', ' python developer', 'MILAN') == KEY
+
+
+def test_fresh_entry_is_served_without_loading(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=10)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {'results': ['a']}
+
+    assert cache.fetch(KEY, load) == {'results': ['a']}
+    clock[0] += 30
+    assert cache.fetch(KEY, load) == {'results': ['a']}
+    assert len(calls) == 1
+    assert (cache.stats()['misses'], cache.stats()['hits']) == (1, 1)
+
+
+def test_stale_entry_is_served_while_refreshing(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=10)
+    cache.store(KEY, {'results': ['old']})
+    clock[0] += 90
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'results': ['new']}
+
+    assert cache.fetch(KEY, load) == {'results': ['old']}
+    assert started.wait(5)
+    # Still refreshing: served stale again, without a second refresh
+    assert cache.fetch(KEY, load) == {'results': ['old']}
+    assert cache.stats()['stale_hits'] == 2
+
+    release.set()
+    _wait_for(lambda: cache.stats()['refreshes'] == 1)
+    assert cache.fetch(KEY, load) == {'results': ['new']}
+    assert len(calls) == 1
+
+
+def test_failed_refresh_keeps_the_stale_entry(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=10)
+    cache.store(KEY, {'results': ['old']})
+    clock[0] += 90
+
+    def load():
+        raise RuntimeError('provider down')
+
+    assert cache.fetch(KEY, load) == {'results': ['old']}
+    _wait_for(lambda: cache.stats()['refresh_errors'] == 1)
+    assert cache.fetch(KEY, load) == {'results': ['old']}
+
+
+def test_expired_entry_is_loaded_again(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=10)
+    cache.store(KEY, {'results': ['old']})
+    clock[0] += 400
+
+    assert cache.fetch(KEY, lambda: {'results': ['new']}) == {'results': ['new']}
+    assert cache.stats()['misses'] == 1
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=2)
+    for page in (1, 2):
+        cache.store(search_key('adzuna', 'python', page=page), {'page': page})
+    cache.fetch(search_key('adzuna', 'python', page=1), lambda: None)
+    cache.store(search_key('adzuna', 'python', page=3), {'page': 3})
+
+    assert cache.peek(search_key('adzuna', 'python', page=1))
+    assert not cache.peek(search_key('adzuna', 'python', page=2))
+
+
+def test_prefetch_stays_within_budget(clock):
+    cache = SearchResultsCache(ttl=60, stale_ttl=300, max_entries=10,
+                               prefetch_budget=PrefetchBudget(per_user=1, total=10))
+    next_page = search_key('adzuna', 'python', page=2)
+
+    assert cache.prefetch(next_page, lambda: {'page': 2}, user_id=1)
+    assert not cache.prefetch(search_key('adzuna', 'python', page=3), lambda: {'page': 3}, user_id=1)
+    _wait_for(lambda: next_page in cache._prefetched)
+    assert cache.fetch(next_page, lambda: None) == {'page': 2}
+    stats = cache.stats()
+    assert (stats['prefetch_skipped_budget'], stats['prefetch_hits']) == (1, 1)
@@ -35,3 +35,41 @@ client.interceptors.response.use(
 );
 
 export default client;
+
+// POST that reads a server-sent event stream (EventSource only supports GET).
+// Calls onChunk(text) as text arrives and resolves with the final `done` payload.
+export async function streamPost(url, data, onChunk) {
+  const token = localStorage.getItem('auth_token');
+  const res = await fetch(`/api${url}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({ ...data, stream: true }),
+  });
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({}));
+    throw { message: body.error?.message || 'Something went wrong', status: res.status };
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let end;
+    while ((end = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const payload = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+      if (event === 'chunk') onChunk(payload.text);
+      else if (event === 'done') return payload;
+      else if (event === 'error') throw { message: payload.message };
+    }
+  }
+  throw { message: 'Something went wrong' };
+}
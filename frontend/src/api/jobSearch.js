@@ -6,6 +6,9 @@ export const searchJobs = (params = {}) =>
 export const analyzeJobMatch = (data) =>
   client.post('/job-search/analyze-match', data);
 
+export const analyzeJobMatchBatch = (jobs) =>
+  client.post('/job-search/analyze-match/batch', { jobs });
+
 export const saveJobApplication = (data) =>
   client.post('/job-search/save-application', data);
 
@@ -1,4 +1,4 @@
-import api from './client';
+import api, { streamPost } from './client';
 
 export const getProfile = () => api.get('/profile');
 export const updateProfile = (data) => api.put('/profile', data);
@@ -17,6 +17,7 @@ export const tailorCv = (jobPosting, profile, instructions) => api.post('/ai/tai
 export const tailorCoverLetter = (jobPosting, profile, company, role, instructions) =>
   api.post('/ai/tailor-cover-letter', { job_posting: jobPosting, profile, company, role, instructions });
 export const chatAI = (data) => api.post('/ai/chat', data);
+export const chatAIStream = (data, onChunk) => streamPost('/ai/chat', data, onChunk);
 export const generatePdf = (html, docType, applicationId, templateId) =>
   api.post('/ai/generate-pdf', { html, doc_type: docType, application_id: applicationId, template_id: templateId });
 export const getDeadlineAlerts = () => api.get('/dashboard/deadline-alerts');
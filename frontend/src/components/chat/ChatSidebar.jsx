@@ -1,6 +1,6 @@
 import { useState, useRef, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
-import { chatAI } from '../../api/profile';
+import { chatAIStream } from '../../api/profile';
 import './Chat.css';
 
 export default function ChatSidebar({ context = {}, collapsed = false, onToggle }) {
@@ -17,12 +17,18 @@ export default function ChatSidebar({ context = {}, collapsed = false, onToggle
   const handleSend = async () => {
     if (!input.trim() || loading) return;
     const userMsg = { role: 'user', content: input.trim() };
-    setMessages(prev => [...prev, userMsg]);
+    setMessages(prev => [...prev, userMsg, { role: 'assistant', content: '' }]);
     setInput('');
     setLoading(true);
 
+    // Replace the content of the trailing assistant message
+    const setReply = (update) => setMessages(prev => {
+      const last = prev[prev.length - 1];
+      return [...prev.slice(0, -1), { ...last, content: update(last.content) }];
+    });
+
     try {
-      const { response } = await chatAI({
+      const { response } = await chatAIStream({
         message: userMsg.content,
         step: context.step || 'general',
         company: context.company || '',
@@ -30,12 +36,14 @@ export default function ChatSidebar({ context = {}, collapsed = false, onToggle
         profile: context.profile,
         job_posting: context.jobPosting || '',
         match_analysis: context.matchAnalysis,
-        history: [...messages, userMsg].map(m => ({ role: m.role, content: m.content })),
-        application_id: context.applicationId,
-      });
-      setMessages(prev => [...prev, { role: 'assistant', content: response }]);
+        // Application chats are stored server-side, which loads the history itself
+        ...(context.applicationId
+          ? { application_id: context.applicationId }
+          : { history: [...messages, userMsg].map(m => ({ role: m.role, content: m.content })) }),
+      }, (text) => setReply(content => content + text));
+      setReply(() => response);
     } catch (err) {
-      setMessages(prev => [...prev, { role: 'assistant', content: 'Errore nella risposta AI. Riprova.' }]);
+      setReply(() => 'Errore nella risposta AI. Riprova.');
     } finally {
       setLoading(false);
     }
@@ -62,12 +70,12 @@ export default function ChatSidebar({ context = {}, collapsed = false, onToggle
             <p>💬 Chiedi all'AI qualsiasi cosa su questa candidatura</p>
           </div>
         )}
-        {messages.map((msg, i) => (
+        {messages.filter(msg => msg.content).map((msg, i) => (
           <div key={i} className={`chat-message ${msg.role}`}>
             <div className="message-content">{msg.content}</div>
           </div>
         ))}
-        {loading && (
+        {loading && !messages[messages.length - 1]?.content && (
           <div className="chat-message assistant">
             <div className="message-content typing">
               <span className="spinner" /> {t('chat.thinking')}
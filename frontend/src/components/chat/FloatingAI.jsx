@@ -57,8 +57,10 @@ export default function FloatingAI({ context = {} }) {
         profile: context.profile,
         job_posting: context.jobPosting || '',
         match_analysis: context.matchAnalysis,
-        history: [...messages, userMsg].map((m) => ({ role: m.role, content: m.content })),
-        application_id: context.applicationId,
+        // Application chats are stored server-side, which loads the history itself
+        ...(context.applicationId
+          ? { application_id: context.applicationId }
+          : { history: [...messages, userMsg].map((m) => ({ role: m.role, content: m.content })) }),
       });
       setMessages((prev) => [...prev, { role: 'assistant', content: response }]);
     } catch {
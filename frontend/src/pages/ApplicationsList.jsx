@@ -49,7 +49,7 @@ export default function ApplicationsList() {
   useEffect(() => {
     if (viewMode !== 'list') return;
     setLoading(true);
-    const params = { page, per_page: 15 };
+    const params = { page, per_page: 15, view: 'summary' };
     if (search) params.search = search;
     if (statusFilter) params.status = statusFilter;
 
@@ -60,7 +60,7 @@ export default function JobSearch() {
 
     try {
       const params = { q: query.trim(), location: location.trim(), page: targetPage, source };
-      if (source === 'adzuna') {
+      if (source !== 'jsearch') {
         params.country = country;
       }
       const result = await searchJobs(params);
@@ -195,6 +195,13 @@ export default function JobSearch() {
           {t('jobSearch.sourceJSearch')}
           <span className="source-pill-badge">Global</span>
         </button>
+        <button
+          className={`source-pill ${source === 'all' ? 'active' : ''}`}
+          onClick={() => handleSourceChange('all')}
+        >
+          <span className="material-icon">hub</span>
+          {t('jobSearch.sourceAll')}
+        </button>
       </div>
 
       {/* Search bar */}
@@ -215,7 +222,7 @@ export default function JobSearch() {
           onChange={(e) => setLocation(e.target.value)}
           onKeyDown={handleKeyDown}
         />
-        {source === 'adzuna' && (
+        {source !== 'jsearch' && (
           <select className="form-select job-country-select" value={country} onChange={(e) => setCountry(e.target.value)}>
             {COUNTRIES.map((c) => (
               <option key={c} value={c}>{t(`jobSearch.countries.${c}`)}</option>
@@ -145,7 +145,7 @@ export default function NewApplication() {
       addNotification(t('newApplication.applicationSaved'), 'success');
       // Check milestones
       try {
-        const listData = await getApplications({ page: 1, per_page: 1 });
+        const listData = await getApplications({ page: 1, per_page: 1, fields: 'id' });
         const milestone = checkMilestone(listData.total);
         if (milestone) {
           setCelebration(milestone);